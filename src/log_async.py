@@ -0,0 +1,222 @@
+"""Asyncio-aware emission: lines buffered per event loop and written off-loop in batches."""
+
+import asyncio
+import atexit
+import sys
+import threading
+import traceback
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, BinaryIO
+
+from src.log_queue import OverflowPolicy
+
+# ============================================================================
+# Loop-Local Buffering
+# ============================================================================
+
+
+class _LoopBuffer:
+    """Lines rendered on one event loop and not yet handed to the writer thread."""
+
+    __slots__ = ("lines", "size", "scheduled", "in_flight", "__weakref__")
+
+    def __init__(self) -> None:
+        self.lines: list[bytes] = []
+        self.size = 0
+        self.scheduled = False  # A hand-off callback is pending on the loop
+        self.in_flight: Future[None] | None = None  # Batch being written by the writer thread
+
+
+class AsyncLogSink:
+    """Collect rendered lines per event loop and write them in batches on one writer thread.
+
+    Inside a running loop a call only appends the line to that loop's buffer; the
+    first line of a batch schedules a callback that hands everything buffered by
+    then to the writer thread. Each loop has at most one batch in flight, so lines
+    keep their order and a stalled stream makes the next batch larger instead of
+    stalling the loop. When a loop has ``max_buffer_bytes`` waiting behind a stalled
+    write, ``overflow`` decides: ``block`` waits for the write on the loop,
+    ``drop_newest``/``drop_oldest`` discard lines. Calls from threads without a
+    running loop, and after ``close``, write inline.
+    """
+
+    def __init__(
+        self,
+        stream: BinaryIO,
+        max_buffer_bytes: int,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        if max_buffer_bytes < 1:
+            raise ValueError(f"max_buffer_bytes must be positive, got {max_buffer_bytes}")
+
+        self._stream = stream
+        self._max_buffer_bytes = max_buffer_bytes
+        self._overflow = OverflowPolicy(overflow)
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-async-writer")
+        self._buffers: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopBuffer] = weakref.WeakKeyDictionary()
+        self._local = threading.local()
+        self._dropped = 0
+        self._closed = False
+        atexit.register(self.close)
+
+    @property
+    def dropped(self) -> int:
+        """Number of lines discarded by a drop overflow policy."""
+        return self._dropped
+
+    def write(self, line: bytes) -> None:
+        """Buffer ``line`` on the running loop, or write it inline when there is none."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._write_inline([line])
+            return
+        if self._closed:
+            self._write_inline([line])
+            return
+
+        local = self._local
+        if getattr(local, "loop", None) is not loop:
+            local.loop = loop
+            local.buffer = self._buffers.setdefault(loop, _LoopBuffer())
+        buffer: _LoopBuffer = local.buffer
+
+        if buffer.size >= self._max_buffer_bytes:
+            if buffer.in_flight is None:
+                # The loop has not yielded since these were logged: hand them off now
+                self._submit(loop, buffer)
+            elif self._overflow is OverflowPolicy.DROP_NEWEST:
+                self._dropped += 1
+                return
+            elif self._overflow is OverflowPolicy.DROP_OLDEST:
+                buffer.size -= len(buffer.lines.pop(0)) + 1
+                self._dropped += 1
+            else:
+                self._drain(buffer)
+
+        buffer.lines.append(line)
+        buffer.size += len(line) + 1
+        if not buffer.scheduled:
+            buffer.scheduled = True
+            loop.call_soon(self._submit, loop, buffer)
+
+    async def flush(self) -> None:
+        """Wait, without blocking the loop, until the lines buffered on this loop are written."""
+        loop = asyncio.get_running_loop()
+        buffer = self._buffers.get(loop)
+        while buffer is not None and (buffer.lines or buffer.in_flight is not None):
+            if buffer.in_flight is None:
+                self._submit(loop, buffer)
+            in_flight = buffer.in_flight
+            if in_flight is None:
+                break  # Written inline after close
+            if not in_flight.done():
+                await asyncio.shield(asyncio.wrap_future(in_flight))
+            self._written(loop, buffer, in_flight)
+
+    def drain(self) -> None:
+        """Write the lines buffered on the calling thread's loop now, blocking until done."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        buffer = self._buffers.get(loop)
+        if buffer is not None:
+            self._drain(buffer)
+
+    def close(self) -> None:
+        """Stop the writer thread and write whatever any loop still has buffered.
+
+        Loops should be done logging (or have awaited ``flush``) by then; lines
+        they log afterwards are written inline.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=True)
+        for buffer in list(self._buffers.values()):
+            buffer.in_flight = None
+            self._write_inline(buffer.lines)
+            buffer.lines = []
+            buffer.size = 0
+        atexit.unregister(self.close)
+
+    def _submit(self, loop: asyncio.AbstractEventLoop, buffer: _LoopBuffer) -> None:
+        buffer.scheduled = False
+        if buffer.in_flight is not None or not buffer.lines:
+            return
+        lines = buffer.lines
+        buffer.lines = []
+        buffer.size = 0
+        if self._closed:
+            self._write_inline(lines)
+            return
+        future = self._executor.submit(self._write_inline, lines)
+        buffer.in_flight = future
+        future.add_done_callback(lambda done: self._notify(loop, buffer, done))
+
+    def _notify(self, loop: asyncio.AbstractEventLoop, buffer: _LoopBuffer, done: "Future[None]") -> None:
+        # Runs on the writer thread; the next batch is handed off from the loop
+        try:
+            loop.call_soon_threadsafe(self._written, loop, buffer, done)
+        except RuntimeError:
+            pass  # Loop closed; close() writes what it left behind
+
+    def _written(self, loop: asyncio.AbstractEventLoop, buffer: _LoopBuffer, done: "Future[None]") -> None:
+        if buffer.in_flight is not done:
+            return
+        buffer.in_flight = None
+        if buffer.lines and not buffer.scheduled:
+            self._submit(loop, buffer)
+
+    def _drain(self, buffer: _LoopBuffer) -> None:
+        """Block until the loop's batch in flight is written, then write the rest inline."""
+        if buffer.in_flight is not None:
+            buffer.in_flight.result()
+            buffer.in_flight = None
+        lines = buffer.lines
+        buffer.lines = []
+        buffer.size = 0
+        self._write_inline(lines)
+
+    def _write_inline(self, lines: list[bytes]) -> None:
+        if not lines:
+            return
+        try:
+            with self._lock:
+                self._stream.write(b"\n".join(lines) + b"\n")
+                self._stream.flush()
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+
+# ============================================================================
+# structlog Integration
+# ============================================================================
+
+
+class AsyncLogger:
+    """Wrapped logger handing each rendered line to an ``AsyncLogSink``."""
+
+    __slots__ = ("name", "_write")
+
+    def __init__(self, sink: AsyncLogSink, name: str):
+        self.name = name
+        self._write = sink.write
+
+    def msg(self, message: bytes) -> None:
+        self._write(message)
+
+    debug = info = warning = warn = error = exception = critical = fatal = msg
+
+
+class AsyncLoggerFactory:
+    """structlog logger factory producing ``AsyncLogger`` instances."""
+
+    def __init__(self, sink: AsyncLogSink):
+        self.sink = sink
+
+    def __call__(self, *args: Any) -> AsyncLogger:
+        return AsyncLogger(self.sink, args[0] if args else "")
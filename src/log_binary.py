@@ -0,0 +1,403 @@
+"""Compact binary log format: length-prefixed records, a per-stream string table and varint timestamps.
+
+A stream starts with ``b"\\x00LOGB\\x01"`` and is followed by records, each a
+varint byte length and a payload whose first byte is its kind:
+
+- ``STRING``: the UTF-8 text of the next string table entry (ids count from 0)
+- ``EVENT``: one event dict, values tagged as below
+
+Event timestamps are zigzag varint deltas from the previous event's. Keys and
+the standard fields are interned on first use, other short strings once they
+repeat. A header may appear again where records start (when the table is full,
+or when a restarted process appends to the same file) and resets the table.
+Decode with ``python -m src.log_binary [FILE ...] [--human]``.
+"""
+
+import argparse
+import struct
+import sys
+import threading
+from typing import Any, BinaryIO, Callable, Iterator, Mapping
+
+from structlog.types import EventDict
+
+# ============================================================================
+# Format
+# ============================================================================
+
+MAGIC = b"\x00LOGB\x01"
+
+_STRING = 0x01
+_EVENT = 0x02
+
+# Value tags
+_NONE = 0x00
+_TRUE = 0x01
+_FALSE = 0x02
+_INT = 0x03  # zigzag varint
+_FLOAT = 0x04  # 8-byte little-endian double
+_REF = 0x05  # varint string table id
+_STR = 0x06  # varint length + UTF-8
+_LIST = 0x07  # varint count + values
+_DICT = 0x08  # varint count + (key ref id, value) pairs
+_TIMESTAMP = 0x09  # zigzag varint delta in ns from the previous event timestamp
+
+_DOUBLE = struct.Struct("<d")
+_TIMESTAMP_KEY = "timestamp"
+# Values of these keys repeat on nearly every line and are interned on first sight
+_CATEGORICAL_KEYS = frozenset(("level", "logger", "message", "context", "correlation_id"))
+_MAX_INTERNED_LENGTH = 128
+_MAX_SEEN_ONCE = 16_384
+
+
+class BinaryFormatError(Exception):
+    """Raised when a binary log stream is malformed."""
+
+
+class _TableFull(Exception):
+    pass
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _json_key(key: Any) -> str:
+    """Dict key as ``json.dumps`` would write it."""
+    if isinstance(key, str):
+        return key
+    if key is True:
+        return "true"
+    if key is False:
+        return "false"
+    if key is None:
+        return "null"
+    if isinstance(key, int):
+        return int.__repr__(key)
+    if isinstance(key, float):
+        return float.__repr__(key)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(key).__name__}")
+
+
+# ============================================================================
+# Encoder
+# ============================================================================
+
+
+class BinaryEncoder:
+    """Stateful encoder for one stream; records must be written in the order they are encoded.
+
+    ``default`` converts values JSON cannot represent, as the JSON renderers do.
+    """
+
+    def __init__(self, default: Callable[[Any], Any] = repr, max_strings: int = 65_536):
+        self._default = default
+        self._max_strings = max_strings
+        self._reset()
+
+    def encode(self, event_dict: EventDict) -> bytes:
+        """Records for one event: a header when the table (re)starts, new string table entries, the event."""
+        try:
+            return self._encode_event(event_dict)
+        except _TableFull:
+            self._reset()
+        try:
+            return self._encode_event(event_dict)
+        except _TableFull:
+            raise BinaryFormatError("event has more distinct strings than the string table holds") from None
+
+    def _reset(self) -> None:
+        self._refs: dict[str, bytes] = {}  # Interned string -> encoded REF value
+        self._key_ids: dict[str, bytes] = {}  # Interned string -> varint id
+        self._seen_once: set[str] = set()
+        self._last_timestamp = 0
+        self._needs_header = True
+
+    def _encode_event(self, event_dict: EventDict) -> bytes:
+        definitions = bytearray(MAGIC if self._needs_header else b"")
+        body = bytearray((_EVENT,))
+        self._encode_dict(event_dict, body, definitions, top_level=True)
+        self._needs_header = False
+        return bytes(definitions + _varint(len(body)) + body)
+
+    def _intern(self, text: str, definitions: bytearray) -> bytes:
+        """Encoded REF for ``text``, defining it first if new."""
+        ref = self._refs.get(text)
+        if ref is None:
+            if len(self._refs) >= self._max_strings:
+                raise _TableFull
+            string_id = _varint(len(self._refs))
+            data = text.encode()
+            definitions += _varint(len(data) + 1)
+            definitions.append(_STRING)
+            definitions += data
+            ref = self._refs[text] = bytes((_REF,)) + string_id
+            self._key_ids[text] = string_id
+        return ref
+
+    def _encode_dict(self, value: Mapping[Any, Any], out: bytearray, definitions: bytearray, top_level: bool) -> None:
+        out.append(_DICT)
+        out += _varint(len(value))
+        key_ids = self._key_ids
+        for key, item in value.items():
+            key = _json_key(key)
+            key_id = key_ids.get(key)
+            if key_id is None:
+                self._intern(key, definitions)
+                key_id = key_ids[key]
+            out += key_id
+
+            if top_level and key == _TIMESTAMP_KEY and type(item) is int:
+                out.append(_TIMESTAMP)
+                out += _varint(_zigzag(item - self._last_timestamp))
+                self._last_timestamp = item
+            elif top_level and key in _CATEGORICAL_KEYS and type(item) is str:
+                out += self._intern(item, definitions)
+            else:
+                self._encode_value(item, out, definitions)
+
+    def _encode_value(self, value: Any, out: bytearray, definitions: bytearray) -> None:
+        if isinstance(value, str):
+            ref = self._refs.get(value)
+            if ref is None and len(value) <= _MAX_INTERNED_LENGTH:
+                # Intern on the second sighting, so one-off values do not fill the table
+                if value in self._seen_once:
+                    self._seen_once.discard(value)
+                    ref = self._intern(value, definitions)
+                else:
+                    if len(self._seen_once) >= _MAX_SEEN_ONCE:
+                        self._seen_once.clear()
+                    self._seen_once.add(value)
+            if ref is not None:
+                out += ref
+            else:
+                data = value.encode()
+                out.append(_STR)
+                out += _varint(len(data))
+                out += data
+        elif value is None:
+            out.append(_NONE)
+        elif value is True:
+            out.append(_TRUE)
+        elif value is False:
+            out.append(_FALSE)
+        elif isinstance(value, int):
+            out.append(_INT)
+            out += _varint(_zigzag(int(value)))
+        elif isinstance(value, float):
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(value)
+        elif isinstance(value, dict):
+            self._encode_dict(value, out, definitions, top_level=False)
+        elif isinstance(value, (list, tuple)):
+            out.append(_LIST)
+            out += _varint(len(value))
+            for item in value:
+                self._encode_value(item, out, definitions)
+        else:
+            self._encode_value(self._default(value), out, definitions)
+
+
+# ============================================================================
+# Output Backend
+# ============================================================================
+
+
+class BinaryLogger:
+    """Wrapped logger encoding event dicts to a binary stream under the stream lock."""
+
+    __slots__ = ("name", "_factory")
+
+    def __init__(self, factory: "BinaryLoggerFactory", name: str):
+        self.name = name
+        self._factory = factory
+
+    def msg(self, event_dict: EventDict) -> None:
+        self._factory.write(event_dict)
+
+    debug = info = warning = warn = error = exception = critical = fatal = msg
+
+
+class BinaryLoggerFactory:
+    """structlog logger factory producing ``BinaryLogger`` instances sharing one stream and encoder.
+
+    Encoding happens under the stream lock because string ids and timestamp
+    deltas depend on the order records are written in. A stream with a
+    ``segment`` counter (``RotatingFileStream``) gets a fresh string table in
+    each file, so every rotated file decodes on its own.
+    """
+
+    def __init__(self, stream: BinaryIO, default: Callable[[Any], Any] = repr):
+        self.stream = stream
+        self._default = default
+        self._encoder = BinaryEncoder(default)
+        self._segment = getattr(stream, "segment", 0)
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: Any) -> BinaryLogger:
+        return BinaryLogger(self, args[0] if args else "")
+
+    def write(self, event_dict: EventDict) -> None:
+        with self._lock:
+            segment = getattr(self.stream, "segment", 0)
+            if segment != self._segment:
+                self._segment = segment
+                self._encoder = BinaryEncoder(self._default)
+            self.stream.write(self._encoder.encode(event_dict))
+            self.stream.flush()
+
+
+# ============================================================================
+# Decoder
+# ============================================================================
+
+
+def _read_varint(stream: BinaryIO) -> int | None:
+    """Next varint, or None at a clean end of stream."""
+    result = 0
+    shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise BinaryFormatError("stream ends inside a record length")
+            return None
+        result |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return result
+        shift += 7
+
+
+def _decode_varint(data: bytes, pos: int) -> tuple[int, int]:
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+
+
+class _EventDecoder:
+    def __init__(self) -> None:
+        self.strings: list[str] = []
+        self.last_timestamp = 0
+
+    def value(self, data: bytes, pos: int) -> tuple[Any, int]:
+        tag = data[pos]
+        pos += 1
+        if tag == _REF:
+            string_id, pos = _decode_varint(data, pos)
+            return self.strings[string_id], pos
+        if tag == _STR:
+            length, pos = _decode_varint(data, pos)
+            return data[pos : pos + length].decode(), pos + length
+        if tag == _DICT:
+            count, pos = _decode_varint(data, pos)
+            result = {}
+            for _ in range(count):
+                key_id, pos = _decode_varint(data, pos)
+                result[self.strings[key_id]], pos = self.value(data, pos)
+            return result, pos
+        if tag == _INT:
+            raw, pos = _decode_varint(data, pos)
+            return _unzigzag(raw), pos
+        if tag == _TIMESTAMP:
+            raw, pos = _decode_varint(data, pos)
+            self.last_timestamp += _unzigzag(raw)
+            return self.last_timestamp, pos
+        if tag == _NONE:
+            return None, pos
+        if tag == _TRUE:
+            return True, pos
+        if tag == _FALSE:
+            return False, pos
+        if tag == _FLOAT:
+            return _DOUBLE.unpack_from(data, pos)[0], pos + _DOUBLE.size
+        if tag == _LIST:
+            count, pos = _decode_varint(data, pos)
+            items = []
+            for _ in range(count):
+                item, pos = self.value(data, pos)
+                items.append(item)
+            return items, pos
+        raise BinaryFormatError(f"unknown value tag {tag:#04x}")
+
+
+def read_binary_events(stream: BinaryIO) -> Iterator[dict[str, Any]]:
+    """Decode the event dicts of a binary log stream, timestamps as epoch nanoseconds."""
+    decoder = None
+    while True:
+        length = _read_varint(stream)
+        if length is None:
+            return
+        if length == 0:
+            if stream.read(len(MAGIC) - 1) != MAGIC[1:]:
+                raise BinaryFormatError("bad stream header")
+            decoder = _EventDecoder()
+            continue
+        if decoder is None:
+            raise BinaryFormatError("missing stream header")
+
+        payload = stream.read(length)
+        if len(payload) < length:
+            raise BinaryFormatError("stream ends inside a record")
+        try:
+            if payload[0] == _STRING:
+                decoder.strings.append(payload[1:].decode())
+            elif payload[0] == _EVENT:
+                event, _ = decoder.value(payload, 1)
+                yield event
+        except (IndexError, UnicodeDecodeError) as e:
+            raise BinaryFormatError(f"corrupt record: {e}") from e
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print binary logs as today's JSON lines or human-readable lines."""
+    # Imported here: src.logging selects this format as an output backend and imports this module
+    import structlog
+
+    from src.logging import HumanReadableFormatter, _with_iso_timestamp
+
+    parser = argparse.ArgumentParser(description="Decode binary log streams.")
+    parser.add_argument("paths", nargs="*", help="binary log files (default: stdin)")
+    parser.add_argument("--human", action="store_true", help="render like the human-readable formatter")
+    args = parser.parse_args(argv)
+
+    render: Callable[..., Any] = (
+        HumanReadableFormatter() if args.human else _with_iso_timestamp(structlog.processors.JSONRenderer())
+    )
+    streams = [open(path, "rb") for path in args.paths] if args.paths else [sys.stdin.buffer]
+    try:
+        for stream in streams:
+            for event in read_binary_events(stream):
+                print(render(None, event.get("level", "info"), event))
+    except BrokenPipeError:
+        return 0
+    except (BinaryFormatError, OSError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        for stream in streams:
+            if stream is not sys.stdin.buffer:
+                stream.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""In-memory capture of processed log events, for test suites asserting on logging.
+
+``configure_structlog(capture=LogCapture())`` puts the capture where the
+renderer would be: events go through the usual processing (level thresholds,
+context, ``extra``, exceptions, value limits) and the resulting dicts are kept
+instead of being rendered and written, so assertions read fields directly::
+
+    {"timestamp": 1718000000123456789, "level": "info", "logger": "src.api",
+     "message": "Handled", "context": "default", "extra": {"correlation_id": "req-1"}}
+
+``timestamp`` stays in epoch nanoseconds (the JSON output formats it as ISO).
+The ``log_capture`` fixture of ``src.log_pytest`` sets this up per test.
+"""
+
+import itertools
+import threading
+from asyncio import Task, _get_running_loop, current_task
+from functools import partial
+from heapq import merge
+from typing import Any, Iterator
+
+from structlog.types import EventDict, WrappedLogger
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+_LEVEL = "level"
+_LOGGER = "logger"
+_MESSAGE = "message"
+_EXTRA = "extra"
+_CORRELATION_ID = "correlation_id"
+
+# (args, kwargs) for the wrapped logger method: nothing to write
+_NOTHING: tuple[tuple[()], dict[str, Any]] = ((), {})
+
+# Events of one thread, or one asyncio task, as (sequence number, event dict)
+_Buffer = list[tuple[int, EventDict]]
+
+# Whose buffer: the thread, and id() of the running asyncio task (0 outside of tasks)
+_Key = tuple[threading.Thread, int]
+
+
+# ============================================================================
+# Capture
+# ============================================================================
+
+
+class LogCapture:
+    """Final processor keeping processed event dicts in memory, one buffer per thread and asyncio task.
+
+    Each thread, and each asyncio task, appends to a buffer of its own without
+    taking a lock; a global sequence number orders events across buffers.
+    ``events`` merges them in logging order, or reads only the caller's buffer
+    with ``local=True`` (what the current task or thread logged, whatever
+    runs alongside it). Nothing is shared between processes, so parallel test
+    workers (pytest-xdist) are isolated by construction.
+
+    Tasks are not kept alive by their buffers: a task's buffer is looked up
+    by ``id()`` until the task is done, and stays among the captured events.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._buffers: dict[_Key, _Buffer] = {}  # of running threads and tasks, for appending
+        self._all: list[_Buffer] = []  # every buffer, for reading
+        self._sequence = itertools.count()
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> tuple[Any, ...]:
+        buffer = self._buffers.get(key := _caller())
+        if buffer is None:
+            buffer = self._add_buffer(key)
+        buffer.append((next(self._sequence), event_dict))
+        return _NOTHING
+
+    def __len__(self) -> int:
+        return sum(len(buffer) for buffer in list(self._all))
+
+    def __iter__(self) -> Iterator[EventDict]:
+        return iter(self.events())
+
+    def events(
+        self,
+        level: str | None = None,
+        logger: str | None = None,
+        correlation_id: str | None = None,
+        message: str | None = None,
+        *,
+        local: bool = False,
+    ) -> list[EventDict]:
+        """Captured events in logging order, filtered by the given fields.
+
+        ``level`` is a level name in any case; ``logger`` matches that name and
+        the loggers below it (``src.db`` matches ``src.db.pool``);
+        ``correlation_id`` matches ``extra.correlation_id``. ``local=True``
+        keeps only the events of the calling thread or asyncio task.
+        """
+        if local:
+            entries: Iterator[tuple[int, EventDict]] = iter(list(self._buffers.get(_caller(), ())))
+        else:
+            entries = merge(*(list(buffer) for buffer in list(self._all)))
+
+        wanted_level = level.lower() if level is not None else None
+        prefix = f"{logger}."
+        selected = []
+        for _, event in entries:
+            if wanted_level is not None and event[_LEVEL] != wanted_level:
+                continue
+            if logger is not None and event[_LOGGER] != logger and not event[_LOGGER].startswith(prefix):
+                continue
+            if message is not None and event[_MESSAGE] != message:
+                continue
+            if correlation_id is not None and event.get(_EXTRA, {}).get(_CORRELATION_ID) != correlation_id:
+                continue
+            selected.append(event)
+        return selected
+
+    def messages(self, level: str | None = None, logger: str | None = None, *, local: bool = False) -> list[str]:
+        """Messages of the captured events in logging order, filtered as in ``events``."""
+        return [event[_MESSAGE] for event in self.events(level, logger, local=local)]
+
+    def clear(self) -> None:
+        """Forget every captured event."""
+        with self._lock:
+            self._buffers = {}
+            self._all = []
+
+    def _add_buffer(self, key: _Key) -> _Buffer:
+        buffer: _Buffer = []
+        with self._lock:
+            self._buffers[key] = buffer
+            self._all.append(buffer)
+        if key[1] and (task := _current_task()) is not None:
+            # Forget the id once the task is done: a later task may be given the same one
+            task.add_done_callback(partial(self._forget, key))
+        return buffer
+
+    def _forget(self, key: _Key, task: Task[Any]) -> None:
+        with self._lock:
+            self._buffers.pop(key, None)
+
+
+def _current_task() -> Task[Any] | None:
+    loop = _get_running_loop()
+    return current_task(loop) if loop is not None else None
+
+
+def _caller() -> _Key:
+    task = _current_task()
+    return threading.current_thread(), id(task) if task is not None else 0
+
+
+class CaptureLogger:
+    """Wrapped logger of capture mode: the capture already kept the event, so there is nothing to write."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def msg(self, *args: Any, **kwargs: Any) -> None:
+        pass
+
+    debug = info = warning = warn = error = exception = critical = fatal = msg
+
+
+class CaptureLoggerFactory:
+    """structlog logger factory producing ``CaptureLogger`` instances."""
+
+    def __call__(self, *args: Any) -> CaptureLogger:
+        return CaptureLogger(args[0] if args else "")
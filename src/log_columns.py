@@ -0,0 +1,418 @@
+"""Columnar loader for JSON log files, for analysis with NumPy (see ``research/EDA.ipynb``).
+
+``load_log_columns("app.log", extra={"duration_ms": "float64", "path": "category"})``
+parses the file in byte-range chunks across processes and returns NumPy
+columns: epoch-nanosecond timestamps, dictionary-encoded ``level``,
+``logger``, ``context`` and ``message``, and the requested ``extra`` keys as
+typed columns. The result is cached next to the log file (``<file>.columns/``)
+as ``.npy`` arrays that later loads memory-map instead of parsing again.
+
+Lines in the layout the renderers emit are split with one regular expression
+per chunk; anything else (reordered keys, foreign lines) falls back to
+``json.loads``. Requires the optional ``numpy`` dependency.
+"""
+
+import json
+import multiprocessing
+import os
+import re
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from itertools import repeat
+from pathlib import Path
+from typing import Any, Mapping
+
+import numpy as np
+import numpy.typing as npt
+
+# Missing integer values and timestamps; the same bit pattern as NumPy's NaT
+MISSING = int(np.iinfo(np.int64).min)
+
+_CACHE_VERSION = 1
+_CHUNK_BYTES = 8 << 20
+_POOL_CONTEXT = multiprocessing.get_context("spawn")
+
+# ============================================================================
+# Line Layout
+# ============================================================================
+
+_QUOTED = rb'"[^"\\\n]*(?:\\.[^"\\\n]*)*"'
+_STRING = rb'"(' + _QUOTED[1:-1] + rb')"'
+# level, logger, then context and message (message first unless context is bound, as the fused
+# processor keeps the chained key order), extra object (optional), timestamp
+_LINE = re.compile(
+    rb'^\{"level": ' + _STRING + rb', "logger": ' + _STRING
+    + rb'(?:, "context": ' + _STRING + rb', "message": ' + _STRING
+    + rb'|, "message": ' + _STRING + rb', "context": ' + _STRING + rb')'
+    + rb'(?:, "extra": (\{.*\}))?, "timestamp": "([^"\n]*)"\}$',
+    re.MULTILINE,
+)  # fmt: skip
+_NUMERIC_START = frozenset(b"-0123456789")
+_ABSENT = (b"", b"null")
+_BASE_FIELDS = ("level", "logger", "context", "message")
+
+_Row = tuple[bytes, bytes, bytes, bytes, bytes, bytes]
+# _LINE groups: level, logger, context, message | message, context, extra, timestamp
+_Match = tuple[bytes, bytes, bytes, bytes, bytes, bytes, bytes, bytes]
+
+
+class ColumnType(str, Enum):
+    """Type of a column built from an ``extra`` key."""
+
+    INT64 = "int64"  # Missing or non-numeric values are MISSING
+    FLOAT64 = "float64"  # Missing or non-numeric values are NaN
+    CATEGORY = "category"  # Dictionary-encoded text; missing values have code -1
+
+
+# ============================================================================
+# Columns
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class Categorical:
+    """Dictionary-encoded text column: ``categories[codes[i]]``, code -1 when missing."""
+
+    codes: npt.NDArray[np.int32]
+    categories: tuple[str, ...]
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def equals(self, value: str) -> npt.NDArray[np.bool_]:
+        """Row mask of ``value``, without decoding the column."""
+        try:
+            code = self.categories.index(value)
+        except ValueError:
+            return np.zeros(len(self.codes), dtype=np.bool_)
+        return np.equal(self.codes, code)
+
+    def counts(self) -> dict[str, int]:
+        """Rows per category, most frequent first."""
+        counts = np.bincount(self.codes[self.codes >= 0], minlength=len(self.categories))
+        return {self.categories[code]: int(counts[code]) for code in np.argsort(-counts, kind="stable")}
+
+    def decode(self) -> npt.NDArray[np.object_]:
+        """Object array of the values, ``None`` where missing."""
+        table = np.array([*self.categories, None], dtype=object)
+        return table[self.codes]
+
+
+@dataclass(frozen=True)
+class LogColumns:
+    """Columns of one log file, one row per line."""
+
+    timestamp: npt.NDArray[np.int64]  # Epoch nanoseconds, MISSING when absent
+    level: Categorical
+    logger: Categorical
+    context: Categorical
+    message: Categorical
+    extra: dict[str, npt.NDArray[Any] | Categorical] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def to_dict(self) -> dict[str, npt.NDArray[Any]]:
+        """Decoded columns by name, e.g. for ``pandas.DataFrame(columns.to_dict())``."""
+        columns: dict[str, npt.NDArray[Any]] = {"timestamp": self.timestamp.view("datetime64[ns]")}
+        for name in _BASE_FIELDS:
+            columns[name] = getattr(self, name).decode()
+        for name, column in self.extra.items():
+            columns[name] = column.decode() if isinstance(column, Categorical) else column
+        return columns
+
+
+# ============================================================================
+# Chunk Parsing (runs in worker processes)
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class _Chunk:
+    timestamp: npt.NDArray[np.int64]
+    columns: dict[str, npt.NDArray[Any] | tuple[npt.NDArray[np.int32], list[str]]]
+
+
+def _escaped(value: Any) -> bytes:
+    """A JSON value as the raw contents of the string the renderer would emit."""
+    return json.dumps(value if isinstance(value, str) else str(value))[1:-1].encode()
+
+
+def _rows(matches: list[_Match]) -> list[_Row]:
+    """Rows of ``_LINE`` matches; only one of the two context/message group pairs matched (the other is empty)."""
+    return [
+        (level, logger, context or context_after, message or message_first, extra, timestamp)
+        for level, logger, context, message, message_first, context_after, extra, timestamp in matches
+    ]
+
+
+def _parse_line(line: bytes) -> _Row | None:
+    """Fallback for a line not in the renderer layout."""
+    match = _LINE.match(line)
+    if match is not None:
+        return _rows([match.groups(b"")])[0]  # type: ignore[list-item]
+    try:
+        event = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(event, dict):
+        return None
+    extra = event.get("extra")
+    return (
+        *(_escaped(event.get(name, "")) for name in _BASE_FIELDS),
+        json.dumps(extra).encode() if isinstance(extra, dict) else b"",
+        _escaped(event.get("timestamp", "")),
+    )  # type: ignore[return-value]
+
+
+def _tokens(extras: list[bytes], key: str) -> list[bytes]:
+    """The raw JSON text of ``key`` in each ``extra`` object, empty where absent."""
+    # One match per line; in a flat object a quoted key followed by ": " can only be one of its keys
+    pattern = re.compile(
+        rb'^(?:[^\n]*?"' + re.escape(_escaped(key)) + rb'": (' + _QUOTED + rb"|[^,}\n]*))?[^\n]*$", re.M
+    )
+    joined = b"\n".join(extras)
+    tokens: list[bytes] = pattern.findall(joined) if extras else []
+    if joined.count(b"{") != len(extras) - extras.count(b""):
+        # Nested objects may hold the same key, so those lines are read as JSON
+        for position, text in enumerate(extras):
+            if text.count(b"{") > 1:
+                value = json.loads(text).get(key)
+                tokens[position] = b"" if value is None else json.dumps(value).encode()
+    return tokens
+
+
+def _decode_string(raw: bytes) -> str:
+    return json.loads(b'"' + raw + b'"') if b"\\" in raw else raw.decode()
+
+
+def _encode(values: list[bytes] | list[bytes | None]) -> tuple[npt.NDArray[np.int32], list[str]]:
+    """Dictionary-encode raw JSON string contents (``None`` is missing); only distinct values are decoded."""
+    table: dict[bytes, int] = {}
+    assign = table.setdefault
+    codes = np.array([-1 if value is None else assign(value, len(table)) for value in values], dtype=np.int32)
+    return codes, [_decode_string(raw) for raw in table]
+
+
+def _number(token: bytes) -> float | None:
+    if token and token[0] in _NUMERIC_START:
+        return float(token)
+    if token == b"true" or token == b"false":
+        return float(token == b"true")
+    return None
+
+
+def _column(tokens: list[bytes], kind: ColumnType) -> npt.NDArray[Any] | tuple[npt.NDArray[np.int32], list[str]]:
+    if kind is ColumnType.CATEGORY:
+        absent = _ABSENT
+        return _encode([token[1:-1] if token[:1] == b'"' else None if token in absent else token for token in tokens])
+    array = np.array(tokens, dtype=np.bytes_) if tokens else np.empty(0, np.bytes_)
+    missing = np.isin(array, _ABSENT)
+    try:
+        if kind is ColumnType.FLOAT64:
+            return np.where(missing, b"nan", array).astype(np.float64)
+        values = np.where(missing, b"0", array).astype(np.int64)
+    except ValueError:
+        # Strings, booleans or fractions among the numbers: convert one by one
+        numbers = [None if gap else _number(token) for gap, token in zip(missing.tolist(), tokens)]
+        if kind is ColumnType.FLOAT64:
+            return np.array([np.nan if number is None else number for number in numbers], dtype=np.float64)
+        values = np.array([0 if number is None else int(number) for number in numbers], dtype=np.int64)
+        missing |= np.array([number is None for number in numbers], dtype=np.bool_)
+    values[missing] = MISSING
+    return values
+
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _epoch_ns(text: str) -> int:
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        return MISSING
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return (moment - _EPOCH) // _MICROSECOND * 1000
+
+
+def _timestamps(raw: list[bytes]) -> npt.NDArray[np.int64]:
+    """Parse UTC ISO-8601 timestamps in one NumPy call, per value when the text varies."""
+    texts = b"\n".join(raw).decode().split("\n") if raw else []
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return np.array([text.removesuffix("Z") for text in texts], dtype="datetime64[ns]").view(np.int64)
+    except (ValueError, Warning):
+        return np.fromiter((_epoch_ns(text) for text in texts), np.int64, len(texts))
+
+
+def _parse_chunk(path: str, start: int, stop: int, extra: tuple[tuple[str, ColumnType], ...]) -> _Chunk:
+    with open(path, "rb") as stream:
+        stream.seek(start)
+        data = stream.read(stop - start)
+    data = data[: data.rfind(b"\n") + 1]  # A trailing line still being written is left out
+
+    rows = _rows(_LINE.findall(data))
+    if len(rows) != data.count(b"\n"):
+        parsed = (_parse_line(line) for line in data.splitlines() if line.strip())
+        rows = [row for row in parsed if row is not None]
+
+    columns: dict[str, npt.NDArray[Any] | tuple[npt.NDArray[np.int32], list[str]]] = {}
+    for position, name in enumerate(_BASE_FIELDS):
+        columns[name] = _encode([row[position] for row in rows])
+    if extra:
+        extras = [row[4] for row in rows]
+        for key, kind in extra:
+            columns[f"extra.{key}"] = _column(_tokens(extras, key), kind)
+    return _Chunk(timestamp=_timestamps([row[5] for row in rows]), columns=columns)
+
+
+# ============================================================================
+# Loading and Caching
+# ============================================================================
+
+
+def _bounds(path: Path, size: int, chunk_bytes: int) -> list[tuple[int, int]]:
+    """Byte ranges of about ``chunk_bytes``, each starting at a line start."""
+    starts = [0]
+    with open(path, "rb") as stream:
+        while starts[-1] + chunk_bytes < size:
+            stream.seek(starts[-1] + chunk_bytes - 1)
+            stream.readline()
+            if stream.tell() >= size:
+                break
+            starts.append(stream.tell())
+    return list(zip(starts, [*starts[1:], size]))
+
+
+def _merge(chunks: list[_Chunk], extra: tuple[tuple[str, ColumnType], ...]) -> LogColumns:
+    def categorical(name: str) -> Categorical:
+        table: dict[str, int] = {}
+        parts = []
+        for chunk in chunks:
+            codes, categories = chunk.columns[name]
+            # Codes of -1 pick the trailing -1 and stay missing
+            remap = np.array([*(table.setdefault(value, len(table)) for value in categories), -1], dtype=np.int32)
+            parts.append(remap[codes])
+        return Categorical(np.concatenate(parts) if parts else np.empty(0, np.int32), tuple(table))
+
+    columns: dict[str, npt.NDArray[Any] | Categorical] = {}
+    for key, kind in extra:
+        name = f"extra.{key}"
+        if kind is ColumnType.CATEGORY:
+            columns[key] = categorical(name)
+        else:
+            parts = [chunk.columns[name] for chunk in chunks]
+            columns[key] = np.concatenate(parts) if parts else np.empty(0, kind.value)  # type: ignore[arg-type]
+    timestamps = [chunk.timestamp for chunk in chunks]
+    return LogColumns(
+        timestamp=np.concatenate(timestamps) if timestamps else np.empty(0, np.int64),
+        level=categorical("level"),
+        logger=categorical("logger"),
+        context=categorical("context"),
+        message=categorical("message"),
+        extra=columns,
+    )
+
+
+def _source_stamp(path: Path) -> dict[str, int]:
+    stat = path.stat()
+    return {"inode": stat.st_ino, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _cache_spec(extra: tuple[tuple[str, ColumnType], ...]) -> list[list[str]]:
+    return [[key, kind.value] for key, kind in extra]
+
+
+def _save_array(path: Path, array: npt.NDArray[Any]) -> None:
+    # Replace rather than overwrite, so arrays still mapped by another reader stay intact
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with open(tmp, "wb") as stream:
+        np.save(stream, array, allow_pickle=False)
+    os.replace(tmp, path)
+
+
+def _write_cache(
+    cache: Path, columns: LogColumns, stamp: dict[str, int], extra: tuple[tuple[str, ColumnType], ...]
+) -> None:
+    cache.mkdir(parents=True, exist_ok=True)
+    (cache / "meta.json").unlink(missing_ok=True)
+    categories: dict[str, list[str]] = {}
+    named: list[tuple[str, npt.NDArray[Any] | Categorical]] = [("timestamp", columns.timestamp)]
+    named += [(name, getattr(columns, name)) for name in _BASE_FIELDS]
+    named += [(f"extra.{position}", columns.extra[key]) for position, (key, _) in enumerate(extra)]
+    for name, column in named:
+        if isinstance(column, Categorical):
+            categories[name] = list(column.categories)
+            column = column.codes
+        _save_array(cache / f"{name}.npy", column)
+    meta = {"version": _CACHE_VERSION, "source": stamp, "extra": _cache_spec(extra), "categories": categories}
+    tmp = cache / f"meta.json.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(meta))
+    os.replace(tmp, cache / "meta.json")
+
+
+def _read_cache(cache: Path, stamp: dict[str, int], extra: tuple[tuple[str, ColumnType], ...]) -> LogColumns | None:
+    try:
+        meta = json.loads((cache / "meta.json").read_text())
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != _CACHE_VERSION or meta["source"] != stamp or meta["extra"] != _cache_spec(extra):
+        return None
+    categories = meta["categories"]
+
+    def load(name: str) -> npt.NDArray[Any] | Categorical:
+        array = np.load(cache / f"{name}.npy", mmap_mode="r")
+        return Categorical(array, tuple(categories[name])) if name in categories else array
+
+    try:
+        fields = {name: load(name) for name in ("timestamp", *_BASE_FIELDS)}
+        columns = {key: load(f"extra.{position}") for position, (key, _) in enumerate(extra)}
+        return LogColumns(**fields, extra=columns)  # type: ignore[arg-type]
+    except (OSError, ValueError):
+        return None
+
+
+def load_log_columns(
+    path: str | os.PathLike[str],
+    extra: Mapping[str, ColumnType | str] | None = None,
+    *,
+    workers: int | None = None,
+    cache: bool = True,
+    cache_path: str | os.PathLike[str] | None = None,
+    chunk_bytes: int = _CHUNK_BYTES,
+) -> LogColumns:
+    """Load a JSON log file into columns, reusing the cache while the file is unchanged.
+
+    ``extra`` maps ``extra`` keys to the column type to build for them.
+    ``workers`` defaults to the number of CPUs; files of one chunk are parsed
+    in-process. The cache lives at ``cache_path`` (default ``<file>.columns``)
+    and is rebuilt whenever the file or the requested columns change.
+    """
+    source = Path(path)
+    spec = tuple((key, ColumnType(kind)) for key, kind in (extra or {}).items())
+    cache_dir = Path(cache_path) if cache_path is not None else Path(f"{source}.columns")
+    stamp = _source_stamp(source)
+    if cache:
+        cached = _read_cache(cache_dir, stamp, spec)
+        if cached is not None:
+            return cached
+
+    bounds = _bounds(source, stamp["size"], chunk_bytes)
+    workers = min(workers or os.cpu_count() or 1, len(bounds))
+    starts, stops = [start for start, _ in bounds], [stop for _, stop in bounds]
+    if workers > 1:
+        with ProcessPoolExecutor(workers, mp_context=_POOL_CONTEXT) as executor:
+            chunks = list(executor.map(_parse_chunk, repeat(str(source)), starts, stops, repeat(spec)))
+    else:
+        chunks = list(map(_parse_chunk, repeat(str(source)), starts, stops, repeat(spec)))
+    columns = _merge(chunks, spec)
+
+    if cache:
+        _write_cache(cache_dir, columns, stamp, spec)
+    return columns
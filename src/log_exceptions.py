@@ -0,0 +1,226 @@
+"""Structured exception rendering with traceback fingerprints and repeat suppression.
+
+The event processor hands ``exc_info`` (``logger.exception(...)`` or
+``exc_info=True``/an exception/a ``sys.exc_info()`` tuple) to ``ExceptionRenderer``,
+which replaces it with ``extra["exception"]``::
+
+    {"type": "ValueError", "message": "...", "fingerprint": "3f2a9c1e0b7d4e6a",
+     "frames": ["/app/src/api.py:42 in handle", ...], "frames_omitted": 3,
+     "causes": [{"relation": "cause", "type": ..., "message": ..., "frames": [...]}]}
+
+The fingerprint hashes the exception types and code locations (file, function,
+line) of the whole chain, so it is stable across processes and identical for
+every occurrence of the same failure. Frames, the costly part, are only
+formatted for the first occurrence in a ``dedup_window_s`` window; later ones
+render as ``{"type", "message", "fingerprint", "occurrence"}``.
+"""
+
+import hashlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import TracebackType
+from typing import Any, Callable
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class ExceptionConfig:
+    """Limits and repeat suppression applied by ``ExceptionRenderer``."""
+
+    max_frames: int = 20  # Innermost frames kept per exception; the rest are counted
+    max_chain: int = 3  # Causes/contexts rendered below the logged exception
+    max_message_chars: int = 1000
+    dedup_window_s: float = 60.0  # Repeats within this long of a full rendering carry only the fingerprint; 0: off
+    cache_size: int = 1024  # Fingerprints remembered (least recently seen evicted)
+
+
+DEFAULT_EXCEPTION_CONFIG = ExceptionConfig()
+
+EXC_INFO_KEY = "exc_info"
+EXCEPTION_KEY = "exception"
+
+# Code locations of a chain: ((type name, ((file, function, line), ...)), ...)
+_ChainKey = tuple[tuple[str, tuple[tuple[str, str, int], ...]], ...]
+
+
+class _Seen:
+    """A fingerprint's full rendering time and occurrences since."""
+
+    __slots__ = ("fingerprint", "rendered_at", "occurrences")
+
+    def __init__(self, fingerprint: str, rendered_at: float) -> None:
+        self.fingerprint = fingerprint
+        self.rendered_at = rendered_at
+        self.occurrences = 1
+
+
+# ============================================================================
+# Renderer
+# ============================================================================
+
+
+class ExceptionRenderer:
+    """Replace ``extra["exc_info"]`` with a structured, fingerprinted ``extra["exception"]``.
+
+    Runs on the logging thread (``exc_info=True`` reads that thread's current
+    exception). Only the traceback's code objects and line numbers are read
+    per occurrence; frame strings and the fingerprint hash are built when a
+    fingerprint is rendered in full, without reading source lines.
+    """
+
+    def __init__(self, config: ExceptionConfig = DEFAULT_EXCEPTION_CONFIG, clock: Callable[[], float] = time.monotonic):
+        if config.max_frames < 1 or config.max_chain < 0 or config.cache_size < 1:
+            raise ValueError(f"invalid exception rendering limits: {config}")
+
+        self.config = config
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._seen: OrderedDict[_ChainKey, _Seen] = OrderedDict()
+
+    def __call__(self, extra: dict[str, Any]) -> dict[str, Any]:
+        exception = _exception_of(extra.pop(EXC_INFO_KEY))
+        if exception is not None:
+            extra[EXCEPTION_KEY] = self.render(exception)
+        return extra
+
+    def render(self, exception: BaseException) -> dict[str, Any]:
+        """Full structured rendering, or the repeat form within the dedup window."""
+        chain = self._chain(exception)
+        key: _ChainKey = tuple((_type_name(type(item)), _locations(item.__traceback__)) for item, _ in chain)
+
+        window = self.config.dedup_window_s
+        with self._lock:
+            now = self._clock()
+            seen = self._seen.get(key)
+            if seen is not None:
+                self._seen.move_to_end(key)
+                if now - seen.rendered_at < window:
+                    seen.occurrences += 1
+                    return {
+                        "type": key[0][0],
+                        "message": self._message(exception),
+                        "fingerprint": seen.fingerprint,
+                        "occurrence": seen.occurrences,
+                    }
+                seen.rendered_at = now
+                seen.occurrences = 1
+                fingerprint = seen.fingerprint
+            else:
+                fingerprint = _fingerprint(key)
+                self._seen[key] = _Seen(fingerprint, now)
+                if len(self._seen) > self.config.cache_size:
+                    self._seen.popitem(last=False)
+
+        rendered = self._describe(exception, key[0][1], fingerprint)
+        if len(chain) > 1:
+            rendered["causes"] = [
+                {"relation": relation, **self._describe(item, locations)}
+                for (item, relation), (_, locations) in zip(chain[1:], key[1:], strict=True)
+            ]
+        return rendered
+
+    def _chain(self, exception: BaseException) -> list[tuple[BaseException, str]]:
+        """The exception and up to ``max_chain`` causes/contexts, as Python would print them."""
+        chain = [(exception, "")]
+        seen = {id(exception)}
+        current: BaseException | None = exception
+        while current is not None and len(chain) <= self.config.max_chain:
+            if current.__cause__ is not None:
+                current, relation = current.__cause__, "cause"
+            elif current.__context__ is not None and not current.__suppress_context__:
+                current, relation = current.__context__, "context"
+            else:
+                break
+            if id(current) in seen:
+                break
+            seen.add(id(current))
+            chain.append((current, relation))
+        return chain
+
+    def _describe(
+        self, exception: BaseException, locations: tuple[tuple[str, str, int], ...], fingerprint: str | None = None
+    ) -> dict[str, Any]:
+        kept = locations[-self.config.max_frames :]
+        described: dict[str, Any] = {"type": _type_name(type(exception)), "message": self._message(exception)}
+        if fingerprint is not None:
+            described["fingerprint"] = fingerprint
+        described["frames"] = [f"{filename}:{line} in {function}" for filename, function, line in kept]
+        if len(locations) > len(kept):
+            described["frames_omitted"] = len(locations) - len(kept)
+        return described
+
+    def _message(self, exception: BaseException) -> str:
+        try:
+            message = str(exception)
+        except Exception:
+            message = "<unprintable message>"
+        limit = self.config.max_message_chars
+        return message if len(message) <= limit else f"{message[:limit]}...[+{len(message) - limit} chars]"
+
+
+def _exception_of(exc_info: Any) -> BaseException | None:
+    """The exception an ``exc_info`` argument refers to, as ``logging`` interprets it."""
+    if isinstance(exc_info, BaseException):
+        return exc_info
+    if isinstance(exc_info, tuple):
+        return exc_info[1] if len(exc_info) == 3 and isinstance(exc_info[1], BaseException) else None
+    if exc_info:
+        return sys.exc_info()[1]
+    return None
+
+
+def _locations(tb: TracebackType | None) -> tuple[tuple[str, str, int], ...]:
+    locations = []
+    while tb is not None:
+        code = tb.tb_frame.f_code
+        locations.append((code.co_filename, code.co_name, tb.tb_lineno))
+        tb = tb.tb_next
+    return tuple(locations)
+
+
+def _type_name(kind: type) -> str:
+    module = kind.__module__
+    return kind.__qualname__ if module == "builtins" else f"{module}.{kind.__qualname__}"
+
+
+def _fingerprint(key: _ChainKey) -> str:
+    digest = hashlib.blake2b(digest_size=8)
+    for type_name, locations in key:
+        digest.update(type_name.encode())
+        for filename, function, line in locations:
+            digest.update(f"\0{filename}\0{function}\0{line}".encode())
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+def format_exception_block(exception: dict[str, Any]) -> str:
+    """Multi-line text of a rendered ``extra["exception"]`` for human-readable output."""
+    fingerprint = exception.get("fingerprint", "")
+    if "occurrence" in exception:
+        return f"{exception['type']}: {exception['message']} [fingerprint {fingerprint}, occurrence {exception['occurrence']}]"
+
+    lines = []
+    for cause in reversed(exception.get("causes", ())):
+        lines.extend(_format_one(cause))
+        if cause.get("relation") == "cause":
+            lines += ["", "The above exception was the direct cause of the following exception:", ""]
+        else:
+            lines += ["", "During handling of the above exception, another exception occurred:", ""]
+    lines.extend(_format_one(exception))
+    lines.append(f"[fingerprint {fingerprint}]")
+    return "\n".join(lines)
+
+
+def _format_one(exception: dict[str, Any]) -> list[str]:
+    lines = ["Traceback (most recent call last):"]
+    if exception.get("frames_omitted"):
+        lines.append(f"  ... {exception['frames_omitted']} earlier frames omitted")
+    lines.extend(f"  {frame}" for frame in exception.get("frames", ()))
+    lines.append(f"{exception.get('type')}: {exception.get('message')}")
+    return lines
@@ -0,0 +1,211 @@
+"""Rotating file sink: buffered writes, size and time based rotation, background compression of closed segments."""
+
+import gzip
+import io
+import lzma
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Callable
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+class Compression(str, Enum):
+    """How closed segments are compressed."""
+
+    NONE = "none"
+    GZIP = "gzip"
+    LZMA = "lzma"
+
+
+_SUFFIXES = {Compression.NONE: "", Compression.GZIP: ".gz", Compression.LZMA: ".xz"}
+_OPENERS: dict[Compression, Callable[[Path], io.BufferedIOBase]] = {
+    Compression.GZIP: lambda path: gzip.open(path, "wb", compresslevel=6),
+    Compression.LZMA: lambda path: lzma.open(path, "wb", preset=3),
+}
+_COMPRESSED_SUFFIXES = (".gz", ".xz")
+_COPY_CHUNK = 1024 * 1024
+
+# Runs after the multi-process writer's finalizer (-20), which still writes to the file
+_FILE_EXIT_PRIORITY = -30
+
+
+@dataclass(frozen=True)
+class FileSinkConfig:
+    """Where and how ``RotatingFileStream`` writes; rotation limits are off when None."""
+
+    path: str | os.PathLike[str]
+    max_bytes: int | None = 64 * 1024 * 1024  # Rotate once the active file reaches this size
+    rotate_interval_s: float | None = None  # Rotate once the active file is this old
+    compression: Compression | str = Compression.GZIP
+    retention: int | None = 10  # Closed segments kept; the oldest are deleted first
+    buffer_bytes: int = 1024 * 1024
+    flush_interval_s: float = 1.0  # Buffered lines reach the file at least this often
+
+
+def _segment_pattern(active: Path) -> re.Pattern[str]:
+    return re.compile(re.escape(active.name) + r"\.(\d{8}T\d{12}Z)(\.gz|\.xz)?")
+
+
+# ============================================================================
+# Stream
+# ============================================================================
+
+
+class RotatingFileStream:
+    """Binary stream writing complete lines to a file that is rotated and compressed.
+
+    Writes go through a ``buffer_bytes`` buffer; ``flush`` marks the end of a
+    line (``FastLogger`` flushes after every line) and is where rotation
+    happens, so segments always end on a line boundary and are at most one
+    line (or one multi-process batch) above ``max_bytes``. A time based
+    rotation happens at the first line after ``rotate_interval_s`` elapsed, so
+    idle periods leave no empty segments. A thread writes the buffer out every
+    ``flush_interval_s``; rotation and ``close`` flush and fsync the file.
+
+    The closed segment is renamed to ``<path>.<UTC timestamp>`` and handed to a
+    compression thread, which also deletes the oldest segments beyond
+    ``retention``. Segments left uncompressed by a previous run are compressed
+    on start; lines written after ``close`` are appended to the active file
+    unbuffered. ``segment`` counts rotations, so encoders with per-file state
+    (``BinaryLoggerFactory``) can start over in each file.
+    """
+
+    def __init__(self, config: FileSinkConfig):
+        self.config = config
+        self.path = Path(config.path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.segment = 0
+        self._compression = Compression(config.compression)
+        self._pattern = _segment_pattern(self.path)
+        self._max_bytes = config.max_bytes or sys.maxsize
+        self._interval_s = config.rotate_interval_s or float("inf")
+
+        self._lock = threading.Lock()
+        self._open()
+        self._closed = False
+
+        self._segments: queue.SimpleQueue[Path | None] = queue.SimpleQueue()
+        for segment in self._closed_segments():
+            if not segment.name.endswith(_COMPRESSED_SUFFIXES):
+                self._segments.put(segment)
+
+        self._stop = threading.Event()
+        self._compressor = threading.Thread(target=self._compress_loop, name="log-file-compressor", daemon=True)
+        self._compressor.start()
+        self._flusher = threading.Thread(target=self._flush_loop, name="log-file-flusher", daemon=True)
+        self._flusher.start()
+        Finalize(self, self.close, exitpriority=_FILE_EXIT_PRIORITY)
+
+    def write(self, data: bytes) -> int:
+        self._size += len(data)
+        try:
+            return self._file.write(data)
+        except ValueError:
+            if not self._closed:
+                raise
+        # Late lines (e.g. from other atexit hooks, or after shutdown_logging) are appended unbuffered
+        with self._lock, open(self.path, "ab") as file:
+            return file.write(data)
+
+    def flush(self) -> None:
+        if self._size >= self._max_bytes or time.monotonic() >= self._rotate_at:
+            with self._lock:
+                if not self._closed and self._size:
+                    self._rotate()
+
+    def close(self) -> None:
+        """Write and fsync the active file, stop the threads and finish pending compressions."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._sync()
+            self._file.close()
+        self._stop.set()
+        self._flusher.join()
+        self._segments.put(None)
+        self._compressor.join()
+
+    # ------------------------------------------------------------------------
+    # Rotation
+    # ------------------------------------------------------------------------
+
+    def _open(self) -> None:
+        self._file = open(self.path, "ab", buffering=self.config.buffer_bytes)
+        self._size = self._file.tell()
+        self._rotate_at = time.monotonic() + self._interval_s
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _rotate(self) -> None:
+        self._sync()
+        self._file.close()
+        stamp = datetime.now(timezone.utc)
+        target = self._segment_path(stamp)
+        while target.exists():  # Two rotations within one microsecond
+            stamp += timedelta(microseconds=1)
+            target = self._segment_path(stamp)
+        os.replace(self.path, target)
+        self._open()
+        self.segment += 1
+        self._segments.put(target)
+
+    def _segment_path(self, stamp: datetime) -> Path:
+        return self.path.with_name(f"{self.path.name}.{stamp:%Y%m%dT%H%M%S%f}Z")
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.config.flush_interval_s):
+            with self._lock:
+                if not self._closed:
+                    self._file.flush()
+
+    # ------------------------------------------------------------------------
+    # Compression & Retention
+    # ------------------------------------------------------------------------
+
+    def _compress_loop(self) -> None:
+        while (segment := self._segments.get()) is not None:
+            try:
+                if self._compression is not Compression.NONE:
+                    self._compress(segment)
+                self._apply_retention()
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+    def _compress(self, segment: Path) -> None:
+        if not segment.exists():
+            return  # Deleted by retention while queued
+        target = segment.with_name(segment.name + _SUFFIXES[self._compression])
+        partial = target.with_name(target.name + ".tmp")
+        with open(segment, "rb") as source, _OPENERS[self._compression](partial) as sink:
+            shutil.copyfileobj(source, sink, _COPY_CHUNK)
+        os.replace(partial, target)
+        segment.unlink()
+
+    def _closed_segments(self) -> list[Path]:
+        """Closed segments of this file, oldest first."""
+        matches = [match for name in os.listdir(self.path.parent) if (match := self._pattern.fullmatch(name))]
+        return [self.path.parent / match.group(0) for match in sorted(matches, key=lambda match: match.group(1))]
+
+    def _apply_retention(self) -> None:
+        if self.config.retention is None:
+            return
+        segments = self._closed_segments()
+        for segment in segments[: max(0, len(segments) - self.config.retention)]:
+            segment.unlink(missing_ok=True)
@@ -0,0 +1,182 @@
+"""Flight recorder: a memory-mapped ring buffer of recent log events that survives crashes.
+
+Events are appended as length-prefixed compact JSON records to a fixed-size
+file mapped with ``mmap``. The pages belong to the kernel's page cache, so the
+contents survive the process being SIGKILLed or OOM-killed and can be decoded
+afterwards with ``python -m src.log_flight PATH``.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Iterator
+
+from structlog.types import EventDict
+
+# ============================================================================
+# File Layout
+# ============================================================================
+
+# magic, version, capacity, write position, oldest record position (positions grow monotonically)
+_HEADER = struct.Struct("<8sIxxxxQQQ")
+_HEADER_SIZE = 64
+_MAGIC = b"LOGFLT01"
+_VERSION = 1
+_LENGTH = struct.Struct("<I")
+_WRITE_POS_OFFSET = 24
+_OLDEST_POS_OFFSET = 32
+_POSITION = struct.Struct("<Q")
+
+
+class FlightRecorderError(Exception):
+    """Raised when a flight recorder file is missing, corrupt or too small."""
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+
+class FlightRecorder:
+    """Append-only ring buffer of encoded events in a memory-mapped file.
+
+    An existing recording at ``path`` is kept as ``<path>.prev`` so a restart
+    after a crash does not overwrite the evidence.
+    """
+
+    def __init__(self, path: str | os.PathLike[str], capacity: int):
+        if capacity < 1024:
+            raise ValueError(f"capacity must be at least 1024 bytes, got {capacity}")
+
+        self.path = Path(path)
+        self.capacity = capacity
+        self._encode = json.JSONEncoder(separators=(",", ":"), ensure_ascii=False, default=repr).encode
+        self._lock = threading.Lock()
+
+        if self.path.exists() and self.path.stat().st_size >= _HEADER_SIZE:
+            self.path.replace(self.path.with_name(self.path.name + ".prev"))
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w+b") as file:
+            file.truncate(_HEADER_SIZE + capacity)
+            self._mmap = mmap.mmap(file.fileno(), _HEADER_SIZE + capacity)
+        self._mmap[:_HEADER_SIZE] = _HEADER.pack(_MAGIC, _VERSION, capacity, 0, 0).ljust(_HEADER_SIZE, b"\0")
+        self._write_pos = 0
+        self._oldest_pos = 0
+
+    def append(self, event_dict: EventDict) -> None:
+        """Encode and append one event, overwriting the oldest records when full."""
+        payload = self._encode(event_dict).encode()
+        record = _LENGTH.pack(len(payload)) + payload
+        if len(record) > self.capacity:
+            return  # Cannot fit even in an empty ring
+
+        with self._lock:
+            buffer = self._mmap
+            if buffer.closed:
+                return
+            end = self._write_pos + len(record)
+
+            # Retire the records about to be overwritten before touching their bytes
+            oldest = self._oldest_pos
+            while end - oldest > self.capacity:
+                oldest += _LENGTH.size + _LENGTH.unpack(self._read(oldest, _LENGTH.size))[0]
+            if oldest != self._oldest_pos:
+                self._oldest_pos = oldest
+                buffer[_OLDEST_POS_OFFSET : _OLDEST_POS_OFFSET + 8] = _POSITION.pack(oldest)
+
+            self._write(self._write_pos, record)
+            # Publishing the new end last means a crash mid-record leaves it invisible
+            self._write_pos = end
+            buffer[_WRITE_POS_OFFSET : _WRITE_POS_OFFSET + 8] = _POSITION.pack(end)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._mmap.closed:
+                self._mmap.flush()
+                self._mmap.close()
+
+    def _write(self, position: int, data: bytes) -> None:
+        start = position % self.capacity
+        first = min(len(data), self.capacity - start)
+        self._mmap[_HEADER_SIZE + start : _HEADER_SIZE + start + first] = data[:first]
+        if first < len(data):
+            self._mmap[_HEADER_SIZE : _HEADER_SIZE + len(data) - first] = data[first:]
+
+    def _read(self, position: int, size: int) -> bytes:
+        return _read_ring(self._mmap, self.capacity, position, size)
+
+
+def _read_ring(buffer: Any, capacity: int, position: int, size: int) -> bytes:
+    start = position % capacity
+    first = min(size, capacity - start)
+    data = bytes(buffer[_HEADER_SIZE + start : _HEADER_SIZE + start + first])
+    if first < size:
+        data += bytes(buffer[_HEADER_SIZE : _HEADER_SIZE + size - first])
+    return data
+
+
+# ============================================================================
+# Reader
+# ============================================================================
+
+
+def _iter_records(path: str | os.PathLike[str]) -> Iterator[dict[str, Any]]:
+    with open(path, "rb") as file:
+        data = file.read()
+    if len(data) < _HEADER_SIZE:
+        raise FlightRecorderError(f"{path} is too small to be a flight recording")
+
+    magic, version, capacity, write_pos, oldest_pos = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION or len(data) < _HEADER_SIZE + capacity:
+        raise FlightRecorderError(f"{path} is not a flight recording")
+
+    position = oldest_pos
+    while position + _LENGTH.size <= write_pos:
+        (length,) = _LENGTH.unpack(_read_ring(data, capacity, position, _LENGTH.size))
+        if position + _LENGTH.size + length > write_pos:
+            break  # Torn final record
+        payload = _read_ring(data, capacity, position + _LENGTH.size, length)
+        position += _LENGTH.size + length
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            continue
+
+
+def read_flight_records(path: str | os.PathLike[str], last: int | None = None) -> list[dict[str, Any]]:
+    """Decode the recorded events, oldest first, optionally only the ``last`` N."""
+    records = list(_iter_records(path))
+    return records[-last:] if last else records
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the last N recorded events as JSON lines or human-readable lines."""
+    # Imported here: src.logging wires the recorder into the pipeline and imports this module
+    from src.logging import HumanReadableFormatter, _with_iso_timestamp
+
+    parser = argparse.ArgumentParser(description="Decode a log flight recorder file.")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("-n", "--last", type=int, default=100, help="number of most recent records (0 for all)")
+    parser.add_argument("--human", action="store_true", help="render like the human-readable formatter")
+    args = parser.parse_args(argv)
+
+    try:
+        records = read_flight_records(args.path, args.last)
+    except (OSError, FlightRecorderError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+
+    render = HumanReadableFormatter() if args.human else _with_iso_timestamp(lambda _, __, ed: json.dumps(ed))
+    for record in records:
+        print(render(None, record.get("level", "info"), record))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,372 @@
+"""Offline correlation-ID index over JSON log files, for fetching every line of one request.
+
+``python -m src.log_index lookup REQ-ID app.log`` builds or extends the index
+next to each file (``<file>.cidx``) and prints the request's lines, oldest
+first. Only the bytes appended since the last run are read, so repeated
+lookups on a growing file stay fast. Compressed rotated segments are not
+indexed; decompress them first.
+"""
+
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import re
+import struct
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, Sequence
+
+from src.logging import HumanReadableFormatter
+
+# ============================================================================
+# File Layout
+# ============================================================================
+
+# magic, version, log file inode, length of the log prefix hashed to detect a replaced file, prefix hash
+_HEADER = struct.Struct("<8sIxxxxQQ16s")
+_MAGIC = b"LOGCIDX1"
+_VERSION = 1
+# entry count, log offset the run covers up to
+_RUN = struct.Struct("<QQ")
+# correlation ID hash, timestamp (epoch microseconds), line offset; runs are sorted by (hash, offset)
+_ENTRY = struct.Struct("<QqQ")
+_PREFIX_BYTES = 4096
+_MAX_RUNS = 16  # Runs are merged into one beyond this
+_CHUNK = 4 * 1024 * 1024
+
+_CORRELATION_KEY = b'"correlation_id": '
+_CORRELATION_ID = re.compile(rb'"correlation_id": "((?:[^"\\]|\\.)*)"')
+_TIMESTAMP_KEY = b'"timestamp": '
+_TIMESTAMP = re.compile(rb'"timestamp": "([^"]+)"')
+
+
+class LogIndexError(Exception):
+    """Raised when an index file is corrupt or belongs to another format version."""
+
+
+@dataclass(frozen=True)
+class IndexedLine:
+    """A line found through the index."""
+
+    path: Path
+    offset: int
+    timestamp_us: int
+    line: bytes
+
+
+def correlation_hash(correlation_id: str | bytes) -> int:
+    """64-bit key of a correlation ID in the index."""
+    data = correlation_id.encode() if isinstance(correlation_id, str) else correlation_id
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little")
+
+
+# ============================================================================
+# Line Parsing
+# ============================================================================
+
+
+class _TimestampParser:
+    """ISO timestamps to epoch microseconds; the date/time part is parsed once per second."""
+
+    def __init__(self) -> None:
+        self._prefix = b""
+        self._seconds = 0
+
+    def __call__(self, text: bytes) -> int:
+        prefix = text[:19]
+        if prefix != self._prefix:
+            self._seconds = int(datetime.fromisoformat(prefix.decode()).replace(tzinfo=timezone.utc).timestamp())
+            self._prefix = prefix
+        micros = text[20:26] if text[19:20] == b"." else b""
+        return self._seconds * 1_000_000 + (int(micros.ljust(6, b"0")) if micros else 0)
+
+
+def _correlation_id(line: bytes) -> bytes | None:
+    """Raw JSON string of the line's correlation ID.
+
+    The pipeline adds it after the call's own fields, so the last match is
+    the one in ``extra`` even when a field value contains the key too.
+    """
+    start = line.rfind(_CORRELATION_KEY)
+    if start < 0:
+        return None
+    match = _CORRELATION_ID.match(line, start)
+    if match is None:
+        return None
+    raw = match.group(1)
+    return json.loads(b'"' + raw + b'"').encode() if b"\\" in raw else raw
+
+
+def _timestamp_us(line: bytes, parse_timestamp: _TimestampParser) -> int:
+    """The line's timestamp in epoch microseconds, 0 when missing or unreadable.
+
+    The renderer writes it last, so the last match is the event's own even
+    when an ``extra`` field is called ``timestamp`` too.
+    """
+    start = line.rfind(_TIMESTAMP_KEY)
+    match = _TIMESTAMP.match(line, start) if start >= 0 else None
+    if match is None:
+        return 0
+    try:
+        return parse_timestamp(match.group(1))
+    except ValueError:
+        return 0
+
+
+def _scan(path: Path, start: int) -> tuple[list[tuple[int, int, int]], int]:
+    """Entries for the complete lines from ``start`` on, and the offset after the last one."""
+    entries = []
+    parse_timestamp = _TimestampParser()
+    hashes: dict[bytes, int] = {}
+    with open(path, "rb") as file:
+        file.seek(start)
+        offset = start
+        pending = b""
+        while chunk := file.read(_CHUNK):
+            data = pending + chunk
+            lines = data.split(b"\n")
+            pending = lines.pop()  # Incomplete until its newline arrives
+            for line in lines:
+                correlation_id = _correlation_id(line) if _CORRELATION_KEY in line else None
+                if correlation_id is not None:
+                    key = hashes.get(correlation_id)
+                    if key is None:
+                        if len(hashes) > 100_000:
+                            hashes.clear()
+                        key = hashes[correlation_id] = correlation_hash(correlation_id)
+                    entries.append((key, _timestamp_us(line, parse_timestamp), offset))
+                offset += len(line) + 1
+    entries.sort(key=lambda entry: (entry[0], entry[2]))
+    return entries, offset
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+
+class LogIndex:
+    """Correlation-ID index of one JSON lines log file, stored at ``<file>.cidx``.
+
+    The index is a header followed by sorted runs; ``update`` appends a run
+    for the lines added since the previous one (a partly written last line
+    waits for the next update) and merges the runs once there are more than
+    ``_MAX_RUNS``. A log file that was replaced or truncated (rotation) is
+    indexed again from the start. A run cut short by a crash is ignored and
+    rewritten.
+    """
+
+    def __init__(self, log_path: str | os.PathLike[str], index_path: str | os.PathLike[str] | None = None):
+        self.log_path = Path(log_path)
+        self.index_path = Path(index_path) if index_path is not None else Path(f"{self.log_path}.cidx")
+
+    def update(self) -> int:
+        """Index lines appended since the last update; returns how many lines were added."""
+        inode = self.log_path.stat().st_ino
+        runs = self._read_runs(inode)
+        covered = runs[-1].covered if runs else 0
+        if runs is None or covered > self.log_path.stat().st_size:
+            runs, covered = [], 0
+            self._write([], 0, inode)
+
+        entries, end = _scan(self.log_path, covered)
+        if end == covered:
+            return 0
+        if len(runs) >= _MAX_RUNS:
+            merged = [entry for run in runs for entry in self._entries(run)] + entries
+            merged.sort(key=lambda entry: (entry[0], entry[2]))
+            self._write(merged, end, inode)
+        else:
+            with open(self.index_path, "r+b") as index:
+                index.truncate(runs[-1].stop if runs else _HEADER.size)  # Drop a torn run
+                index.seek(0, os.SEEK_END)
+                index.write(_pack_run(entries, end))
+                index.seek(0)
+                index.write(self._header(end, inode))  # Longer prefix to recognize the file by
+        return len(entries)
+
+    def lookup(
+        self, correlation_id: str, since_us: int | None = None, until_us: int | None = None
+    ) -> list[IndexedLine]:
+        """Lines of ``correlation_id`` in file order, optionally within [since, until] (epoch microseconds)."""
+        key = correlation_hash(correlation_id)
+        matches = []
+        with (
+            open(self.index_path, "rb") as index_file,
+            mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ) as index,
+        ):
+            for run in _runs(index):
+                for _, timestamp_us, offset in _search(index, run, key):
+                    if (since_us is None or timestamp_us >= since_us) and (
+                        until_us is None or timestamp_us <= until_us
+                    ):
+                        matches.append((offset, timestamp_us))
+
+        found = []
+        with open(self.log_path, "rb") as log:
+            for offset, timestamp_us in sorted(matches):
+                log.seek(offset)
+                line = log.readline().rstrip(b"\n")
+                if _correlation_id(line) == correlation_id.encode():  # Rule out hash collisions
+                    found.append(IndexedLine(self.log_path, offset, timestamp_us, line))
+        return found
+
+    # ------------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------------
+
+    def _header(self, covered: int, inode: int) -> bytes:
+        prefix_length = min(_PREFIX_BYTES, covered)
+        with open(self.log_path, "rb") as log:
+            prefix_hash = hashlib.blake2b(log.read(prefix_length), digest_size=16).digest()
+        return _HEADER.pack(_MAGIC, _VERSION, inode, prefix_length, prefix_hash)
+
+    def _write(self, entries: list[tuple[int, int, int]], covered: int, inode: int) -> None:
+        """Replace the index with at most one run."""
+        partial = self.index_path.with_name(self.index_path.name + ".tmp")
+        with open(partial, "wb") as index:
+            index.write(self._header(covered, inode))
+            if covered:
+                index.write(_pack_run(entries, covered))
+        os.replace(partial, self.index_path)
+
+    def _read_runs(self, inode: int) -> list["_Run"] | None:
+        """Complete runs of the index; None when there is no usable index for the current log file."""
+        try:
+            data = self.index_path.read_bytes()
+        except FileNotFoundError:
+            return None
+        if len(data) < _HEADER.size:
+            return None
+        magic, version, indexed_inode, prefix_length, prefix_hash = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise LogIndexError(f"{self.index_path} is not a version {_VERSION} correlation index")
+        if indexed_inode != inode or self._header(prefix_length, inode)[-16:] != prefix_hash:
+            return None  # Another file now lives at this path
+        return list(_runs(data))
+
+    def _entries(self, run: "_Run") -> list[tuple[int, int, int]]:
+        with open(self.index_path, "rb") as index:
+            index.seek(run.start)
+            return list(_ENTRY.iter_unpack(index.read(run.stop - run.start)))
+
+
+@dataclass(frozen=True)
+class _Run:
+    """Position of a run's entries in the index file and the log offset it covers up to."""
+
+    start: int
+    count: int
+    covered: int
+
+    @property
+    def stop(self) -> int:
+        return self.start + self.count * _ENTRY.size
+
+
+def _pack_run(entries: list[tuple[int, int, int]], covered: int) -> bytes:
+    return _RUN.pack(len(entries), covered) + b"".join(_ENTRY.pack(*entry) for entry in entries)
+
+
+def _runs(data: bytes | mmap.mmap) -> Iterator[_Run]:
+    pos = _HEADER.size
+    while pos + _RUN.size <= len(data):
+        count, covered = _RUN.unpack_from(data, pos)
+        run = _Run(pos + _RUN.size, count, covered)
+        if run.stop > len(data):
+            return  # Torn by a crash while appending
+        yield run
+        pos = run.stop
+
+
+def _search(index: mmap.mmap, run: _Run, key: int) -> Iterator[tuple[int, int, int]]:
+    """Entries of ``key`` in a run: binary search for the first, then the ones after it."""
+    low, high = 0, run.count
+    while low < high:
+        middle = (low + high) // 2
+        if _ENTRY.unpack_from(index, run.start + middle * _ENTRY.size)[0] < key:
+            low = middle + 1
+        else:
+            high = middle
+    for position in range(run.start + low * _ENTRY.size, run.stop, _ENTRY.size):
+        entry = _ENTRY.unpack_from(index, position)
+        if entry[0] != key:
+            return
+        yield entry
+
+
+# ============================================================================
+# Command Line
+# ============================================================================
+
+
+def _epoch_us(text: str) -> int:
+    moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1_000_000)
+
+
+def lookup_lines(
+    paths: Sequence[str | os.PathLike[str]],
+    correlation_id: str,
+    since: str | None = None,
+    until: str | None = None,
+    update: bool = True,
+) -> list[IndexedLine]:
+    """Lines of ``correlation_id`` across ``paths``, oldest first, updating the indexes first."""
+    since_us = _epoch_us(since) if since else None
+    until_us = _epoch_us(until) if until else None
+    found: list[tuple[int, int, IndexedLine]] = []
+    for order, path in enumerate(paths):
+        index = LogIndex(path)
+        if update:
+            index.update()
+        found.extend((line.timestamp_us, order, line) for line in index.lookup(correlation_id, since_us, until_us))
+    # Lines of one file are already in write order; sorting is stable
+    return [line for *_, line in sorted(found, key=lambda item: item[:2])]
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Build indexes or print the lines of one correlation ID."""
+    parser = argparse.ArgumentParser(description="Index JSON log files by correlation ID.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update = commands.add_parser("update", help="build or extend the index of each file")
+    update.add_argument("paths", nargs="+", type=Path)
+    lookup = commands.add_parser("lookup", help="print every line of one correlation ID, oldest first")
+    lookup.add_argument("correlation_id")
+    lookup.add_argument("paths", nargs="+", type=Path)
+    lookup.add_argument("--since", help="ISO time lower bound (UTC unless an offset is given)")
+    lookup.add_argument("--until", help="ISO time upper bound")
+    lookup.add_argument("--no-update", action="store_true", help="use the indexes as they are")
+    lookup.add_argument("--human", action="store_true", help="render like the human-readable formatter")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "update":
+            for path in args.paths:
+                print(f"{path}: {LogIndex(path).update()} lines indexed")
+            return 0
+
+        lines = lookup_lines(args.paths, args.correlation_id, args.since, args.until, update=not args.no_update)
+        render = HumanReadableFormatter() if args.human else None
+        for found in lines:
+            if render is None:
+                print(found.line.decode())
+            else:
+                event = json.loads(found.line)
+                print(render(None, event.get("level", "info"), event))
+    except BrokenPipeError:
+        return 0
+    except (OSError, ValueError, LogIndexError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Per-logger level thresholds that can change at runtime without a per-call cost."""
+
+import logging
+import threading
+from typing import Any, Iterable, Mapping
+
+import structlog
+from structlog.types import Context, Processor, WrappedLogger
+
+# Levels structlog has prebuilt filtering classes for
+_FILTERING_LEVELS = (logging.NOTSET, logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR, logging.CRITICAL)
+
+# (default level, prefix -> level, logger name -> resolved level), replaced as a whole by updates
+_State = tuple[int, dict[str, int], dict[str, int]]
+
+# ============================================================================
+# Level Specs
+# ============================================================================
+
+
+def level_number(level: int | str) -> int:
+    """Numeric value of a level name (any case) or number supported by the filtering loggers."""
+    number = logging.getLevelNamesMapping().get(level.upper()) if isinstance(level, str) else level
+    if number not in _FILTERING_LEVELS:
+        raise ValueError(f"Unknown log level: {level!r}")
+    return number
+
+
+def parse_level_spec(spec: str) -> tuple[int | None, dict[str, int]]:
+    """Parse ``"INFO,src.services=DEBUG,src.db=WARNING"`` into (default level, prefix -> level).
+
+    Entries are separated by commas or newlines; ``#`` starts a comment and a
+    bare level sets the default.
+    """
+    default = None
+    thresholds = {}
+    for line in spec.splitlines():
+        for entry in line.split("#", 1)[0].split(","):
+            entry = entry.strip()
+            if not entry:
+                continue
+            name, separator, level = entry.rpartition("=")
+            if separator:
+                thresholds[name.strip()] = level_number(level.strip())
+            else:
+                default = level_number(level)
+    return default, thresholds
+
+
+# ============================================================================
+# Thresholds
+# ============================================================================
+
+
+class LevelThresholds:
+    """Level thresholds per logger name prefix, applied through the bound logger classes.
+
+    A threshold for ``src.services`` applies to ``src.services`` and every
+    logger below it (``src.services.billing``), the longest matching prefix
+    winning. Every logger name gets its own bound logger class carrying the
+    log methods of structlog's filtering class for its level, so disabled
+    methods stay plain ``return None`` no-ops. ``update`` rewrites those
+    methods in place: loggers cached on first use, and everything bound from
+    them, pick up the change with no lookup on the call path.
+
+    Methods are enabled down to ``min(threshold, capture_level)``, letting a
+    processor see events below a logger's threshold (see the flight recorder).
+    """
+
+    def __init__(
+        self,
+        default: int | str,
+        thresholds: Mapping[str, int | str] | None = None,
+        *,
+        capture_level: int | str = logging.CRITICAL,
+        sync_stdlib: bool = False,
+    ):
+        self._state: _State = (
+            level_number(default),
+            {name: level_number(level) for name, level in (thresholds or {}).items()},
+            {},
+        )
+        self._capture_level = level_number(capture_level)
+        self._sync_stdlib = sync_stdlib
+        self._classes: dict[str, type[Any]] = {}
+        self._stdlib_names: set[str] = set()
+        self._lock = threading.Lock()
+        self.wrapper_class = self._entry_class()
+        self._apply_stdlib()
+
+    @property
+    def default(self) -> int:
+        return self._state[0]
+
+    @property
+    def thresholds(self) -> dict[str, int]:
+        return dict(self._state[1])
+
+    def resolve(self, name: str) -> int:
+        """Threshold of the longest configured prefix of ``name``, else the default.
+
+        The state is read once, so a concurrent ``update`` can only leave a
+        result in the cache of the state it was computed from.
+        """
+        default, thresholds, resolved = self._state
+        level = resolved.get(name)
+        if level is None:
+            level = default
+            prefix = name
+            while prefix:
+                if prefix in thresholds:
+                    level = thresholds[prefix]
+                    break
+                prefix = prefix.rpartition(".")[0]
+            resolved[name] = level
+        return level
+
+    def update(
+        self,
+        default: int | str | None = None,
+        thresholds: Mapping[str, int | str | None] | None = None,
+        *,
+        replace: bool = False,
+    ) -> None:
+        """Change the default and per-prefix thresholds (None removes a prefix) for all loggers."""
+        with self._lock:
+            new_default, old_thresholds, _ = self._state
+            new_thresholds = {} if replace else dict(old_thresholds)
+            for name, level in (thresholds or {}).items():
+                if level is None:
+                    new_thresholds.pop(name, None)
+                else:
+                    new_thresholds[name] = level_number(level)
+            if default is not None:
+                new_default = level_number(default)
+            self._state = (new_default, new_thresholds, {})
+            for name, cls in list(self._classes.items()):
+                self._set_methods(cls, name)
+            self._apply_stdlib()
+
+    # ------------------------------------------------------------------------
+    # Bound Logger Classes
+    # ------------------------------------------------------------------------
+
+    def _class_for(self, name: str) -> type[Any]:
+        cls = self._classes.get(name)
+        if cls is None:
+            with self._lock:
+                cls = self._classes.get(name)
+                if cls is None:
+                    cls = type(f"BoundLogger[{name}]", (structlog.BoundLoggerBase,), {"__module__": __name__})
+                    self._set_methods(cls, name)
+                    self._classes[name] = cls
+        return cls
+
+    def _set_methods(self, cls: type[Any], name: str) -> None:
+        """Give ``cls`` the log methods of structlog's filtering logger for ``name``'s level."""
+        level = min(self.resolve(name), self._capture_level)
+        for attribute, value in vars(structlog.make_filtering_bound_logger(level)).items():
+            if not attribute.startswith("__"):
+                setattr(cls, attribute, value)
+
+    def _entry_class(self) -> type[Any]:
+        """Wrapper class for ``structlog.configure``: instantiating it yields a logger of the name's class."""
+        class_for = self._class_for
+
+        class LevelRoutingBoundLogger(structlog.BoundLoggerBase):
+            def __new__(cls, logger: WrappedLogger, processors: Iterable[Processor], context: Context) -> Any:
+                return class_for(getattr(logger, "name", "") or "")(logger, processors, context)
+
+        return LevelRoutingBoundLogger
+
+    def release_stdlib(self) -> None:
+        """Hand the prefix stdlib loggers back to the root level, before replacing these thresholds."""
+        with self._lock:
+            for name in self._stdlib_names:
+                logging.getLogger(name).setLevel(logging.NOTSET)
+            self._stdlib_names = set()
+
+    def _apply_stdlib(self) -> None:
+        """Mirror the thresholds onto stdlib loggers so they pass the events the wrappers let through."""
+        if not self._sync_stdlib:
+            return
+        default, thresholds, _ = self._state
+        for name in self._stdlib_names - thresholds.keys():
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        for name, level in thresholds.items():
+            logging.getLogger(name).setLevel(level)
+        logging.getLogger().setLevel(default)
+        self._stdlib_names = set(thresholds)
@@ -0,0 +1,268 @@
+"""Counters and histograms updated from matching log events, reported as periodic summary events."""
+
+import threading
+import time
+import weakref
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Any, Mapping
+
+import structlog
+from structlog.types import EventDict, WrappedLogger
+
+from src.log_values import UnboundedDict
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+DEFAULT_BUCKETS: tuple[float, ...] = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10_000)
+
+
+@dataclass(frozen=True)
+class MetricRule:
+    """Events counted by one metric; every condition that is set must match."""
+
+    name: str
+    message: str | None = None  # Exact event message
+    logger: str | None = None  # Logger name or dotted prefix
+    fields: Mapping[str, Any] = field(default_factory=dict)  # Required values of call fields
+    value_field: str | None = None  # Histogram of this numeric field; a counter when None
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS  # Inclusive upper bounds, ascending
+    suppress: bool = False  # Drop the log line once it is counted
+
+
+@dataclass(frozen=True)
+class MetricsConfig:
+    """Rules applied by ``MetricsAggregator`` and how often it reports."""
+
+    rules: tuple[MetricRule, ...] = ()
+    report_interval_s: float = 60.0
+    report_logger: str = __name__
+
+
+_MISSING = object()
+
+# Per-thread counts (counters and histogram buckets) and histogram sums
+_Shard = tuple["array[int]", "array[float]"]
+
+
+@dataclass(frozen=True)
+class _CompiledRule:
+    """A rule with its position in the per-thread arrays."""
+
+    index: int  # Slot in the sums array
+    offset: int  # First slot in the counts array
+    logger: str | None
+    logger_prefix: str
+    fields: tuple[tuple[str, Any], ...]
+    value_field: str | None
+    buckets: tuple[float, ...]
+    suppress: bool
+
+
+# ============================================================================
+# Aggregator
+# ============================================================================
+
+
+class MetricsAggregator:
+    """structlog processor turning matching events into counters and fixed-bucket histograms.
+
+    Every thread updates its own ``array`` of counts (one slot per counter, one
+    per histogram bucket) and of histogram sums, so recording takes no lock;
+    ``snapshot`` adds the arrays up. The counts of exited threads are folded
+    into a shared total. Only events that pass the level threshold reach the
+    aggregator, and it runs before sampling, so sampled out events are still
+    counted. Rules match the message and the fields passed to the call, not
+    bound context.
+
+    Every ``report_interval_s`` the changes since the previous report are
+    logged as one ``Metrics summary`` event through the normal pipeline.
+    """
+
+    def __init__(self, config: MetricsConfig):
+        self.config = config
+        self._rules: list[_CompiledRule] = []
+        self._by_message: dict[str, list[_CompiledRule]] = {}
+        self._wildcard: list[_CompiledRule] = []
+
+        offset = 0
+        for index, rule in enumerate(config.rules):
+            if rule.value_field is not None and list(rule.buckets) != sorted(set(rule.buckets)):
+                raise ValueError(f"buckets of metric {rule.name!r} must be ascending and distinct")
+            compiled = _CompiledRule(
+                index,
+                offset,
+                rule.logger,
+                f"{rule.logger}.",
+                tuple(rule.fields.items()),
+                rule.value_field,
+                rule.buckets,
+                rule.suppress,
+            )
+            self._rules.append(compiled)
+            offset += 1 if rule.value_field is None else len(rule.buckets) + 1
+            if rule.message is None:
+                self._wildcard.append(compiled)
+        for message in {rule.message for rule in config.rules if rule.message is not None}:
+            self._by_message[message] = [
+                compiled for compiled, rule in zip(self._rules, config.rules) if rule.message in (message, None)
+            ]
+
+        self._slots = offset
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._shards: list[_Shard] = []
+        self._retired = self._new_shard()
+        self._reported = self._new_shard()
+        self._reported_at = time.monotonic()
+
+        self._stop = threading.Event()
+        self._reporter: threading.Thread | None = None
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the periodic summary reporter."""
+        if self._reporter is None and self.config.report_interval_s > 0:
+            self._reporter = threading.Thread(target=self._report_loop, name="log-metrics", daemon=True)
+            self._reporter.start()
+
+    def close(self) -> None:
+        """Stop the reporter and report what changed since the last summary."""
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+        self.report()
+
+    # ------------------------------------------------------------------------
+    # Processor
+    # ------------------------------------------------------------------------
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        try:
+            rules = self._by_message.get(event_dict.get("event"), self._wildcard)  # type: ignore[arg-type]
+        except TypeError:  # Unhashable message
+            rules = self._wildcard
+        if not rules:
+            return event_dict
+
+        local = self._local
+        if getattr(local, "emitting", False):
+            return event_dict  # Our own summaries
+        shard = getattr(local, "shard", None)
+        if shard is None:
+            shard = self._register_shard()
+        counts, sums = shard
+
+        suppress = False
+        for rule in rules:
+            if rule.logger is not None:
+                name = getattr(logger, "name", "") or ""
+                if name != rule.logger and not name.startswith(rule.logger_prefix):
+                    continue
+            if rule.fields and any(event_dict.get(key, _MISSING) != value for key, value in rule.fields):
+                continue
+            if rule.value_field is None:
+                counts[rule.offset] += 1
+            else:
+                value = event_dict.get(rule.value_field)
+                if not isinstance(value, (int, float)) or isinstance(value, bool):
+                    continue
+                counts[rule.offset + bisect_left(rule.buckets, value)] += 1
+                sums[rule.index] += value
+            suppress = suppress or rule.suppress
+
+        if suppress:
+            raise structlog.DropEvent
+        return event_dict
+
+    def _new_shard(self) -> _Shard:
+        return array("q", bytes(8 * self._slots)), array("d", bytes(8 * len(self._rules)))
+
+    def _register_shard(self) -> _Shard:
+        shard = self._local.shard = self._new_shard()
+        with self._lock:
+            self._shards.append(shard)
+        weakref.finalize(threading.current_thread(), self._retire, shard)
+        return shard
+
+    def _retire(self, shard: _Shard) -> None:
+        """Fold the counts of an exited thread into the shared total."""
+        with self._lock:
+            self._shards.remove(shard)
+            _add(self._retired, shard)
+
+    # ------------------------------------------------------------------------
+    # Snapshots & Reporting
+    # ------------------------------------------------------------------------
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Cumulative value of every metric since the aggregator started."""
+        return self._describe(self._totals())
+
+    def report(self) -> None:
+        """Log the changes since the previous report, unless nothing was counted."""
+        with self._lock:
+            totals = self._totals_locked()
+            previous, self._reported = self._reported, totals
+            now = time.monotonic()
+            interval_s, self._reported_at = now - self._reported_at, now
+
+        delta = (
+            array("q", (now - then for now, then in zip(totals[0], previous[0]))),
+            array("d", (now - then for now, then in zip(totals[1], previous[1]))),
+        )
+        if not any(delta[0]):
+            return
+        self._local.emitting = True
+        try:
+            structlog.get_logger(self.config.report_logger).info(
+                "Metrics summary", interval_s=round(interval_s, 3), metrics=UnboundedDict(self._describe(delta))
+            )
+        finally:
+            self._local.emitting = False
+
+    def _report_loop(self) -> None:
+        while not self._stop.wait(self.config.report_interval_s):
+            self.report()
+
+    def _totals(self) -> _Shard:
+        with self._lock:
+            return self._totals_locked()
+
+    def _totals_locked(self) -> _Shard:
+        totals = (array("q", self._retired[0]), array("d", self._retired[1]))
+        for shard in self._shards:
+            _add(totals, shard)
+        return totals
+
+    def _describe(self, totals: _Shard) -> dict[str, dict[str, Any]]:
+        counts, sums = totals
+        metrics: dict[str, dict[str, Any]] = {}
+        for rule, compiled in zip(self.config.rules, self._rules):
+            if compiled.value_field is None:
+                metrics[rule.name] = {"type": "counter", "count": counts[compiled.offset]}
+                continue
+            buckets = counts[compiled.offset : compiled.offset + len(compiled.buckets) + 1]
+            labels = [f"{bound:g}" for bound in compiled.buckets] + ["+Inf"]
+            metrics[rule.name] = {
+                "type": "histogram",
+                "count": sum(buckets),
+                "sum": sums[compiled.index],
+                "buckets": dict(zip(labels, buckets)),
+            }
+        return metrics
+
+
+def _add(total: _Shard, shard: _Shard) -> None:
+    counts, sums = total
+    for i, count in enumerate(shard[0]):
+        counts[i] += count
+    for i, value in enumerate(shard[1]):
+        sums[i] += value
@@ -0,0 +1,217 @@
+"""Multi-process logging: every process renders its own lines and one writer thread writes them."""
+
+import multiprocessing
+import os
+import threading
+from dataclasses import dataclass, field
+from multiprocessing.util import Finalize
+from typing import Any, BinaryIO, Mapping
+
+from src.log_exceptions import DEFAULT_EXCEPTION_CONFIG, ExceptionConfig
+from src.log_tail import TailBufferConfig
+from src.log_values import DEFAULT_VALUE_LIMITS, ValueLimits
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+# Named semaphores can be handed to children whatever their start method;
+# locks from a "fork" context cannot reach spawned or forkserver children
+_CHANNEL_CONTEXT = multiprocessing.get_context("spawn")
+
+# Finalizers with a negative priority run after multiprocessing joined the
+# child processes, so the writer outlives the workers still sending lines
+_STREAM_EXIT_PRIORITY = -10
+_WRITER_EXIT_PRIORITY = -20
+
+
+@dataclass(frozen=True)
+class WorkerLogConfig:
+    """What a worker process needs to log through the parent's writer; picklable."""
+
+    channel: Any
+    testing: bool
+    batch_bytes: int
+    flush_interval_s: float
+    default_level: int
+    levels: Mapping[str, int] = field(default_factory=dict)
+    context: Mapping[str, Any] = field(default_factory=dict)
+    human_template: str | None = None  # None: the default human-readable template
+    color: bool = False
+    value_limits: ValueLimits | None = DEFAULT_VALUE_LIMITS
+    tail_buffer: TailBufferConfig | None = None
+    exceptions: ExceptionConfig | None = DEFAULT_EXCEPTION_CONFIG
+
+
+# ============================================================================
+# Sending Side
+# ============================================================================
+
+
+class ChannelStream:
+    """Binary stream batching complete lines and sending them to a ``LogWriter``.
+
+    ``FastLogger`` flushes after every line; here ``flush`` marks the line
+    complete and only sends once the batch reaches ``batch_bytes``. A background
+    thread sends completed lines every ``flush_interval_s`` and ``close`` (also
+    run at process exit) sends the rest. A partly written line is never sent.
+    A process forked from one using the stream starts with an empty batch of
+    its own instead of resending the parent's.
+    """
+
+    def __init__(self, channel: Any, batch_bytes: int, flush_interval_s: float):
+        self._channel = channel
+        self._batch_bytes = batch_bytes
+        self._flush_interval_s = flush_interval_s
+        self._line: list[bytes] = []
+        self._parts: list[bytes] = []
+        self._pid = 0
+        self._start()
+
+    def write(self, data: bytes) -> int:
+        if self._pid != os.getpid():
+            self._start()
+        self._line.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        line = b"".join(self._line)
+        self._line = []
+        with self._lock:
+            self._parts.append(line)
+            self._size += len(line)
+            full = self._size >= self._batch_bytes
+        if full:
+            self.send()
+
+    def send(self) -> None:
+        """Send the pending lines now."""
+        with self._lock:
+            if self._parts:
+                # Put under the lock so concurrent senders cannot reorder batches
+                self._channel.put(b"".join(self._parts))
+                self._parts = []
+                self._size = 0
+
+    def close(self) -> None:
+        self._stop.set()
+        if self._pid == os.getpid():
+            if self._line:
+                self.flush()
+            self.send()
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._line = []
+        self._parts = []
+        self._size = 0
+        self._stop = threading.Event()
+        threading.Thread(target=self._send_loop, name="log-channel", daemon=True).start()
+        Finalize(self, self.close, exitpriority=_STREAM_EXIT_PRIORITY)
+
+    def _send_loop(self) -> None:
+        stop = self._stop
+        while not stop.wait(self._flush_interval_s):
+            self.send()
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+
+class LogWriter:
+    """Writer thread in the parent process that receives batches from every process.
+
+    Batches arrive whole over a ``multiprocessing.SimpleQueue``; whatever is
+    waiting is joined and written with one ``write`` call, so lines from
+    different processes are never torn or interleaved. The parent's own lines
+    are written directly under the same lock (see ``local_stream``).
+    """
+
+    def __init__(self, stream: BinaryIO, batch_bytes: int, flush_interval_s: float):
+        self.stream = stream
+        self.batch_bytes = batch_bytes
+        self.flush_interval_s = flush_interval_s
+        self.channel = _CHANNEL_CONTEXT.SimpleQueue()
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-process-writer", daemon=True)
+        self._thread.start()
+        Finalize(self, self.close, exitpriority=_WRITER_EXIT_PRIORITY)
+
+    def local_stream(self) -> "LocalStream":
+        """Stream for loggers in this process (and in children forked from it)."""
+        return LocalStream(self)
+
+    def write(self, data: bytes) -> None:
+        with self._lock:
+            self.stream.write(data)
+            self.stream.flush()
+
+    def close(self, timeout: float | None = None) -> None:
+        """Write everything already sent, then stop. Close the senders first."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._pid != os.getpid():
+            return  # A forked copy; stopping it would stop the parent's writer
+        self.channel.put(None)
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        get = self.channel.get
+        empty = self.channel.empty
+
+        running = True
+        while running:
+            batches = [get()]
+            while not empty():
+                batches.append(get())
+            if None in batches:
+                running = False
+                batches = batches[: batches.index(None)]
+            self.write(b"".join(batches))
+
+
+class LocalStream:
+    """Line-buffered stream of the writer's own process, written under the writer's lock.
+
+    ``FastLogger`` writes the line and its newline, then flushes; the line goes
+    out whole on ``flush``. A child forked without ``init_worker_logging``
+    inherits this stream and sends its lines over the channel instead.
+    """
+
+    def __init__(self, writer: LogWriter):
+        self._writer = writer
+        self._pid = os.getpid()
+        self._parts: list[bytes] = []
+        self._forked: ChannelStream | None = None
+
+    def write(self, data: bytes) -> int:
+        if self._pid != os.getpid():
+            return self._child_stream().write(data)
+        self._parts.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if self._pid != os.getpid():
+            self._child_stream().flush()
+        elif self._parts:
+            data = b"".join(self._parts)
+            self._parts = []
+            self._writer.write(data)
+
+    def close(self) -> None:
+        if self._pid == os.getpid():
+            self.flush()
+        elif self._forked is not None:
+            self._forked.close()
+
+    def _child_stream(self) -> ChannelStream:
+        if self._forked is None:
+            writer = self._writer
+            self._forked = ChannelStream(writer.channel, writer.batch_bytes, writer.flush_interval_s)
+        return self._forked
@@ -0,0 +1,463 @@
+"""Network sink: batched lines over a persistent TCP or Unix socket, with reconnects and a bounded disk spill."""
+
+import os
+import random
+import select
+import socket
+import struct
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass
+from enum import Enum
+from multiprocessing.util import Finalize
+from pathlib import Path
+from typing import Any, BinaryIO
+
+from src.log_queue import OverflowPolicy
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+class Framing(str, Enum):
+    """How lines are delimited on the wire."""
+
+    NDJSON = "ndjson"  # Each line ends with a newline, as written
+    LENGTH_PREFIXED = "length_prefixed"  # Each line, without its newline, follows its 4-byte big-endian length
+
+
+_LENGTH = struct.Struct(">I")
+
+# Spilled batches go to segments of at most this size, so the oldest can be dropped or sent whole
+_SPILL_SEGMENT_BYTES = 4 * 1024 * 1024
+_SPILL_GLOB = "spill-*.log"
+
+# Runs with the file sink, after the multi-process writer's finalizer (-20), which still writes here
+_NETWORK_EXIT_PRIORITY = -30
+
+
+@dataclass(frozen=True)
+class NetworkSinkConfig:
+    """Where and how ``NetworkStream`` sends; spilling to disk is off when ``spill_dir`` is None."""
+
+    address: str  # "tcp://host:port", "unix:///path/to/socket" or a socket path
+    framing: Framing | str = Framing.NDJSON
+    batch_bytes: int = 256 * 1024  # Send once this much is waiting...
+    flush_interval_s: float = 0.2  # ...or once the oldest waiting line is this old
+    max_pending_bytes: int = 8 * 1024 * 1024  # Held in memory while sending or while the collector is down
+    overflow: OverflowPolicy | str = OverflowPolicy.DROP_OLDEST  # What a caller does at max_pending_bytes
+    spill_dir: str | os.PathLike[str] | None = None  # Batches the collector cannot take wait here, sent oldest first
+    max_spill_bytes: int = 256 * 1024 * 1024  # The oldest spilled segments are deleted beyond this
+    connect_timeout_s: float = 2.0
+    send_timeout_s: float = 10.0  # A send stalled this long counts as a lost connection
+    backoff_initial_s: float = 0.1  # Reconnect delays double from this, with jitter...
+    backoff_max_s: float = 30.0  # ...up to this
+
+
+def _parse_address(address: str) -> tuple[socket.AddressFamily, Any]:
+    """Socket family and ``connect`` argument of a ``tcp://host:port``, ``unix://path`` or bare path address."""
+    if address.startswith("tcp://"):
+        host, sep, port = address.removeprefix("tcp://").rpartition(":")
+        if not sep or not port.isdigit():
+            raise ValueError(f"expected tcp://host:port, got {address!r}")
+        return socket.AF_INET, (host.strip("[]") or "127.0.0.1", int(port))
+    if "://" in address and not address.startswith("unix://"):
+        raise ValueError(f"unsupported address scheme: {address!r}")
+    return socket.AF_UNIX, address.removeprefix("unix://")
+
+
+# ============================================================================
+# Framing
+# ============================================================================
+
+
+def _frame(data: bytes, framing: Framing) -> tuple[bytes, int]:
+    """Wire bytes of one or more complete lines and the number of lines."""
+    if framing is Framing.NDJSON:
+        return data, data.count(b"\n") or 1
+    lines = data.removesuffix(b"\n").split(b"\n")
+    return b"".join(_LENGTH.pack(len(line)) + line for line in lines), len(lines)
+
+
+def _complete_frames(data: bytes, framing: Framing) -> tuple[int, int]:
+    """Length of the prefix of ``data`` made of whole frames, and how many frames it holds."""
+    if framing is Framing.NDJSON:
+        end = data.rfind(b"\n") + 1
+        return end, data.count(b"\n", 0, end)
+    offset = count = 0
+    while offset + _LENGTH.size <= len(data):
+        (length,) = _LENGTH.unpack_from(data, offset)
+        if offset + _LENGTH.size + length > len(data):
+            break
+        offset += _LENGTH.size + length
+        count += 1
+    return offset, count
+
+
+# ============================================================================
+# Disk Spill
+# ============================================================================
+
+
+class _SpillBuffer:
+    """Bounded directory of framed batches that could not be sent, as numbered append-only segments.
+
+    Only the sender thread uses it. Segments are written unbuffered, so a batch
+    survives a crash of the process; one torn by a crash mid-write is cut back
+    to its last whole frame on start, and the segments left by a previous run
+    are sent first.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, framing: Framing):
+        directory.mkdir(parents=True, exist_ok=True)
+        self.directory = directory
+        self.dropped = 0
+        self._max_bytes = max_bytes
+        self._framing = framing
+        self._segment_bytes = max(1, min(_SPILL_SEGMENT_BYTES, max_bytes // 4))
+        self._tail: BinaryIO | None = None
+
+        paths = sorted(directory.glob(_SPILL_GLOB))
+        self._next = int(paths[-1].stem.removeprefix("spill-")) + 1 if paths else 0
+        if paths:
+            data = paths[-1].read_bytes()
+            complete, _ = _complete_frames(data, framing)
+            if complete < len(data):
+                os.truncate(paths[-1], complete)
+        # [path, size] oldest first; the last one is appended to while ``_tail`` is open
+        self._segments: deque[list[Any]] = deque([path, path.stat().st_size] for path in paths)
+        self.bytes: int = sum(size for _, size in self._segments)
+
+    def __bool__(self) -> bool:
+        return self.bytes > 0
+
+    def append(self, data: bytes) -> None:
+        if self._tail is None or self._segments[-1][1] >= self._segment_bytes:
+            self._open_tail()
+        assert self._tail is not None
+        self._tail.write(data)
+        self._segments[-1][1] += len(data)
+        self.bytes += len(data)
+        while self.bytes > self._max_bytes and len(self._segments) > 1:
+            path, _ = self._segments[0]
+            self.dropped += _complete_frames(path.read_bytes(), self._framing)[1]
+            self.remove_oldest()
+
+    def oldest(self) -> bytes:
+        """Content of the oldest segment, closing it first if it is still appended to."""
+        if len(self._segments) == 1:
+            self.close()
+        path: Path = self._segments[0][0]
+        return path.read_bytes()
+
+    def remove_oldest(self) -> None:
+        path, size = self._segments.popleft()
+        self.bytes -= size
+        path.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        if self._tail is not None:
+            self._tail.close()
+            self._tail = None
+
+    def _open_tail(self) -> None:
+        self.close()
+        path = self.directory / f"spill-{self._next:012d}.log"
+        self._next += 1
+        self._tail = open(path, "ab", buffering=0)
+        self._segments.append([path, 0])
+
+
+# ============================================================================
+# Stream
+# ============================================================================
+
+
+class NetworkStream:
+    """Binary stream sending complete lines to a collector in batches over one persistent connection.
+
+    ``flush`` marks the end of a line (``FastLogger`` flushes after every line)
+    and queues it in memory; a sender thread sends what is waiting once it
+    reaches ``batch_bytes`` or its oldest line is ``flush_interval_s`` old, so
+    callers never wait on the network. Beyond ``max_pending_bytes`` the
+    ``overflow`` policy applies: ``block`` makes callers wait for the sender,
+    the drop policies count the discarded lines in ``dropped``.
+
+    The connection is opened lazily and reused. Before each send it is checked
+    for a close by the collector, so a collector that shuts down in an orderly
+    way loses nothing. A failed connect or send closes the connection and
+    retries after a delay doubling from ``backoff_initial_s`` to
+    ``backoff_max_s``, with jitter so restarted collectors are not hit by every
+    client at once. The delay only starts over once two sends in a row went
+    through one connection, so a collector (or load balancer) that accepts
+    connections and then drops them is retried at the backed-off pace. Meanwhile batches go to ``spill_dir`` (bounded by
+    ``max_spill_bytes``, oldest segments deleted first) or, without one, stay
+    in memory. Once reconnected, the spill is sent before newer batches, so
+    lines arrive in order. A batch cut off mid-send is sent again in full, so
+    a collector may see its first lines twice; lines a collector accepted but
+    lost when it crashed cannot be detected without acknowledgements.
+
+    ``close`` (also run at exit) sends what is left, or spills it when the
+    collector is down. A process forked from one using the stream opens its
+    own connection and does not spill (the directory is the parent's).
+    """
+
+    def __init__(self, config: NetworkSinkConfig):
+        if config.batch_bytes < 1 or config.max_pending_bytes < config.batch_bytes:
+            raise ValueError(f"need 0 < batch_bytes <= max_pending_bytes, got {config}")
+        if config.spill_dir is not None and config.max_spill_bytes < 4 * config.batch_bytes:
+            raise ValueError(f"max_spill_bytes must hold at least four batches, got {config}")
+
+        self.config = config
+        self.address = config.address
+        self._family, self._target = _parse_address(config.address)
+        self._framing = Framing(config.framing)
+        self._overflow = OverflowPolicy(config.overflow)
+        self._spill = (
+            _SpillBuffer(Path(config.spill_dir), config.max_spill_bytes, self._framing)
+            if config.spill_dir is not None
+            else None
+        )
+        self._start()
+        Finalize(self, self.close, exitpriority=_NETWORK_EXIT_PRIORITY)
+
+    def _start(self) -> None:
+        self._pid = os.getpid()
+        self._lock = threading.Lock()
+        self._wake = threading.Condition(self._lock)
+        self._space = threading.Condition(self._lock)
+        self._line: list[bytes] = []
+        self._pending: deque[tuple[bytes, int]] = deque()  # (frame, lines)
+        self._pending_bytes = 0
+        self._deadline = 0.0
+        self._closed = False
+        self._sock: socket.socket | None = None
+        self._failures = 0  # Consecutive failed connects and sends
+        self._confirmed = False  # Whether a send already went through the current connection
+        self._retry_at = 0.0
+        self._forced = False  # The one connect attempt ``close`` makes regardless of the backoff
+        self._connects = 0
+        self._sent_bytes = 0
+        self._dropped = 0
+        self._thread = threading.Thread(target=self._run, name="log-network-sender", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        """Lines discarded by the overflow policy, deleted from a full spill or undeliverable at close."""
+        return self._dropped + (self._spill.dropped if self._spill is not None else 0)
+
+    def write(self, data: bytes) -> int:
+        if self._pid != os.getpid():
+            if self._sock is not None:
+                self._sock.close()  # This process's copy of the parent's connection
+            self._spill = None
+            self._start()
+        self._line.append(data)
+        return len(data)
+
+    def flush(self) -> None:
+        if not self._line:
+            return
+        frame, lines = _frame(b"".join(self._line), self._framing)
+        self._line = []
+        limit = self.config.max_pending_bytes
+        with self._lock:
+            if self._pending_bytes + len(frame) > limit and self._pending:
+                if self._overflow is OverflowPolicy.BLOCK:
+                    while self._pending_bytes + len(frame) > limit and self._pending and not self._closed:
+                        self._space.wait()
+                elif self._overflow is OverflowPolicy.DROP_NEWEST:
+                    self._dropped += lines
+                    return
+                else:
+                    while self._pending_bytes + len(frame) > limit and self._pending:
+                        old, old_lines = self._pending.popleft()
+                        self._pending_bytes -= len(old)
+                        self._dropped += old_lines
+            if self._closed:
+                self._dropped += lines
+                return
+            self._pending.append((frame, lines))
+            self._pending_bytes += len(frame)
+            if len(self._pending) == 1:
+                self._deadline = time.monotonic() + self.config.flush_interval_s
+                self._wake.notify()
+            elif self._pending_bytes >= self.config.batch_bytes:
+                self._wake.notify()
+
+    def close(self) -> None:
+        """Send the pending lines (or spill them if the collector is down), then stop the sender."""
+        if self._pid != os.getpid():
+            return  # A forked copy that never wrote; the sender thread is the parent's
+        self.flush()
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._wake.notify()
+            self._space.notify_all()
+        self._thread.join()
+
+    def stats(self) -> dict[str, Any]:
+        """Connection state and byte and line counters since the stream was created."""
+        with self._lock:
+            return {
+                "connected": self._sock is not None,
+                "connects": self._connects,
+                "sent_bytes": self._sent_bytes,
+                "pending_bytes": self._pending_bytes,
+                "spilled_bytes": self._spill.bytes if self._spill is not None else 0,
+                "dropped": self.dropped,
+            }
+
+    # ------------------------------------------------------------------------
+    # Sender Thread
+    # ------------------------------------------------------------------------
+
+    def _run(self) -> None:
+        closing = False
+        while not (closing and not self._pending):  # Nothing is added to ``_pending`` once closed
+            try:
+                with self._lock:
+                    batch, lines, closing = self._next_batch()
+                if batch:
+                    self._deliver(batch, lines, closing)
+                if self._spill and (self._sock is not None or closing or time.monotonic() >= self._retry_at):
+                    self._drain_spill(force=closing)
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+        if self._spill is not None:
+            self._spill.close()
+        self._disconnect()
+
+    def _next_batch(self) -> tuple[bytes, int, bool]:
+        """Wait under the lock for a batch (or a spill to drain) and take up to ``batch_bytes`` of it."""
+        while not self._closed:
+            now = time.monotonic()
+            can_send = self._sock is not None or self._spill is not None or now >= self._retry_at
+            if self._pending and (self._pending_bytes >= self.config.batch_bytes or now >= self._deadline):
+                if can_send:
+                    break
+                timeout = self._retry_at - now
+            elif self._pending:
+                timeout = self._deadline - now
+            elif self._spill:
+                if self._sock is not None or now >= self._retry_at:
+                    return b"", 0, False
+                timeout = self._retry_at - now
+            else:
+                timeout = None
+            self._wake.wait(timeout)
+
+        pending = self._pending
+        frames: list[bytes] = []
+        size = lines = 0
+        while pending and (not frames or size + len(pending[0][0]) <= self.config.batch_bytes):
+            frame, count = pending.popleft()
+            frames.append(frame)
+            size += len(frame)
+            lines += count
+        self._pending_bytes -= size
+        self._space.notify_all()
+        return b"".join(frames), lines, self._closed
+
+    def _deliver(self, batch: bytes, lines: int, closing: bool) -> None:
+        if self._spill:
+            self._spill.append(batch)  # Behind the spilled batches, to keep the order
+        elif not self._send(batch, force=closing):
+            if self._spill is not None:
+                self._spill.append(batch)
+            elif closing:
+                self._dropped += lines
+                print(f"log network sink: dropped {lines} lines, {self.address} unreachable", file=sys.stderr)
+            else:
+                with self._lock:  # Held in memory until the collector is back
+                    self._pending.appendleft((batch, lines))
+                    self._pending_bytes += len(batch)
+                    self._deadline = 0.0
+
+    def _drain_spill(self, force: bool) -> None:
+        assert self._spill is not None
+        while self._spill:
+            if not self._send(self._spill.oldest(), force):
+                return
+            self._spill.remove_oldest()
+
+    # ------------------------------------------------------------------------
+    # Connection
+    # ------------------------------------------------------------------------
+
+    def _send(self, data: bytes, force: bool = False) -> bool:
+        sock = self._connection(force)
+        if sock is None:
+            return False
+        try:
+            if _peer_closed(sock):
+                raise ConnectionResetError(f"{self.address} closed the connection")
+            sock.sendall(data)
+        except OSError:
+            self._disconnect()
+            self._back_off()
+            return False
+        self._sent_bytes += len(data)
+        if self._confirmed:
+            self._failures = 0  # A second send made it: the collector kept the connection
+        self._confirmed = True
+        return True
+
+    def _connection(self, force: bool) -> socket.socket | None:
+        """The open connection, or a new one unless backing off (``force`` skips the wait once)."""
+        if self._sock is not None:
+            return self._sock
+        forced = force and not self._forced
+        if not forced and time.monotonic() < self._retry_at:
+            return None
+        self._forced |= forced
+
+        config = self.config
+        try:
+            if self._family == socket.AF_UNIX:
+                sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                try:
+                    sock.settimeout(config.connect_timeout_s)
+                    sock.connect(self._target)
+                except OSError:
+                    sock.close()
+                    raise
+            else:
+                sock = socket.create_connection(self._target, timeout=config.connect_timeout_s)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            self._back_off()
+            return None
+
+        sock.settimeout(config.send_timeout_s)
+        with self._lock:
+            self._sock = sock
+            self._connects += 1
+        self._confirmed = False
+        return sock
+
+    def _back_off(self) -> None:
+        """Count a failure and wait a jittered, doubling delay before the next connect."""
+        self._failures += 1
+        config = self.config
+        delay = min(config.backoff_initial_s * 2 ** min(self._failures - 1, 32), config.backoff_max_s)
+        self._retry_at = time.monotonic() + delay * random.uniform(0.5, 1.0)
+
+    def _disconnect(self) -> None:
+        if self._sock is not None:
+            with self._lock:
+                sock, self._sock = self._sock, None
+            sock.close()
+
+
+def _peer_closed(sock: socket.socket) -> bool:
+    """Whether the collector closed its end; collectors send nothing, so anything readable is a close or discarded."""
+    readable, _, _ = select.select([sock], [], [], 0)
+    return bool(readable) and not sock.recv(65536)
@@ -0,0 +1,39 @@
+"""pytest plugin providing the ``log_capture`` fixture: processed log events captured in memory per test.
+
+Enable it in a ``conftest.py`` with ``pytest_plugins = ("src.log_pytest",)``
+or with ``pytest -p src.log_pytest``::
+
+    def test__handler__logs_the_status(log_capture):
+        handle(request)
+        (event,) = log_capture.events(level="info", logger="src.api", correlation_id="req-1")
+        assert event["extra"]["status"] == 200
+
+``@pytest.mark.log_capture(**kwargs)`` passes further ``configure_structlog``
+arguments, e.g. ``levels={"src": "DEBUG"}`` or ``value_limits=None``.
+"""
+
+from typing import Iterator
+
+import pytest
+
+from src.log_capture import LogCapture
+from src.logging import clear_context_fields, configure_structlog, shutdown_logging
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    config.addinivalue_line(
+        "markers", "log_capture(**kwargs): configure_structlog arguments for the log_capture fixture"
+    )
+
+
+@pytest.fixture
+def log_capture(request: pytest.FixtureRequest) -> Iterator[LogCapture]:
+    """Capture mode with an empty context for the test; the default configuration is restored afterwards."""
+    marker = request.node.get_closest_marker("log_capture")
+    capture = LogCapture()
+    clear_context_fields()
+    configure_structlog(capture=capture, **(marker.kwargs if marker is not None else {}))
+    yield capture
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
@@ -0,0 +1,216 @@
+"""Queued log emission: rendering and I/O on a background writer thread."""
+
+import atexit
+import logging
+import sys
+import threading
+import traceback
+from collections import deque
+from enum import Enum
+from typing import Any, Callable
+
+from structlog.types import EventDict, Processor, WrappedLogger
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+class OverflowPolicy(str, Enum):
+    """What a caller does when the queue is full."""
+
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DROP_NEWEST = "drop_newest"
+
+
+# (logger name, method name, captured event dict)
+QueuedEvent = tuple[str, str, EventDict]
+
+
+# ============================================================================
+# Background Emitter
+# ============================================================================
+
+
+class QueuedEmitter:
+    """Bounded queue drained by a daemon thread that renders and writes events.
+
+    Callers only append the captured event dict; the writer thread runs the
+    renderer and hands the result to a logger produced by ``logger_factory``.
+    """
+
+    def __init__(
+        self,
+        renderer: Processor,
+        logger_factory: Callable[..., WrappedLogger],
+        maxsize: int,
+        overflow: OverflowPolicy = OverflowPolicy.BLOCK,
+    ):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be positive, got {maxsize}")
+
+        self._renderer = renderer
+        self._logger_factory = logger_factory
+        self._loggers: dict[str, WrappedLogger] = {}
+        self._maxsize = maxsize
+        self._overflow = OverflowPolicy(overflow)
+
+        self._queue: deque[QueuedEvent] = deque()
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+        self._drained = threading.Condition(self._lock)
+        self._in_flight = 0
+        self._dropped = 0
+        self._closed = False
+
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    @property
+    def dropped(self) -> int:
+        """Number of events discarded by a drop overflow policy."""
+        return self._dropped
+
+    def put(self, item: QueuedEvent) -> None:
+        """Enqueue an event, applying the overflow policy when full."""
+        with self._lock:
+            if self._closed:
+                # Late events (e.g. from other atexit hooks) are written inline
+                self._in_flight += 1
+                inline = True
+            else:
+                inline = False
+                while len(self._queue) >= self._maxsize:
+                    if self._overflow is OverflowPolicy.DROP_NEWEST:
+                        self._dropped += 1
+                        return
+                    if self._overflow is OverflowPolicy.DROP_OLDEST:
+                        self._queue.popleft()
+                        self._dropped += 1
+                        break
+                    self._not_full.wait()
+                    if self._closed:
+                        self._in_flight += 1
+                        inline = True
+                        break
+                if not inline:
+                    self._queue.append(item)
+                    self._not_empty.notify()
+
+        if inline:
+            self._emit_batch([item])
+
+    def flush(self, timeout: float | None = None) -> bool:
+        """Wait until every queued event has been written. Returns False on timeout."""
+        with self._lock:
+            return self._drained.wait_for(lambda: not self._queue and not self._in_flight, timeout)
+
+    def close(self, timeout: float | None = None) -> None:
+        """Drain the queue and stop the writer thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._not_empty.notify_all()
+            self._not_full.notify_all()
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                while not self._queue and not self._closed:
+                    self._not_empty.wait()
+                if not self._queue:
+                    return
+                batch = list(self._queue)
+                self._queue.clear()
+                self._in_flight += len(batch)
+                self._not_full.notify_all()
+
+            self._emit_batch(batch)
+
+    def _emit_batch(self, batch: list[QueuedEvent]) -> None:
+        for name, method_name, event_dict in batch:
+            try:
+                logger = self._loggers.get(name)
+                if logger is None:
+                    logger = self._loggers[name] = self._logger_factory(name)
+                emit_rendered(logger, method_name, self._renderer(logger, method_name, event_dict))
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+        with self._lock:
+            self._in_flight -= len(batch)
+            if not self._queue and not self._in_flight:
+                self._drained.notify_all()
+
+
+# ============================================================================
+# structlog Integration
+# ============================================================================
+
+
+def defer_rendering(_: WrappedLogger, __: str, event_dict: EventDict) -> tuple[tuple[EventDict], dict[str, Any]]:
+    """Final caller-side processor: hand the event dict to the wrapped logger unrendered."""
+    return (event_dict,), {}
+
+
+def emit_rendered(logger: WrappedLogger, method_name: str, rendered: Any) -> None:
+    """Hand a renderer's result to the wrapped logger's ``method_name``, as structlog does.
+
+    The level thresholds have already let the event through, so a stdlib logger
+    whose own level would filter it (an event released from a tail buffer)
+    gets the record directly.
+    """
+    # A renderer may return (args, kwargs) for the logger method, as in structlog
+    args, kwargs = rendered if isinstance(rendered, tuple) else ((rendered,), {})
+    if isinstance(logger, logging.Logger):
+        level = logging.getLevelNamesMapping().get(method_name.upper(), logging.INFO)
+        if not logger.isEnabledFor(level):
+            logger.handle(logger.makeRecord(logger.name, level, "(unknown file)", 0, args[0], (), None))
+            return
+    getattr(logger, method_name)(*args, **kwargs)
+
+
+class QueuedLogger:
+    """Wrapped logger that enqueues captured events instead of writing them."""
+
+    __slots__ = ("name", "_emitter")
+
+    def __init__(self, emitter: QueuedEmitter, name: str):
+        self.name = name
+        self._emitter = emitter
+
+    def debug(self, event_dict: EventDict) -> None:
+        self._emitter.put((self.name, "debug", event_dict))
+
+    def info(self, event_dict: EventDict) -> None:
+        self._emitter.put((self.name, "info", event_dict))
+
+    def warning(self, event_dict: EventDict) -> None:
+        self._emitter.put((self.name, "warning", event_dict))
+
+    def error(self, event_dict: EventDict) -> None:
+        self._emitter.put((self.name, "error", event_dict))
+
+    def critical(self, event_dict: EventDict) -> None:
+        self._emitter.put((self.name, "critical", event_dict))
+
+    msg = info
+    warn = warning
+    exception = error
+    fatal = critical
+
+
+class QueuedLoggerFactory:
+    """structlog logger factory producing ``QueuedLogger`` instances."""
+
+    def __init__(self, emitter: QueuedEmitter):
+        self.emitter = emitter
+
+    def __call__(self, *args: Any) -> QueuedLogger:
+        return QueuedLogger(self.emitter, args[0] if args else "")
@@ -0,0 +1,260 @@
+"""Sampling, rate limiting and duplicate suppression applied before events are processed."""
+
+import contextvars
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Mapping
+
+import structlog
+from structlog.types import EventDict, WrappedLogger
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class SamplingConfig:
+    """Limits applied by ``LogSampler``; each one is off unless set."""
+
+    rate_limit_per_s: float | None = None  # Token refill rate per (logger, message)
+    rate_limit_burst: int = 10
+    level_sample_rates: Mapping[str, float] = field(default_factory=dict)  # Level name -> keep probability
+    collapse_duplicates: bool = False
+    budget_lines_per_s: float | None = None  # Total throughput before sampling tightens
+    exempt_level: str = "error"  # Level sampling and the budget never drop at or above this level
+    report_interval_s: float = 10.0
+    max_tracked_keys: int = 10_000
+
+
+_LEVEL_NUMBERS = {
+    "debug": 10,
+    "info": 20,
+    "warn": 30,
+    "warning": 30,
+    "error": 40,
+    "exception": 40,
+    "critical": 50,
+    "fatal": 50,
+}
+_LEVEL_NAMES = {"warn": "warning", "exception": "error", "fatal": "critical"}
+_NS_PER_S = 1_000_000_000
+_SUMMARY_OMITTED = frozenset({"event", "exc_info", "stack_info"})
+
+
+@dataclass
+class _Streak:
+    """An event and the identical events that followed it."""
+
+    logger_name: str
+    method_name: str
+    event_dict: EventDict
+    context: contextvars.Context  # Bound context of the first event, for the summary line
+    repeats: int = 0
+    first_ns: int = 0
+    last_ns: int = 0
+
+
+# ============================================================================
+# Sampler
+# ============================================================================
+
+
+class LogSampler:
+    """structlog processor that drops events before any processing or rendering.
+
+    Decisions, in order: collapse identical consecutive events (same logger,
+    level, message and call-site fields), per-(logger, message) token-bucket
+    rate limits, per-level probabilistic sampling, then adaptive sampling when
+    the offered throughput exceeds the lines/sec budget. Collapsed streaks are
+    emitted as one summary line carrying ``repeat_count`` and ``repeat_span_ms``,
+    logged with the context bound when the streak began; the other drops are
+    counted by reason and reported as a warning every ``report_interval_s``.
+    """
+
+    def __init__(
+        self,
+        config: SamplingConfig,
+        clock: Callable[[], int] = time.monotonic_ns,
+        rng: random.Random | None = None,
+    ):
+        self.config = config
+        self._clock = clock
+        self._random = (rng or random.Random()).random
+        self._exempt_level = _LEVEL_NUMBERS[config.exempt_level.lower()]
+        self._refill_per_ns = (config.rate_limit_per_s or 0) / _NS_PER_S
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._buckets: dict[tuple[str, Any], list[float]] = {}
+        self._streak: _Streak | None = None
+        self._dropped: dict[str, int] = {}
+        self._unreported: dict[str, int] = {}
+
+        self._window_start = clock()
+        self._window_offered = 0
+        self._budget_factor = 1.0
+
+        self._stop = threading.Event()
+        self._reporter: threading.Thread | None = None
+
+    # ------------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the periodic drop reporter."""
+        if self._reporter is None and self.config.report_interval_s > 0:
+            self._reporter = threading.Thread(target=self._report_loop, name="log-sampler", daemon=True)
+            self._reporter.start()
+
+    def close(self) -> None:
+        """Stop the reporter and emit any pending summary and drop report."""
+        self._stop.set()
+        if self._reporter is not None:
+            self._reporter.join()
+            self._reporter = None
+        self.report()
+
+    def stats(self) -> dict[str, int]:
+        """Cumulative dropped event counts by reason, including ``collapsed`` repeats."""
+        with self._lock:
+            return dict(self._dropped)
+
+    # ------------------------------------------------------------------------
+    # Processor
+    # ------------------------------------------------------------------------
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        if getattr(self._local, "emitting", False):
+            return event_dict  # Our own summaries and reports
+
+        logger_name = getattr(logger, "name", "") or ""
+        now = self._clock()
+        summary = None
+
+        with self._lock:
+            if self.config.collapse_duplicates:
+                streak = self._streak
+                if streak is not None and self._is_repeat(streak, logger_name, method_name, event_dict):
+                    streak.repeats += 1
+                    streak.last_ns = now
+                    self._dropped["collapsed"] = self._dropped.get("collapsed", 0) + 1  # Reported by the summary
+                    raise structlog.DropEvent
+                summary = self._end_streak()
+
+            reason = self._drop_reason(logger_name, method_name, event_dict.get("event"), now)
+            if reason is not None:
+                self._count(reason)
+            elif self.config.collapse_duplicates:
+                context = contextvars.copy_context()
+                self._streak = _Streak(logger_name, method_name, dict(event_dict), context, first_ns=now, last_ns=now)
+
+        if summary is not None:
+            self._emit_summary(summary)
+        if reason is not None:
+            raise structlog.DropEvent
+        return event_dict
+
+    def _is_repeat(self, streak: _Streak, logger_name: str, method_name: str, event_dict: EventDict) -> bool:
+        if streak.logger_name != logger_name or streak.method_name != method_name:
+            return False
+        try:
+            return bool(streak.event_dict == event_dict)
+        except Exception:  # e.g. array-valued fields without a boolean ==
+            return False
+
+    def _drop_reason(self, logger_name: str, method_name: str, message: Any, now: int) -> str | None:
+        config = self.config
+
+        if config.rate_limit_per_s is not None:
+            key = (logger_name, message if isinstance(message, str) else repr(message))
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= config.max_tracked_keys:
+                    del self._buckets[next(iter(self._buckets))]
+                bucket = self._buckets[key] = [float(config.rate_limit_burst), now]
+            else:
+                bucket[0] = min(float(config.rate_limit_burst), bucket[0] + (now - bucket[1]) * self._refill_per_ns)
+                bucket[1] = now
+            if bucket[0] < 1:
+                return "rate_limited"
+            bucket[0] -= 1
+
+        level = _LEVEL_NUMBERS.get(method_name, 20)
+
+        if config.budget_lines_per_s is not None:
+            self._window_offered += 1
+            elapsed = now - self._window_start
+            if elapsed >= _NS_PER_S:
+                offered_per_s = self._window_offered * _NS_PER_S / elapsed
+                self._budget_factor = min(1.0, config.budget_lines_per_s / offered_per_s)
+                self._window_start = now
+                self._window_offered = 0
+
+        if level >= self._exempt_level:
+            return None
+
+        keep = config.level_sample_rates.get(_LEVEL_NAMES.get(method_name, method_name))
+        if keep is not None and self._random() >= keep:
+            return "sampled"
+
+        if self._budget_factor < 1.0 and self._random() >= self._budget_factor:
+            return "over_budget"
+
+        return None
+
+    def _count(self, reason: str) -> None:
+        self._dropped[reason] = self._dropped.get(reason, 0) + 1
+        self._unreported[reason] = self._unreported.get(reason, 0) + 1
+
+    # ------------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------------
+
+    def _end_streak(self) -> _Streak | None:
+        """Detach the current streak, returning it if it needs a summary line."""
+        streak, self._streak = self._streak, None
+        return streak if streak is not None and streak.repeats else None
+
+    def report(self) -> None:
+        """Emit the pending duplicate summary and the drops counted since the last report."""
+        with self._lock:
+            streak = self._streak
+            summary = None
+            if streak is not None and streak.repeats:
+                # Keep collapsing an ongoing streak; only its repeats so far are summarized
+                summary = _Streak(**vars(streak))
+                streak.repeats = 0
+                streak.first_ns = streak.last_ns
+            dropped, self._unreported = self._unreported, {}
+
+        if summary is not None:
+            self._emit_summary(summary)
+        if dropped:
+            self._emit(__name__, "warning", "Log events dropped", dropped)
+
+    def _report_loop(self) -> None:
+        while not self._stop.wait(self.config.report_interval_s):
+            self.report()
+
+    def _emit_summary(self, streak: _Streak) -> None:
+        # The first event carried any traceback; by now no exception is being handled
+        fields = {key: value for key, value in streak.event_dict.items() if key not in _SUMMARY_OMITTED}
+        fields["repeat_count"] = streak.repeats
+        fields["repeat_span_ms"] = round((streak.last_ns - streak.first_ns) / 1_000_000, 3)
+        method_name = _LEVEL_NAMES.get(streak.method_name, streak.method_name)
+        # A copy, as the reporter and a logging thread may both summarize the same streak
+        streak.context.copy().run(
+            self._emit, streak.logger_name, method_name, streak.event_dict.get("event", ""), fields
+        )
+
+    def _emit(self, logger_name: str, method_name: str, message: Any, fields: dict[str, Any]) -> None:
+        """Log through the configured pipeline without being sampled again."""
+        self._local.emitting = True
+        try:
+            getattr(structlog.get_logger(logger_name), method_name)(message, **fields)
+        finally:
+            self._local.emitting = False
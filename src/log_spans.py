@@ -0,0 +1,280 @@
+"""Timing spans: nested monotonic-ns durations logged per span or as one tree per root span."""
+
+import functools
+import inspect
+import itertools
+import threading
+import time
+from contextvars import ContextVar, Token
+from enum import Enum
+from typing import Any, Callable, TypeVar
+
+import structlog
+
+from src.log_values import UnboundedDict
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+class SpanMode(str, Enum):
+    """What finished spans produce."""
+
+    OFF = "off"  # Nothing; span() and @traced cost next to nothing
+    EACH = "each"  # One "Span finished" event per span
+    TREE = "tree"  # One "Span tree" event per root span, with its descendants aggregated by name
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+_NS_PER_MS = 1_000_000
+
+
+class _Aggregate:
+    """Finished spans of one name under the same parent."""
+
+    __slots__ = ("count", "total_ns", "max_ns", "errors", "children")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self.errors = 0
+        self.children: dict[str, _Aggregate] = {}
+
+    def describe(self) -> dict[str, Any]:
+        described: dict[str, Any] = {
+            "count": self.count,
+            "total_ms": round(self.total_ns / _NS_PER_MS, 3),
+            "max_ms": round(self.max_ns / _NS_PER_MS, 3),
+        }
+        if self.errors:
+            described["errors"] = self.errors
+        if self.children:
+            described["children"] = {name: child.describe() for name, child in self.children.items()}
+        return described
+
+
+class _SpanNode:
+    """One running or finished span."""
+
+    __slots__ = ("name", "fields", "parent", "span_id", "start_ns", "duration_ns", "error", "children", "finished")
+
+    def __init__(self, name: str, fields: dict[str, Any], parent: "_SpanNode | None", span_id: int):
+        self.name = name
+        self.fields = fields
+        self.parent = parent
+        self.span_id = span_id
+        self.duration_ns = 0
+        self.error: str | None = None
+        self.children: dict[str, _Aggregate] = {}
+        self.finished = False
+        self.start_ns = time.perf_counter_ns()
+
+    def path(self) -> str:
+        names = []
+        node: _SpanNode | None = self
+        while node is not None:
+            names.append(node.name)
+            node = node.parent
+        return "/".join(reversed(names))
+
+
+# Innermost running span of the current thread or task
+_current_span: ContextVar[_SpanNode | None] = ContextVar("log_current_span", default=None)
+
+
+# ============================================================================
+# Recorder
+# ============================================================================
+
+
+class SpanRecorder:
+    """Emits finished spans through the configured pipeline.
+
+    In ``tree`` mode a finished span is folded into its parent: siblings of
+    the same name become one entry with their count, total and max duration,
+    so a loop of a thousand queries stays one line. The root span logs the
+    tree; it carries the bound context (correlation ID included) of the code
+    that finishes it. A span outliving its parent (e.g. a task left running)
+    is logged as a tree of its own.
+    """
+
+    def __init__(self, mode: SpanMode, logger_name: str = __name__):
+        self.mode = mode
+        self.logger_name = logger_name
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()  # Children may finish on other threads
+
+    def start(self, name: str, fields: dict[str, Any]) -> tuple[_SpanNode, Token[_SpanNode | None]]:
+        node = _SpanNode(name, fields, _current_span.get(), next(self._ids))
+        return node, _current_span.set(node)
+
+    def finish(self, node: _SpanNode, token: Token[_SpanNode | None], error: BaseException | None) -> None:
+        node.duration_ns = time.perf_counter_ns() - node.start_ns
+        _current_span.reset(token)
+        if error is not None:
+            node.error = type(error).__name__
+
+        parent = node.parent
+        if self.mode is SpanMode.EACH:
+            node.finished = True
+            self._emit_span(node)
+            return
+
+        with self._lock:
+            node.finished = True
+            if parent is not None and not parent.finished:
+                _fold(parent.children, node)
+                return
+        self._emit_tree(node)
+
+    def _emit_span(self, node: _SpanNode) -> None:
+        fields = dict(node.fields)
+        fields.update(
+            span=node.name,
+            path=node.path(),
+            span_id=node.span_id,
+            parent_id=node.parent.span_id if node.parent is not None else None,
+            duration_ms=round(node.duration_ns / _NS_PER_MS, 3),
+        )
+        if node.error is not None:
+            fields["error"] = node.error
+        structlog.get_logger(self.logger_name).info("Span finished", **fields)
+
+    def _emit_tree(self, node: _SpanNode) -> None:
+        fields = dict(node.fields)
+        fields.update(span=node.name, duration_ms=round(node.duration_ns / _NS_PER_MS, 3))
+        if node.error is not None:
+            fields["error"] = node.error
+        if node.children:
+            fields["children"] = UnboundedDict((name, child.describe()) for name, child in node.children.items())
+        structlog.get_logger(self.logger_name).info("Span tree", **fields)
+
+
+def _fold(siblings: dict[str, _Aggregate], node: _SpanNode) -> None:
+    aggregate = siblings.get(node.name)
+    if aggregate is None:
+        aggregate = siblings[node.name] = _Aggregate()
+    aggregate.count += 1
+    aggregate.total_ns += node.duration_ns
+    aggregate.max_ns = max(aggregate.max_ns, node.duration_ns)
+    aggregate.errors += node.error is not None
+    _merge(aggregate.children, node.children)
+
+
+def _merge(into: dict[str, _Aggregate], source: dict[str, _Aggregate]) -> None:
+    for name, aggregate in source.items():
+        existing = into.get(name)
+        if existing is None:
+            into[name] = aggregate  # The finished span no longer touches it
+            continue
+        existing.count += aggregate.count
+        existing.total_ns += aggregate.total_ns
+        existing.max_ns = max(existing.max_ns, aggregate.max_ns)
+        existing.errors += aggregate.errors
+        _merge(existing.children, aggregate.children)
+
+
+# Recorder of the configured span mode (None while spans are off)
+_recorder: SpanRecorder | None = None
+
+
+def configure_spans(mode: SpanMode | str = SpanMode.OFF) -> None:
+    """Turn span recording on or off; ``configure_structlog(spans=...)`` calls it."""
+    global _recorder
+    mode = SpanMode(mode)
+    _recorder = None if mode is SpanMode.OFF else SpanRecorder(mode)
+
+
+# ============================================================================
+# Public API
+# ============================================================================
+
+
+class _DisabledSpan:
+    """Shared do-nothing span handed out while spans are off."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    async def __aenter__(self) -> None:
+        return None
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        return None
+
+
+_DISABLED_SPAN = _DisabledSpan()
+
+
+class _Span:
+    """A span being timed; usable once, with ``with`` or ``async with``."""
+
+    __slots__ = ("_recorder", "_name", "_fields", "_node", "_token")
+
+    def __init__(self, recorder: SpanRecorder, name: str, fields: dict[str, Any]):
+        self._recorder = recorder
+        self._name = name
+        self._fields = fields
+
+    def __enter__(self) -> None:
+        self._node, self._token = self._recorder.start(self._name, self._fields)
+
+    def __exit__(self, exc_type: Any, exc: BaseException | None, traceback: Any) -> None:
+        self._recorder.finish(self._node, self._token, exc)
+
+    async def __aenter__(self) -> None:
+        self.__enter__()
+
+    async def __aexit__(self, exc_type: Any, exc: BaseException | None, traceback: Any) -> None:
+        self.__exit__(exc_type, exc, traceback)
+
+
+def span(name: str, **fields: Any) -> _Span | _DisabledSpan:
+    """Time the enclosed block as a child of the current span (``with`` or ``async with``)."""
+    recorder = _recorder
+    if recorder is None:
+        return _DISABLED_SPAN
+    return _Span(recorder, name, fields)
+
+
+def traced(name: str | None = None, **fields: Any) -> Callable[[_F], _F]:
+    """Decorator timing each call of a function or coroutine function as a span.
+
+    The span mode is checked per call, so functions decorated at import time
+    follow a later ``configure_structlog(spans=...)``.
+    """
+
+    def decorate(fn: _F) -> _F:
+        span_name = name or fn.__qualname__
+
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                recorder = _recorder
+                if recorder is None:
+                    return await fn(*args, **kwargs)
+                with _Span(recorder, span_name, fields):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            recorder = _recorder
+            if recorder is None:
+                return fn(*args, **kwargs)
+            with _Span(recorder, span_name, fields):
+                return fn(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
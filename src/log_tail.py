@@ -0,0 +1,250 @@
+"""Tail-based buffering: events below the level threshold kept per request until it fails.
+
+Events below their logger's threshold that carry a ``correlation_id`` are held,
+already processed but not rendered, in a bounded buffer per correlation ID. A
+request that completes normally discards its buffer; one that logs an event at
+``flush_level`` (ERROR by default) or is marked failed gets its buffered events
+rendered and written in order, ahead of the triggering event, and from then on
+its events below the threshold are written directly until it completes.
+"""
+
+import sys
+import threading
+import time
+import traceback
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Callable
+
+import structlog
+from structlog.types import EventDict, Processor, WrappedLogger
+
+from src.log_levels import level_number
+from src.log_queue import emit_rendered
+
+# ============================================================================
+# Configuration & Constants
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class TailBufferConfig:
+    """Memory caps and triggers of ``TailBuffer``; sizes are estimates of the held event dicts."""
+
+    max_events_per_request: int = 1000
+    max_bytes_per_request: int = 256 * 1024
+    max_total_bytes: int = 32 * 1024 * 1024
+    idle_timeout_s: float = 300.0  # Buffers with no new event for this long are evicted as abandoned
+    flush_level: int | str = "ERROR"
+
+
+_LEVEL_NUMBERS = {
+    "debug": 10,
+    "info": 20,
+    "warn": 30,
+    "warning": 30,
+    "error": 40,
+    "exception": 40,
+    "critical": 50,
+    "fatal": 50,
+}
+_LOGGER = "logger"
+_MESSAGE = "message"
+_LEVEL = "level"
+_EXTRA = "extra"
+_CORRELATION_ID = "correlation_id"
+_EVENT_BYTES = 480  # Measured footprint of a buffered event dict, its extra dict and the entry
+_VALUE_BYTES = 64  # Estimated footprint of a non-string extra value
+_REQUEST_BYTES = 1000  # Measured footprint of an empty request buffer (mostly its deque block)
+
+
+# (wrapped logger, method name, processed event dict, estimated size)
+_BufferedEvent = tuple[WrappedLogger, str, EventDict, int]
+
+
+class _RequestBuffer:
+    """Events held for one correlation ID."""
+
+    __slots__ = ("events", "size", "dropped", "failed", "last_active")
+
+    def __init__(self, now: float) -> None:
+        self.events: deque[_BufferedEvent] = deque()
+        self.size = _REQUEST_BYTES
+        self.dropped = 0  # Oldest events discarded to stay within the per-request caps
+        self.failed = False
+        self.last_active = now
+
+
+# ============================================================================
+# Tail Buffer
+# ============================================================================
+
+
+class TailBuffer:
+    """structlog processor holding below-threshold events per correlation ID (see module docstring).
+
+    Installed after the event processor, so events carry the context bound
+    when they were logged; ``downstream`` is the processor that follows it
+    (renderer or ``defer_rendering``) and is applied to buffered events when
+    they are written. Events below the threshold without a correlation ID are
+    dropped as usual. Buffers are kept in least-recently-active order: those
+    idle for ``idle_timeout_s``, then the least recently active while the total
+    exceeds ``max_total_bytes``, are evicted when new events arrive.
+    """
+
+    def __init__(
+        self,
+        config: TailBufferConfig,
+        threshold: Callable[[str], int],
+        downstream: Processor,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if config.max_events_per_request < 1 or config.max_bytes_per_request < 1 or config.max_total_bytes < 1:
+            raise ValueError(f"tail buffer caps must be positive, got {config}")
+
+        self.config = config
+        self._threshold = threshold
+        self._downstream = downstream
+        self._clock = clock
+        self._flush_level = level_number(config.flush_level)
+        self._lock = threading.Lock()
+        self._requests: OrderedDict[str, _RequestBuffer] = OrderedDict()
+        self._total_bytes = 0
+        self._next_sweep = clock() + config.idle_timeout_s / 4
+        self._counts = {"buffered": 0, "flushed": 0, "discarded": 0, "overflowed": 0, "evicted": 0}
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        level = _LEVEL_NUMBERS.get(method_name, 20)
+        if level >= self._threshold(event_dict[_LOGGER]):
+            if level >= self._flush_level:
+                correlation_id = _correlation_id(event_dict)
+                if correlation_id is not None:
+                    self.fail(correlation_id)
+            return event_dict
+
+        correlation_id = _correlation_id(event_dict)
+        if correlation_id is None:
+            raise structlog.DropEvent
+
+        event = (logger, method_name, event_dict, _event_size(event_dict))
+        with self._lock:
+            now = self._clock()
+            requests = self._requests
+            request = requests.get(correlation_id)
+            if request is None:
+                request = requests[correlation_id] = _RequestBuffer(now)
+                self._total_bytes += request.size
+            else:
+                requests.move_to_end(correlation_id)
+                request.last_active = now
+            if not request.failed:
+                self._append(request, event)
+                if self._total_bytes > self.config.max_total_bytes or now >= self._next_sweep:
+                    self._evict(now)
+                raise structlog.DropEvent
+
+        # The request already failed: its events are written as they come
+        self._emit([event])
+        raise structlog.DropEvent
+
+    def fail(self, correlation_id: str) -> None:
+        """Write the request's buffered events in order and let its later events through until ``complete``."""
+        with self._lock:
+            request = self._requests.get(correlation_id)
+            if request is None:
+                request = self._requests[correlation_id] = _RequestBuffer(self._clock())
+                self._total_bytes += request.size
+            request.failed = True
+            events = list(request.events)
+            dropped = request.dropped
+            self._total_bytes -= request.size - _REQUEST_BYTES
+            request.events.clear()
+            request.size = _REQUEST_BYTES
+            request.dropped = 0
+            self._counts["flushed"] += len(events)
+
+        if dropped and events:
+            events.insert(0, _dropped_notice(events[0], correlation_id, dropped))
+        self._emit(events)
+
+    def complete(self, correlation_id: str) -> None:
+        """Forget the request, discarding the events of a request that did not fail."""
+        with self._lock:
+            request = self._requests.pop(correlation_id, None)
+            if request is not None:
+                self._total_bytes -= request.size
+                self._counts["discarded"] += len(request.events)
+
+    def stats(self) -> dict[str, int]:
+        """Cumulative event counts by outcome, plus the requests and estimated bytes held now."""
+        with self._lock:
+            return {**self._counts, "requests": len(self._requests), "held_bytes": self._total_bytes}
+
+    def _append(self, request: _RequestBuffer, event: _BufferedEvent) -> None:
+        config = self.config
+        events = request.events
+        events.append(event)
+        request.size += event[3]
+        self._total_bytes += event[3]
+        self._counts["buffered"] += 1
+        while len(events) > config.max_events_per_request or (
+            request.size > config.max_bytes_per_request and len(events) > 1
+        ):
+            oldest = events.popleft()
+            request.size -= oldest[3]
+            self._total_bytes -= oldest[3]
+            request.dropped += 1
+            self._counts["overflowed"] += 1
+
+    def _evict(self, now: float) -> None:
+        # Idle buffers are looked for a few times per timeout; the total cap is enforced on every event
+        self._next_sweep = now + self.config.idle_timeout_s / 4
+        requests = self._requests
+        idle_before = now - self.config.idle_timeout_s
+        max_total = self.config.max_total_bytes
+        while requests:
+            correlation_id, request = next(iter(requests.items()))
+            if request.last_active > idle_before and self._total_bytes <= max_total:
+                break
+            del requests[correlation_id]
+            self._total_bytes -= request.size
+            self._counts["evicted"] += len(request.events)
+
+    def _emit(self, events: list[_BufferedEvent]) -> None:
+        downstream = self._downstream
+        for logger, method_name, event_dict, _ in events:
+            try:
+                emit_rendered(logger, method_name, downstream(logger, method_name, event_dict))
+            except structlog.DropEvent:
+                pass
+            except Exception:
+                traceback.print_exc(file=sys.stderr)
+
+
+def _correlation_id(event_dict: EventDict) -> str | None:
+    extra = event_dict.get(_EXTRA)
+    if extra is None:
+        return None
+    correlation_id = extra.get(_CORRELATION_ID)
+    return correlation_id if type(correlation_id) is str else None
+
+
+def _event_size(event_dict: EventDict) -> int:
+    """Estimated footprint; extra values were already bounded by the event processor."""
+    message = event_dict.get(_MESSAGE)
+    size = _EVENT_BYTES + (len(message) if type(message) is str else _VALUE_BYTES)
+    for value in event_dict[_EXTRA].values():
+        size += len(value) if type(value) is str else _VALUE_BYTES
+    return size
+
+
+def _dropped_notice(first: _BufferedEvent, correlation_id: str, dropped: int) -> _BufferedEvent:
+    """Warning written ahead of a flushed buffer that lost its oldest events to the caps."""
+    logger, _, event_dict, _ = first
+    notice = {
+        **event_dict,
+        _LEVEL: "warning",
+        _MESSAGE: "Tail buffer dropped older events",
+        _EXTRA: {_CORRELATION_ID: correlation_id, "dropped_events": dropped},
+    }
+    return logger, "warning", notice, 0
@@ -0,0 +1,231 @@
+"""Size-bounded, type-aware serialization of ``extra`` values before rendering.
+
+Values logged by accident in hot paths (NumPy arrays, DataFrames, long lists,
+whole prompts) would otherwise be rendered in full by every output. The
+event processor runs ``ValueBounder`` over ``extra`` so each renderer gets
+values within budget:
+
+- strings longer than their budget are cut and end in ``...[+N chars]``;
+- array-likes (anything with ``shape`` and ``dtype``, e.g. NumPy arrays,
+  tensors, Series) become ``{"type", "shape", "dtype", "sample"}`` and frames
+  ``{"type", "rows", "columns", "column_names"}``, without building their repr;
+- sequences and mappings longer than ``max_items`` keep their head and tail
+  (``{"type", "length", "head", "tail"}``) or their first keys, nested levels
+  below ``max_depth`` are summarized by type and length, and large bytes by length.
+
+Sizes are estimated as JSON characters without encoding anything. The names of
+the fields that were cut or summarized are listed under ``extra["_truncated"]``.
+Objects of other types are left to the renderer, and so are ``UnboundedDict``
+values: the summaries the library logs itself (span trees, metrics), whose
+size follows from code and configuration rather than from logged data.
+"""
+
+import math
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, Iterable
+
+TRUNCATED_KEY = "_truncated"
+
+_SCALARS = frozenset((bool, int, float, type(None)))
+_FLAT_CONTAINERS = frozenset((list, tuple, dict))
+_SCALAR_BYTES = 20  # Upper estimate for a rendered number, bool or null
+_MIN_FIELD_BYTES = 32  # Floor for a field once the event budget is spent
+_MARKER_BYTES = 24  # Room kept for the "...[+N chars]" suffix
+
+
+@dataclass(frozen=True)
+class ValueLimits:
+    """Budgets applied to ``extra`` values, in approximate rendered bytes."""
+
+    max_field_bytes: int = 4096
+    max_event_bytes: int = 16384
+    max_items: int = 20  # Items kept from long sequences (head and tail) and mappings
+    sample_size: int = 8  # Leading elements shown for array-likes
+    max_depth: int = 4  # Nested containers below this are summarized
+
+
+DEFAULT_VALUE_LIMITS = ValueLimits()
+
+
+class UnboundedDict(dict[str, Any]):
+    """Mapping that ``ValueBounder`` passes through whole, for summaries the library emits itself."""
+
+
+class ValueBounder:
+    """Bound the values of an event's ``extra`` dict in place (see module docstring)."""
+
+    def __init__(self, limits: ValueLimits = DEFAULT_VALUE_LIMITS):
+        if limits.max_field_bytes < _MIN_FIELD_BYTES:
+            raise ValueError(f"max_field_bytes must be at least {_MIN_FIELD_BYTES}, got {limits.max_field_bytes}")
+        self.limits = limits
+
+    def __call__(self, extra: dict[str, Any]) -> dict[str, Any]:
+        max_field = self.limits.max_field_bytes
+        max_items = self.limits.max_items
+        remaining = self.limits.max_event_bytes
+        truncated: list[str] | None = None
+        for key, value in extra.items():
+            kind = type(value)
+            if kind in _SCALARS:
+                remaining -= _SCALAR_BYTES + len(key)
+                continue
+            if kind is str and len(value) + 2 <= max_field and len(value) < remaining:
+                remaining -= len(value) + len(key) + 6
+                continue
+            budget = max(min(max_field, remaining), _MIN_FIELD_BYTES)
+            if kind in _FLAT_CONTAINERS and len(value) <= max_items:
+                size = _flat_size(value.values() if kind is dict else value, budget)
+                if size is not None:
+                    remaining -= size + len(key) + 6
+                    continue
+            bounded, size, cut = self.bound(value, budget)
+            if bounded is not value:
+                extra[key] = bounded
+            if cut:
+                if truncated is None:
+                    truncated = []
+                truncated.append(key)
+            remaining -= size + len(key) + 6
+        if truncated is not None:
+            extra[TRUNCATED_KEY] = truncated
+        return extra
+
+    def bound(self, value: Any, budget: int, depth: int = 0) -> tuple[Any, int, bool]:
+        """``value`` within ``budget``: (value or its summary, estimated size, whether anything was lost).
+
+        Array-likes are always summarized, even when nothing is lost, so their repr is never rendered.
+        """
+        if type(value) in _SCALARS:
+            return value, _SCALAR_BYTES, False
+        if isinstance(value, str):
+            length = len(value)
+            if length + 2 <= budget:
+                return value, length + 2, False
+            keep = max(budget - _MARKER_BYTES, 0)
+            return f"{value[:keep]}...[+{length - keep} chars]", budget, True
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            length = value.nbytes if isinstance(value, memoryview) else len(value)
+            if 4 * length + 3 <= budget:  # repr() worst case
+                return value, 4 * length + 3, False
+            return {"type": type(value).__name__, "length": length}, 40, True
+
+        if isinstance(value, (dict, list, tuple, set, frozenset)):
+            if type(value) is UnboundedDict:
+                return value, _SCALAR_BYTES, False
+            if depth >= self.limits.max_depth:
+                return {"type": type(value).__name__, "length": len(value)}, 40, True
+            if len(value) <= self.limits.max_items:
+                size = _flat_size(value.values() if isinstance(value, dict) else value, budget)
+                if size is not None:
+                    return value, size, False
+            if isinstance(value, dict):
+                return self._bound_mapping(value, budget, depth)
+            return self._bound_sequence(value, budget, depth)
+
+        shape = getattr(value, "shape", None)
+        if shape is not None and not isinstance(value, type):
+            if hasattr(value, "columns"):
+                return self._summarize_frame(value, shape)
+            if hasattr(value, "dtype"):
+                return self._summarize_array(value, shape, budget, depth)
+        return value, _SCALAR_BYTES, False
+
+    def _bound_mapping(self, value: dict[Any, Any], budget: int, depth: int) -> tuple[Any, int, bool]:
+        max_items = self.limits.max_items
+        length = len(value)
+        shown = min(length, max_items)
+        child_budget = max((budget - 2) // max(shown, 1), _MIN_FIELD_BYTES)
+        bounded: dict[Any, Any] = {}
+        size = 2
+        cut = changed = length > max_items
+        for key, item in islice(value.items(), max_items):
+            bounded[key], item_size, item_cut = self.bound(item, child_budget, depth + 1)
+            size += item_size + len(str(key)) + 6
+            cut = cut or item_cut
+            changed = changed or bounded[key] is not item
+        if length > max_items:
+            bounded["..."] = f"+{length - max_items} keys"
+        return (bounded if changed else value), size, cut
+
+    def _bound_sequence(self, value: Any, budget: int, depth: int) -> tuple[Any, int, bool]:
+        max_items = self.limits.max_items
+        length = len(value)
+        if length <= max_items:
+            child_budget = max((budget - 2) // max(length, 1), _MIN_FIELD_BYTES)
+            items = [self.bound(item, child_budget, depth + 1) for item in value]
+            size = 2 + sum(item_size + 2 for _, item_size, _ in items)
+            cut = any(item_cut for _, _, item_cut in items)
+            if not cut and all(bounded is item for (bounded, _, _), item in zip(items, value, strict=True)):
+                return value, size, False
+            return [item for item, _, _ in items], size, cut
+
+        child_budget = max((budget - 60) // max_items, _MIN_FIELD_BYTES)
+        if isinstance(value, (set, frozenset)):
+            head, tail = list(islice(value, max_items)), []
+        else:
+            half = max_items // 2
+            head, tail = list(value[:half]), list(value[length - (max_items - half) :])
+        summary: dict[str, Any] = {"type": type(value).__name__, "length": length}
+        size = 60
+        for name, part in (("head", head), ("tail", tail)):
+            if part or name == "head":
+                items = [self.bound(item, child_budget, depth + 1) for item in part]
+                summary[name] = [item for item, _, _ in items]
+                size += sum(item_size + 2 for _, item_size, _ in items)
+        return summary, size, True
+
+    def _summarize_array(self, value: Any, shape: Any, budget: int, depth: int) -> tuple[Any, int, bool]:
+        dims = [int(dim) for dim in shape]
+        if not dims:
+            return value, _SCALAR_BYTES, False  # NumPy scalar, rendered like a number
+        count = math.prod(dims)
+        sample = _sample(value, min(self.limits.sample_size, count))
+        summary: dict[str, Any] = {"type": _type_name(value), "shape": dims, "dtype": str(value.dtype)}
+        size = 60 + 8 * len(dims)
+        if sample is not None:
+            child_budget = max((budget - size) // max(len(sample), 1), _MIN_FIELD_BYTES)
+            items = [self.bound(item, child_budget, depth + 1) for item in sample]
+            summary["sample"] = [item for item, _, _ in items]
+            size += sum(item_size + 2 for _, item_size, _ in items)
+        return summary, size, sample is None or count > len(sample)
+
+    def _summarize_frame(self, value: Any, shape: Any) -> tuple[Any, int, bool]:
+        dims = [int(dim) for dim in shape]
+        names = [str(name)[:64] for name in islice(value.columns, self.limits.max_items)]
+        summary = {
+            "type": _type_name(value),
+            "rows": dims[0],
+            "columns": dims[1] if len(dims) > 1 else 1,
+            "column_names": names,
+        }
+        return summary, 80 + sum(len(name) + 4 for name in names), True
+
+
+def _flat_size(items: Iterable[Any], budget: int) -> int | None:
+    """Estimated size of a short container of scalars and strings, or None when it needs bounding."""
+    size = 2
+    for item in items:
+        kind = type(item)
+        if kind is str:
+            size += len(item) + 4
+        elif kind in _SCALARS:
+            size += _SCALAR_BYTES
+        else:
+            return None
+    return size if size <= budget else None
+
+
+def _type_name(value: Any) -> str:
+    kind = type(value)
+    return f"{kind.__module__.partition('.')[0]}.{kind.__name__}"
+
+
+def _sample(value: Any, count: int) -> list[Any] | None:
+    """The first ``count`` elements in flat order, read without converting the whole value."""
+    try:
+        # NumPy arrays, pandas Series, then tensors and other reshapeable arrays
+        flat = value.flat if hasattr(value, "flat") else value.iloc if hasattr(value, "iloc") else value.reshape(-1)
+        return list(flat[:count].tolist())
+    except Exception:
+        return None
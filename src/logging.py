@@ -1,13 +1,47 @@
+import asyncio
+import functools
+import itertools
+import json
 import logging
 import os
+import signal
+import string
 import sys
-from dataclasses import dataclass
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
 from enum import Enum
-from typing import Any
+from types import MappingProxyType
+from typing import Any, BinaryIO, Callable, Iterator, Mapping, cast
 
 import structlog
-from structlog.types import EventDict, WrappedLogger
+from structlog.types import EventDict, Processor, WrappedLogger
+
+from src.log_async import AsyncLoggerFactory, AsyncLogSink
+from src.log_binary import BinaryLoggerFactory
+from src.log_capture import CaptureLoggerFactory, LogCapture
+from src.log_exceptions import (
+    DEFAULT_EXCEPTION_CONFIG,
+    EXC_INFO_KEY,
+    EXCEPTION_KEY,
+    ExceptionConfig,
+    ExceptionRenderer,
+    format_exception_block,
+)
+from src.log_files import FileSinkConfig, RotatingFileStream
+from src.log_flight import FlightRecorder
+from src.log_levels import LevelThresholds, parse_level_spec
+from src.log_metrics import MetricsAggregator, MetricsConfig
+from src.log_multiprocess import ChannelStream, LocalStream, LogWriter, WorkerLogConfig
+from src.log_network import NetworkSinkConfig, NetworkStream
+from src.log_queue import OverflowPolicy, QueuedEmitter, QueuedLoggerFactory, defer_rendering
+from src.log_sampling import LogSampler, SamplingConfig
+from src.log_spans import SpanMode, configure_spans
+from src.log_tail import TailBuffer, TailBufferConfig
+from src.log_values import DEFAULT_VALUE_LIMITS, ValueBounder, ValueLimits
 
 # ============================================================================
 # Configuration & Constants
@@ -26,6 +60,14 @@ class LogKeys(str, Enum):
     EXTRA = "extra"
 
 
+class LogBackend(str, Enum):
+    """Where rendered log lines are written."""
+
+    STDLIB = "stdlib"  # Through the stdlib logging root handler (captured by caplog)
+    FAST = "fast"  # Bytes straight to a binary stream, bypassing stdlib logging
+    BINARY = "binary"  # Compact binary records (src.log_binary) to a binary stream
+
+
 @dataclass(frozen=True)
 class LogDefaults:
     """Default values for logging configuration."""
@@ -35,25 +77,178 @@ class LogDefaults:
     log_level: str = "INFO"
     max_value_length: int = 50
     correlation_id_display_length: int = 8
+    queue_size: int = 10_000
+    async_buffer_bytes: int = 4 * 1024 * 1024
+    flight_recorder_size: int = 4 * 1024 * 1024
+    process_batch_bytes: int = 64 * 1024
+    process_flush_interval_s: float = 0.05
 
 
 # Immutable defaults instance
 DEFAULTS = LogDefaults()
 
+# Plain-str keys resolved once; enum attribute lookups are not free on the hot path
+_MESSAGE = LogKeys.MESSAGE.value
+_CONTEXT = LogKeys.CONTEXT.value
+_CORRELATION_ID = LogKeys.CORRELATION_ID.value
+_LEVEL = LogKeys.LEVEL.value
+_LOGGER = LogKeys.LOGGER.value
+_EXTRA = LogKeys.EXTRA.value
+_TIMESTAMP = LogKeys.TIMESTAMP.value
+_EXC_INFO = EXC_INFO_KEY
+_STANDARD_FIELDS = frozenset((_TIMESTAMP, _LOGGER, _MESSAGE, _CONTEXT, _LEVEL))
+_LEVEL_ALIASES = {"warn": "warning", "exception": "error"}
+_LEVEL_NUMBERS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warn": logging.WARNING,
+    "warning": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "fatal": logging.CRITICAL,
+}
+
+# Background writer of the queued emission mode (None when logging synchronously)
+_emitter: QueuedEmitter | None = None
+
+# Loop-local buffers and writer thread of the asyncio mode (None otherwise)
+_async_sink: AsyncLogSink | None = None
+
+# Sampling stage installed by configure_structlog (None when every event is kept)
+_sampler: LogSampler | None = None
+
+# Metrics stage counting matching events ahead of sampling (None when no metrics are configured)
+_metrics: MetricsAggregator | None = None
+
+# Per-logger thresholds behind the bound logger classes (None until configure_structlog)
+_levels: LevelThresholds | None = None
+
+# Multi-process mode: the parent's writer, this process's stream to it and the worker settings
+_writer: LogWriter | None = None
+_process_stream: LocalStream | ChannelStream | None = None
+_worker_config: WorkerLogConfig | None = None
+
+# Rotating file the output goes to (None when writing to a stream)
+_file_stream: RotatingFileStream | None = None
+
+# Collector connection the output is sent to (None when writing to a stream)
+_network_stream: NetworkStream | None = None
+
+# Memory-mapped ring buffer receiving every event down to DEBUG (None when disabled)
+_flight_recorder: FlightRecorder | None = None
+
+# Per-request buffer of events below the threshold, written if the request fails (None when disabled)
+_tail_buffer: TailBuffer | None = None
+
 
 # ============================================================================
 # Context Operations
 # ============================================================================
 
 
+@dataclass(frozen=True)
+class ContextSnapshot:
+    """Immutable view of the bound context, shared by every log call until the next bind.
+
+    The fields are pre-split the way the log processor consumes them, so reading
+    the context costs one ``ContextVar.get`` regardless of how many fields are bound.
+    """
+
+    fields: Mapping[str, Any]
+    version: int
+    context: str
+    correlation_id: str
+    standard: tuple[tuple[str, Any], ...]  # Bound fields that are top-level log keys
+    extra: dict[str, Any]  # Bound fields destined for 'extra'; never mutated
+
+
+_snapshot_versions = itertools.count(1)
+
+
+def _make_snapshot(fields: dict[str, Any], version: int) -> ContextSnapshot:
+    return ContextSnapshot(
+        fields=MappingProxyType(fields),
+        version=version,
+        context=str(fields.get(_CONTEXT, DEFAULTS.context)),
+        correlation_id=str(fields.get(_CORRELATION_ID, DEFAULTS.correlation_id)),
+        standard=tuple((key, value) for key, value in fields.items() if key in _STANDARD_FIELDS),
+        extra={key: value for key, value in fields.items() if key not in _STANDARD_FIELDS and key != "event"},
+    )
+
+
+_EMPTY_SNAPSHOT = _make_snapshot({}, 0)
+
+# One variable for the whole snapshot: asyncio tasks and threads get the same
+# isolation as per-key context variables, but reads never scan the context
+_context_snapshot: ContextVar[ContextSnapshot] = ContextVar("log_context_snapshot", default=_EMPTY_SNAPSHOT)
+
+
+def get_context_snapshot() -> ContextSnapshot:
+    """Get the current immutable context snapshot."""
+    return _context_snapshot.get()
+
+
 def _get_context_value(key: str, default: str) -> str:
     """Get a value from context variables with fallback."""
-    return str(structlog.contextvars.get_contextvars().get(key, default))
+    return str(_context_snapshot.get().fields.get(key, default))
 
 
 def get_correlation_id() -> str:
     """Get current correlation ID from context."""
-    return _get_context_value(LogKeys.CORRELATION_ID.value, DEFAULTS.correlation_id)
+    return _context_snapshot.get().correlation_id
+
+
+# ============================================================================
+# Timestamps
+# ============================================================================
+
+
+class TimestampFormatter:
+    """Format epoch-nanosecond timestamps as UTC text.
+
+    The date/time text is computed once per wall-clock second and reused by
+    every event in that second; only the microseconds are formatted per call.
+    """
+
+    def __init__(self) -> None:
+        # (epoch second, "YYYY-MM-DDTHH:MM:SS") replaced as a whole, so readers never see a torn pair
+        self._cached: tuple[int, str] = (-1, "")
+
+    def _prefix(self, second: int) -> str:
+        cached_second, prefix = self._cached
+        if cached_second != second:
+            prefix = datetime.fromtimestamp(second, timezone.utc).isoformat()[:19]
+            self._cached = (second, prefix)
+        return prefix
+
+    def iso(self, timestamp_ns: int) -> str:
+        """Same text as ``datetime.now(timezone.utc).isoformat()`` with ``Z`` for ``+00:00``."""
+        second, nanos = divmod(timestamp_ns, 1_000_000_000)
+        micros = nanos // 1000
+        if micros:
+            return f"{self._prefix(second)}.{micros:06d}Z"
+        return f"{self._prefix(second)}Z"
+
+    def time_of_day(self, timestamp_ns: int) -> str:
+        """HH:MM:SS portion of the timestamp."""
+        return self._prefix(timestamp_ns // 1_000_000_000)[11:]
+
+
+_timestamps = TimestampFormatter()
+
+
+def _with_iso_timestamp(renderer: Processor) -> Processor:
+    """Wrap a renderer so raw epoch-nanosecond timestamps are rendered as ISO-8601 text."""
+    iso = _timestamps.iso
+
+    def render(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> Any:
+        timestamp = event_dict.get(_TIMESTAMP)
+        if type(timestamp) is int:
+            event_dict[_TIMESTAMP] = iso(timestamp)
+        return renderer(logger, method_name, event_dict)
+
+    return render
 
 
 # ============================================================================
@@ -62,7 +257,11 @@ def get_correlation_id() -> str:
 
 
 def _process_log_fields(_: WrappedLogger, __: str, event_dict: EventDict) -> EventDict:
-    """Process log fields by restructuring event_dict for consistent formatting."""
+    """Process log fields by restructuring event_dict for consistent formatting.
+
+    This is the reference step of the unfused processor chain; ``configure_structlog``
+    installs the equivalent single-pass processor from ``_build_event_processor``.
+    """
     # Rename "event" to "message" for clarity
     event_dict[LogKeys.MESSAGE.value] = event_dict.pop("event", "")
 
@@ -91,36 +290,224 @@ def _process_log_fields(_: WrappedLogger, __: str, event_dict: EventDict) -> Eve
     return event_dict
 
 
+def _build_event_processor(
+    renderer: Processor | None = None,
+    bound_extra: Callable[[dict[str, Any]], Any] | None = None,
+    render_exception: Callable[[dict[str, Any]], Any] | None = None,
+) -> Processor:
+    """Build one processor doing the work of the standard processor chain.
+
+    Produces what ``add_log_level``, ``add_logger_name``, ``merge_contextvars``,
+    ``_process_log_fields`` and ``TimeStamper(fmt="iso")`` produce in sequence
+    (same keys, same order) in a single pass, reading the context from the
+    current snapshot. The timestamp is kept as raw epoch nanoseconds and only
+    formatted by the renderer (see ``_with_iso_timestamp``). With a ``renderer``
+    the event is rendered in the same call; without one the structured event
+    dict is returned. ``render_exception`` (an ``ExceptionRenderer``) turns an
+    ``exc_info`` argument into a structured ``exception`` field, on the calling
+    thread; ``bound_extra`` (a ``ValueBounder``) then caps the size of the
+    ``extra`` values before anything renders them.
+    """
+    standard_fields = _STANDARD_FIELDS
+    level_aliases = _LEVEL_ALIASES
+    default_correlation_id = DEFAULTS.correlation_id
+    get_snapshot = _context_snapshot.get
+    clock = time.time_ns
+
+    def process_event(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        message = event_dict.pop("event", "")
+
+        # Standard fields keep the position they would have had in the chained dict
+        fields: EventDict = {}
+        extra: dict[str, Any] = {}
+        for key, value in event_dict.items():
+            if key in standard_fields:
+                fields[key] = value
+            else:
+                extra[key] = value
+        fields[_LEVEL] = level_aliases.get(method_name, method_name)
+        fields[_LOGGER] = logger.name
+
+        # Bound context never overrides call-site keywords
+        snapshot = get_snapshot()
+        for key, value in snapshot.standard:
+            if key not in fields:
+                fields[key] = value
+        if extra:
+            for key, value in snapshot.extra.items():
+                if key not in extra:
+                    extra[key] = value
+        else:
+            extra = snapshot.extra.copy()
+
+        fields[_MESSAGE] = message
+        fields[_CONTEXT] = snapshot.context
+        if snapshot.correlation_id != default_correlation_id:
+            extra[_CORRELATION_ID] = snapshot.correlation_id
+        if extra:
+            if render_exception is not None and _EXC_INFO in extra:
+                render_exception(extra)
+            if bound_extra is not None:
+                bound_extra(extra)
+            fields[_EXTRA] = extra
+        fields[_TIMESTAMP] = clock()
+        return fields
+
+    if renderer is None:
+        return process_event
+
+    render = renderer
+
+    def process_and_render(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> Any:
+        return render(logger, method_name, process_event(logger, method_name, event_dict))
+
+    return process_and_render
+
+
+def _record_flight(recorder: FlightRecorder, threshold: Callable[[str], int] | None) -> Processor:
+    """Append every processed event to ``recorder``; only those at their logger's threshold go on to the output.
+
+    With ``threshold=None`` every event goes on, for a later stage (the tail buffer) to filter.
+    """
+    level_numbers = _LEVEL_NUMBERS
+    append = recorder.append
+
+    def record(logger: WrappedLogger, method_name: str, event_dict: EventDict) -> EventDict:
+        append(event_dict)
+        if threshold is not None and level_numbers.get(method_name, logging.INFO) < threshold(event_dict[_LOGGER]):
+            raise structlog.DropEvent
+        return event_dict
+
+    return record
+
+
 # ============================================================================
 # Human-Readable Formatting
 # ============================================================================
 
 
+DEFAULT_HUMAN_TEMPLATE = "{time} [{level}] {logger}: {message}{extra}{id}"
+
+# Template field -> expression computing it inside the compiled formatter
+_TEMPLATE_FIELDS = {
+    "time": "_time_of_day(timestamp) if type(timestamp) is int else _format_timestamp(timestamp)",
+    "level": "level",
+    "logger": '_short_logger_name(get("logger", ""))',
+    "message": 'get("message", "")',
+    "context": 'get("context", "")',
+    "extra": "_format_extra(extra)",
+    "id": '_format_correlation_id(extra.get("correlation_id", ""))',
+}
+_LEVEL_COLORS = {
+    "DEBUG": "\x1b[2m",
+    "INFO": "\x1b[32m",
+    "WARNING": "\x1b[33m",
+    "ERROR": "\x1b[31m",
+    "CRITICAL": "\x1b[1;31m",
+}
+_ANSI_RESET = "\x1b[0m"
+
+
 class HumanReadableFormatter:
-    """Encapsulates human-readable log formatting logic for structlog processor."""
+    """Encapsulates human-readable log formatting logic for structlog processor.
 
-    def __init__(self, defaults: LogDefaults = DEFAULTS):
+    ``template`` uses ``str.format`` syntax over the fields ``time`` (HH:MM:SS),
+    ``level``, ``logger`` (shortened), ``message``, ``context``, ``extra``
+    (`` [key=value, ...]``) and ``id`` (`` [id:<correlation id>]``); ``extra``
+    and ``id`` carry their leading space and are empty when there is nothing to
+    show. Format specs such as ``{level:8}`` and conversions apply as usual.
+    The template is compiled once into a function computing only the fields
+    it uses; shortened logger names are cached per name. ``color`` wraps the
+    level in ANSI colors (padding is applied to the plain text).
+    """
+
+    def __init__(
+        self,
+        defaults: LogDefaults = DEFAULTS,
+        template: str = DEFAULT_HUMAN_TEMPLATE,
+        color: bool = False,
+        logger_cache_size: int = 1024,
+    ):
         self.defaults = defaults
+        self.template = template
+        self.color = color
+        self._short_logger_name = functools.lru_cache(maxsize=logger_cache_size)(self.format_logger_name)
+        self._render = self._compile(template)
 
     def __call__(self, _: WrappedLogger, __: str, event_dict: EventDict) -> str:
         """Format EventDict for human-readable output (structlog processor).
 
-        Format: HH:MM:SS [LEVEL] logger: message [key_info] [correlation_id]
+        Format (default template): HH:MM:SS [LEVEL] logger: message [key_info] [correlation_id],
+        followed by the traceback lines of a rendered ``exception`` field.
         """
-        # Extract key components with safe defaults
-        level = event_dict.get(LogKeys.LEVEL.value, "info").upper()
-        logger_name = self.format_logger_name(event_dict.get(LogKeys.LOGGER.value, ""))
-        message = event_dict.get(LogKeys.MESSAGE.value, "")
-        timestamp = event_dict.get(LogKeys.TIMESTAMP.value, "")
-        extra = event_dict.get(LogKeys.EXTRA.value, {})
+        text = self._render(event_dict)
+        extra = event_dict.get(_EXTRA)
+        if extra and type(extra.get(EXCEPTION_KEY)) is dict:
+            return f"{text}\n{format_exception_block(extra[EXCEPTION_KEY])}"
+        return text
+
+    def _compile(self, template: str) -> Callable[[EventDict], str]:
+        pieces = []
+        used = set()
+        for literal, name, spec, conversion in string.Formatter().parse(template):
+            if literal:
+                pieces.append("f" + repr(literal.replace("{", "{{").replace("}", "}}")))
+            if name is None:
+                continue
+            if name not in _TEMPLATE_FIELDS:
+                raise ValueError(f"unknown field {name!r} in log template; expected one of {sorted(_TEMPLATE_FIELDS)}")
+            if spec and any(char in spec for char in "{}'\"\\"):
+                raise ValueError(f"unsupported format spec {spec!r} in log template")
+            used.add(name)
+            field = (
+                "{" + f"field_{name}" + (f"!{conversion}" if conversion else "") + (f":{spec}" if spec else "") + "}"
+            )
+            if name == "level" and self.color:
+                field = "{_LEVEL_COLORS.get(level, '')}" + field + "{_ANSI_RESET}"
+            pieces.append("f" + repr(field))
+
+        lines = ["def render(event_dict):", "    get = event_dict.get"]
+        if "time" in used:
+            lines.append('    timestamp = get("timestamp", "")')
+        if "level" in used:
+            lines.append('    level = get("level", "info").upper()')
+        if used & {"extra", "id"}:
+            lines.append('    extra = get("extra") or _EMPTY_EXTRA')
+        lines.extend(f"    field_{name} = {_TEMPLATE_FIELDS[name]}" for name in sorted(used))
+        lines.append(f"    return {' '.join(pieces) or repr('')}")
 
-        # Format components
-        time_str = self.format_timestamp(timestamp)
-        extra_str = self.format_extra_fields(extra)
-        correlation_id = extra.get(LogKeys.CORRELATION_ID.value, "")
-        corr_str = self.format_correlation_id(correlation_id)
+        namespace: dict[str, Any] = {
+            "_time_of_day": _timestamps.time_of_day,
+            "_format_timestamp": self.format_timestamp,
+            "_short_logger_name": self._short_logger_name,
+            "_format_extra": self._extra_formatter(),
+            "_format_correlation_id": self.format_correlation_id,
+            "_LEVEL_COLORS": _LEVEL_COLORS,
+            "_ANSI_RESET": _ANSI_RESET,
+            "_EMPTY_EXTRA": MappingProxyType({}),
+        }
+        exec(compile("\n".join(lines), f"<log template {template!r}>", "exec"), namespace)
+        return cast(Callable[[EventDict], str], namespace["render"])
 
-        return f"{time_str} [{level}] {logger_name}: {message}{extra_str}{corr_str}"
+    def _extra_formatter(self) -> Callable[[Mapping[str, Any]], str]:
+        """``format_extra_fields`` with the truncation inlined."""
+        max_length = self.defaults.max_value_length
+        keep = max_length - 3
+
+        def format_extra(extra: Mapping[str, Any]) -> str:
+            if not extra:
+                return ""
+            parts = []
+            for key, value in extra.items():
+                if key == EXCEPTION_KEY and type(value) is dict:
+                    continue  # Written below the line
+                text = value if type(value) is str else str(value)
+                if len(text) > max_length:
+                    text = f"{text[:keep]}..."
+                parts.append(f"{key}={text}")
+            return f" [{', '.join(parts)}]" if parts else ""
+
+        return format_extra
 
     def format_field_value(self, value: Any) -> str:
         """Format a single field value, truncating if too long."""
@@ -129,18 +516,20 @@ class HumanReadableFormatter:
             return f"{str_value[: self.defaults.max_value_length - 3]}..."
         return str_value
 
-    def format_timestamp(self, timestamp_str: str) -> str:
-        """Convert ISO timestamp to HH:MM:SS format."""
-        if not timestamp_str:
+    def format_timestamp(self, timestamp: int | str) -> str:
+        """Convert an epoch-nanosecond or ISO timestamp to HH:MM:SS format."""
+        if type(timestamp) is int:
+            return _timestamps.time_of_day(timestamp)
+        if not timestamp or not isinstance(timestamp, str):
             return ""
 
         try:
             # Parse ISO timestamp and format as HH:MM:SS
-            dt = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+            dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
             return dt.strftime("%H:%M:%S")
         except (ValueError, AttributeError):
             # Fallback: try to extract time portion manually
-            return timestamp_str.split("T")[1][:8] if "T" in timestamp_str else ""
+            return timestamp.split("T")[1][:8] if "T" in timestamp else ""
 
     def format_correlation_id(self, correlation_id: str) -> str:
         """Format correlation ID for display, truncating to readable length."""
@@ -169,13 +558,192 @@ class HumanReadableFormatter:
         return f" [{', '.join(formatted_parts)}]"
 
 
+# ============================================================================
+# Fast Output Backend
+# ============================================================================
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize unknown types exactly like structlog's JSONRenderer fallback."""
+    try:
+        return obj.__structlog__()
+    except AttributeError:
+        return repr(obj)
+
+
+class FastJSONRenderer:
+    """Render the event dict to bytes identical to ``JSONRenderer`` output.
+
+    ``json.dumps(..., default=...)`` builds a new encoder on every call; this
+    renderer builds one with the same settings up front and encodes straight
+    to bytes.
+    """
+
+    def __init__(self) -> None:
+        self._encode = json.JSONEncoder(default=_json_default).encode
+
+    def __call__(self, _: WrappedLogger, __: str, event_dict: EventDict) -> bytes:
+        return self._encode(event_dict).encode()
+
+
+class _BytesRenderer:
+    """Adapt a str-returning renderer to the bytes-only fast backend."""
+
+    def __init__(self, renderer: Callable[[WrappedLogger, str, EventDict], str]):
+        self._renderer = renderer
+
+    def __call__(self, logger: WrappedLogger, method_name: str, event_dict: EventDict) -> bytes:
+        return self._renderer(logger, method_name, event_dict).encode()
+
+
+class FastLogger:
+    """Wrapped logger writing one rendered line per call to a binary stream."""
+
+    __slots__ = ("name", "_write", "_flush", "_lock")
+
+    def __init__(self, stream: BinaryIO, lock: threading.Lock, name: str):
+        self.name = name
+        self._write = stream.write
+        self._flush = stream.flush
+        self._lock = lock
+
+    def msg(self, message: bytes) -> None:
+        with self._lock:
+            self._write(message)
+            self._write(b"\n")
+            self._flush()
+
+    debug = info = warning = warn = error = exception = critical = fatal = msg
+
+
+class FastLoggerFactory:
+    """structlog logger factory producing ``FastLogger`` instances sharing one stream lock."""
+
+    def __init__(self, stream: BinaryIO):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def __call__(self, *args: Any) -> FastLogger:
+        return FastLogger(self.stream, self._lock, args[0] if args else "")
+
+
 # ============================================================================
 # Configuration
 # ============================================================================
 
 
-def configure_structlog(testing: bool = False) -> None:
-    """Configure structured logging with JSON or human-readable output format."""
+def configure_structlog(
+    testing: bool = False,
+    *,
+    backend: LogBackend | str = LogBackend.STDLIB,
+    stream: BinaryIO | None = None,
+    queued: bool = False,
+    queue_size: int = DEFAULTS.queue_size,
+    overflow: OverflowPolicy | str = OverflowPolicy.BLOCK,
+    asyncio_mode: bool = False,
+    async_buffer_bytes: int = DEFAULTS.async_buffer_bytes,
+    sampling: SamplingConfig | None = None,
+    flight_recorder: str | os.PathLike[str] | None = None,
+    flight_recorder_size: int = DEFAULTS.flight_recorder_size,
+    levels: Mapping[str, int | str] | None = None,
+    multiprocess: bool = False,
+    log_file: FileSinkConfig | None = None,
+    network: NetworkSinkConfig | None = None,
+    metrics: MetricsConfig | None = None,
+    spans: SpanMode | str = SpanMode.OFF,
+    human_template: str = DEFAULT_HUMAN_TEMPLATE,
+    color: bool = False,
+    value_limits: ValueLimits | None = DEFAULT_VALUE_LIMITS,
+    tail_buffer: TailBufferConfig | None = None,
+    exceptions: ExceptionConfig | None = DEFAULT_EXCEPTION_CONFIG,
+    capture: LogCapture | None = None,
+) -> None:
+    """Configure structured logging with JSON or human-readable output format.
+
+    ``testing=True`` selects the human-readable format laid out by
+    ``human_template`` (see ``HumanReadableFormatter``), with ANSI level colors
+    when ``color`` is set.
+
+    The ``fast`` backend skips stdlib logging and writes bytes directly to
+    ``stream`` (default: stdout's binary buffer) with identical content. The
+    ``binary`` backend writes the compact format of ``src.log_binary`` there
+    instead, whatever ``testing`` says; decode it with ``python -m src.log_binary``.
+    With ``queued=True`` callers only capture the event; rendering and the
+    write happen on a background thread fed by a bounded queue whose
+    ``overflow`` policy decides what happens when it is full.
+
+    ``asyncio_mode=True`` is for code logging from coroutines: the event is
+    still processed and rendered at call time (so each task's bound context is
+    captured), but the line is buffered per event loop and written in batches
+    by a writer thread, so a backpressured stream never stalls the loop. It
+    uses the ``fast`` backend; ``overflow`` applies once a loop has
+    ``async_buffer_bytes`` waiting behind a stalled write. Await
+    ``flush_logs_async`` or ``shutdown_logging_async`` on the way out.
+
+    ``sampling`` installs a ``LogSampler`` as the first processor, so rate
+    limited, sampled and duplicate events are dropped before any other work.
+    ``metrics`` installs a ``MetricsAggregator`` ahead of it that turns matching
+    events into counters and histograms (see ``get_metrics_snapshot``), logs a
+    summary every ``report_interval_s`` and drops the lines of ``suppress`` rules.
+
+    ``flight_recorder`` names a file holding a ``flight_recorder_size`` byte
+    memory-mapped ring buffer that receives every event down to DEBUG in
+    compact form and survives a crash; the output still only carries events at
+    ``LOGGING_LEVEL``. Decode it with ``python -m src.log_flight PATH``.
+
+    ``tail_buffer`` holds events below their logger's threshold in a bounded
+    buffer per ``correlation_id`` instead of dropping them (see ``src.log_tail``).
+    The buffer is discarded by ``complete_request`` and written in order, ahead
+    of the triggering event, when the request logs an ERROR or is passed to
+    ``mark_request_failed``; ``buffered_request`` does both around a block.
+
+    ``levels`` (on top of ``LOGGING_LEVELS``, e.g. ``src.services=DEBUG,src.db=WARNING``)
+    sets thresholds for loggers by name prefix; ``LOGGING_LEVEL`` applies to the
+    rest. They can be changed later with ``set_log_levels`` or
+    ``reload_log_levels_on_signal``.
+
+    ``multiprocess=True`` starts a writer thread that owns ``stream`` (default:
+    stdout's binary buffer) and uses the ``fast`` backend. Worker processes set
+    up with ``init_worker_logging(worker_logging_config())`` render their own
+    lines and send them to it in batches, so lines are never torn or
+    interleaved. Children forked without that initializer are routed there too.
+
+    ``log_file`` writes the output to a ``RotatingFileStream`` instead of
+    ``stream``, using the ``fast`` backend unless ``binary`` is chosen. The file
+    is rotated by size and/or age and closed segments are compressed and pruned
+    on a background thread; ``shutdown_logging`` flushes and fsyncs it.
+
+    ``network`` sends the output to a log collector over a persistent TCP or
+    Unix socket instead (see ``src.log_network``), as NDJSON or length-prefixed
+    frames, using the ``fast`` backend. Lines are batched by size and age on a
+    sender thread that reconnects with backoff and, while the collector is
+    down, spills batches to a bounded ``spill_dir``; ``shutdown_logging`` sends
+    what is left.
+
+    ``exceptions`` controls how ``logger.exception(...)`` and ``exc_info=...``
+    are rendered (see ``src.log_exceptions``): as a structured ``exception``
+    field with depth-limited frames and a stable traceback fingerprint, written
+    as traceback lines in the human-readable format. Repeats of a fingerprint
+    within ``dedup_window_s`` carry only the fingerprint and an occurrence
+    count. ``None`` leaves ``exc_info`` as a plain field.
+
+    ``value_limits`` bounds ``extra`` values before any output renders them
+    (see ``src.log_values``): large strings are cut, arrays, frames and long
+    sequences summarized, and the cut fields listed under ``_truncated``.
+    ``None`` renders every value in full.
+
+    ``capture`` keeps the processed event dicts in a ``LogCapture`` instead of
+    rendering and writing them (see ``src.log_capture``; the ``log_capture``
+    fixture of ``src.log_pytest`` sets it up per test). ``testing`` and
+    ``backend`` do not apply, and nothing is written anywhere.
+
+    ``spans`` turns on the timing spans of ``src.log_spans`` (``span`` and
+    ``@traced``): ``each`` logs every finished span, ``tree`` one aggregated
+    tree per root span. While ``off`` they cost next to nothing.
+    """
+    global _emitter, _sampler, _metrics, _flight_recorder, _levels, _writer, _process_stream, _worker_config
+    global _file_stream, _network_stream, _async_sink, _tail_buffer
+
     # Get logging level from environment with default
     log_level = os.environ.get("LOGGING_LEVEL", DEFAULTS.log_level).upper()
     level = getattr(logging, log_level, logging.INFO)
@@ -183,20 +751,124 @@ def configure_structlog(testing: bool = False) -> None:
     logging.basicConfig(format="%(message)s", level=level, stream=sys.stdout)
     logging.getLogger().setLevel(level)
 
+    # Drain any previous sampler and queue before their loggers are replaced
+    shutdown_logging()
+
+    backend = LogBackend(backend)
+    if capture is not None and (queued or asyncio_mode or multiprocess or log_file is not None or network is not None):
+        raise ValueError(
+            "capture keeps events in memory; queued, asyncio_mode, multiprocess and the sinks do not apply"
+        )
+    if asyncio_mode:
+        if queued:
+            raise ValueError("asyncio_mode and queued are alternative ways to move writes off the caller")
+        if backend is LogBackend.BINARY:
+            raise ValueError("the binary backend encodes in write order and cannot be used with asyncio_mode")
+        backend = LogBackend.FAST
+    if network is not None:
+        if log_file is not None:
+            raise ValueError("log_file and network are alternative sinks")
+        if backend is LogBackend.BINARY:
+            raise ValueError("the binary backend writes no line boundaries and cannot be framed for a network sink")
+        _network_stream = NetworkStream(network)
+        stream = cast(BinaryIO, _network_stream)
+        backend = LogBackend.FAST
+    if log_file is not None:
+        _file_stream = RotatingFileStream(log_file)
+        stream = cast(BinaryIO, _file_stream)
+        if backend is LogBackend.STDLIB:
+            backend = LogBackend.FAST
+    if multiprocess:
+        if backend is LogBackend.BINARY:
+            raise ValueError("the binary backend keeps a string table per stream and cannot be multiprocess")
+        _writer = LogWriter(
+            stream or sys.stdout.buffer, DEFAULTS.process_batch_bytes, DEFAULTS.process_flush_interval_s
+        )
+        _process_stream = _writer.local_stream()
+        stream = cast(BinaryIO, _process_stream)
+        _worker_config = WorkerLogConfig(
+            _writer.channel,
+            testing,
+            DEFAULTS.process_batch_bytes,
+            DEFAULTS.process_flush_interval_s,
+            level,
+            human_template=human_template,
+            color=color,
+            value_limits=value_limits,
+            tail_buffer=tail_buffer,
+            exceptions=exceptions,
+        )
+        backend = LogBackend.FAST
+
     # Build processor pipeline
-    processors = [
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.add_logger_name,
-        structlog.contextvars.merge_contextvars,
-        _process_log_fields,
-        structlog.processors.TimeStamper(fmt="iso"),
-        HumanReadableFormatter() if testing else structlog.processors.JSONRenderer(),
-    ]
+    renderer: Processor
+    logger_factory: Callable[..., WrappedLogger]
+    human = HumanReadableFormatter(template=human_template, color=color) if testing else None
+    if capture is not None:
+        renderer = capture
+        logger_factory = CaptureLoggerFactory()
+    elif backend is LogBackend.FAST:
+        renderer = _BytesRenderer(human) if human is not None else _with_iso_timestamp(FastJSONRenderer())
+        if asyncio_mode:
+            _async_sink = AsyncLogSink(stream or sys.stdout.buffer, async_buffer_bytes, OverflowPolicy(overflow))
+            logger_factory = AsyncLoggerFactory(_async_sink)
+        else:
+            logger_factory = FastLoggerFactory(stream or sys.stdout.buffer)
+    elif backend is LogBackend.BINARY:
+        renderer = defer_rendering  # Encoded by the logger, in write order
+        logger_factory = BinaryLoggerFactory(stream or sys.stdout.buffer, _json_default)
+    else:
+        renderer = human if human is not None else _with_iso_timestamp(structlog.processors.JSONRenderer())
+        logger_factory = structlog.stdlib.LoggerFactory()
+
+    _, thresholds = parse_level_spec(os.environ.get("LOGGING_LEVELS", ""))
+    if _levels is not None:
+        _levels.release_stdlib()
+    _levels = LevelThresholds(
+        level,
+        {**thresholds, **(levels or {})},
+        capture_level=logging.DEBUG if flight_recorder is not None or tail_buffer is not None else logging.CRITICAL,
+        sync_stdlib=True,
+    )
+
+    bound_extra = ValueBounder(value_limits) if value_limits is not None else None
+    render_exception = ExceptionRenderer(exceptions) if exceptions is not None else None
+    processors: list[Processor]
+    if queued:
+        _emitter = QueuedEmitter(renderer, logger_factory, queue_size, OverflowPolicy(overflow))
+        processors = [_build_event_processor(None, bound_extra, render_exception), defer_rendering]
+        logger_factory = QueuedLoggerFactory(_emitter)
+    elif flight_recorder is not None or tail_buffer is not None:
+        processors = [_build_event_processor(None, bound_extra, render_exception), renderer]
+    else:
+        processors = [_build_event_processor(renderer, bound_extra, render_exception)]
+
+    if flight_recorder is not None:
+        _flight_recorder = FlightRecorder(flight_recorder, flight_recorder_size)
+        threshold = _levels.resolve if tail_buffer is None else None
+        processors.insert(1, _record_flight(_flight_recorder, threshold))
+
+    if tail_buffer is not None:
+        # Right before the renderer (or defer_rendering), which also renders the events it releases
+        _tail_buffer = TailBuffer(tail_buffer, _levels.resolve, processors[-1])
+        processors.insert(len(processors) - 1, _tail_buffer)
+
+    if sampling is not None:
+        _sampler = LogSampler(sampling)
+        _sampler.start()
+        processors.insert(0, _sampler)
+
+    if metrics is not None:
+        _metrics = MetricsAggregator(metrics)
+        _metrics.start()
+        processors.insert(0, _metrics)
+
+    configure_spans(spans)
 
     structlog.configure(
-        processors=processors,  # type: ignore[arg-type]
-        logger_factory=structlog.stdlib.LoggerFactory(),
-        wrapper_class=structlog.make_filtering_bound_logger(level),
+        processors=processors,
+        logger_factory=logger_factory,
+        wrapper_class=_levels.wrapper_class,
         cache_logger_on_first_use=True,
     )
 
@@ -208,16 +880,226 @@ def configure_structlog(testing: bool = False) -> None:
 
 def clear_context_fields() -> None:
     """Clear all context variables."""
-    structlog.contextvars.clear_contextvars()
+    _context_snapshot.set(_EMPTY_SNAPSHOT)
 
 
 def bind_context_vars(**kwargs: Any) -> None:
     """Bind context variables for logging."""
-    structlog.contextvars.bind_contextvars(**kwargs)
+    fields = {**_context_snapshot.get().fields, **kwargs}
+    _context_snapshot.set(_make_snapshot(fields, next(_snapshot_versions)))
 
 
 def get_context_vars() -> dict[str, Any]:
-    return structlog.contextvars.get_contextvars()
+    return dict(_context_snapshot.get().fields)
+
+
+def mark_request_failed(correlation_id: str | None = None) -> None:
+    """Write the tail buffer of the request (default: the bound ``correlation_id``) and keep its later events."""
+    if _tail_buffer is not None:
+        _tail_buffer.fail(correlation_id or get_correlation_id())
+
+
+def complete_request(correlation_id: str | None = None) -> None:
+    """Release the tail buffer of the request (default: the bound ``correlation_id``), discarding it unless failed."""
+    if _tail_buffer is not None:
+        _tail_buffer.complete(correlation_id or get_correlation_id())
+
+
+@contextmanager
+def buffered_request(correlation_id: str | None = None) -> Iterator[None]:
+    """Scope a request's tail buffer: written if the block raises, released when it exits."""
+    correlation_id = correlation_id or get_correlation_id()
+    try:
+        yield
+    except BaseException:
+        mark_request_failed(correlation_id)
+        raise
+    finally:
+        complete_request(correlation_id)
+
+
+def flush_logs(timeout: float | None = None) -> bool:
+    """Block until queued log events are written. Returns False on timeout.
+
+    In asyncio mode this writes the calling loop's buffered lines inline;
+    coroutines should await ``flush_logs_async`` instead.
+    """
+    if _async_sink is not None:
+        _async_sink.drain()
+    return _emitter.flush(timeout) if _emitter is not None else True
+
+
+async def flush_logs_async(timeout: float | None = None) -> bool:
+    """Wait, without blocking the event loop, until log events are written. Returns False on timeout."""
+    if _async_sink is not None:
+        try:
+            await asyncio.wait_for(_async_sink.flush(), timeout)
+        except TimeoutError:
+            return False
+    return await asyncio.to_thread(flush_logs, timeout) if _emitter is not None else True
+
+
+def shutdown_logging() -> None:
+    """Report pending metrics and sampler summaries, flush and stop the background writers, then close the sinks.
+
+    The background writers are also flushed at interpreter exit. In multi-process
+    mode call it after the worker processes have exited. Events logged afterwards
+    are written inline (appended unbuffered to a log file) or, for the network
+    sink, counted as dropped.
+    """
+    global _emitter, _sampler, _metrics, _flight_recorder, _writer, _process_stream, _worker_config, _file_stream
+    global _network_stream, _async_sink, _tail_buffer
+
+    _tail_buffer = None  # Requests still in flight did not fail
+    if _metrics is not None:
+        _metrics.close()
+        _metrics = None
+    if _sampler is not None:
+        _sampler.close()
+        _sampler = None
+    if _emitter is not None:
+        _emitter.close()
+        _emitter = None
+    if _async_sink is not None:
+        _async_sink.close()
+        _async_sink = None
+    if _process_stream is not None:
+        _process_stream.close()
+        _process_stream = None
+    if _writer is not None:
+        _writer.close()
+        _writer = None
+        _worker_config = None
+    if _file_stream is not None:
+        _file_stream.close()
+        _file_stream = None
+    if _network_stream is not None:
+        _network_stream.close()
+        _network_stream = None
+    if _flight_recorder is not None:
+        _flight_recorder.close()
+        _flight_recorder = None
+
+
+async def shutdown_logging_async() -> None:
+    """Flush this event loop's buffered lines, then run ``shutdown_logging`` off the loop (e.g. in a lifespan hook)."""
+    if _async_sink is not None:
+        await _async_sink.flush()
+    await asyncio.to_thread(shutdown_logging)
+
+
+def set_log_levels(
+    levels: Mapping[str, int | str | None] | None = None,
+    *,
+    default: int | str | None = None,
+    replace: bool = False,
+) -> None:
+    """Change level thresholds at runtime, including for loggers already in use.
+
+    ``levels`` maps logger name prefixes to levels (None removes a prefix);
+    ``default`` replaces the ``LOGGING_LEVEL`` threshold.
+    """
+    if _levels is None:
+        raise RuntimeError("configure_structlog() must be called before set_log_levels()")
+    _levels.update(default, levels, replace=replace)
+
+
+def get_log_level(name: str) -> int:
+    """Threshold currently applied to the logger called ``name``."""
+    if _levels is None:
+        raise RuntimeError("configure_structlog() must be called before get_log_level()")
+    return _levels.resolve(name)
+
+
+def reload_log_levels_on_signal(path: str | os.PathLike[str], signum: int = signal.SIGUSR1) -> None:
+    """Re-read thresholds from ``path`` whenever ``signum`` arrives (e.g. ``kill -USR1 <pid>``).
+
+    The file uses the ``LOGGING_LEVELS`` syntax, one entry per line or comma
+    separated; a bare level replaces the default and prefixes missing from the
+    file go back to the default.
+    """
+
+    def reload() -> None:
+        logger = get_logger(__name__)
+        try:
+            with open(path) as file:
+                default, thresholds = parse_level_spec(file.read())
+            set_log_levels(thresholds, default=default, replace=True)
+        except (OSError, ValueError) as e:
+            logger.error("Failed to reload log levels", path=str(path), error=str(e))
+        else:
+            logger.info("Log levels reloaded", path=str(path))
+
+    # Reload off the interrupted frame, which may be holding a writer lock
+    signal.signal(signum, lambda *_: threading.Thread(target=reload, name="log-levels-reload", daemon=True).start())
+
+
+def worker_logging_config() -> WorkerLogConfig:
+    """Settings for ``init_worker_logging`` in worker processes, with the context bound right now.
+
+    Pass it as ``initializer=init_worker_logging, initargs=(worker_logging_config(),)``
+    to ``ProcessPoolExecutor`` or ``multiprocessing.Pool``.
+    """
+    if _worker_config is None or _levels is None:
+        raise RuntimeError("configure_structlog(multiprocess=True) must be called before worker_logging_config()")
+    return replace(_worker_config, default_level=_levels.default, levels=_levels.thresholds, context=get_context_vars())
+
+
+def init_worker_logging(config: WorkerLogConfig) -> None:
+    """Configure logging in a worker process to send its lines to the parent's writer."""
+    global _process_stream
+
+    stream = ChannelStream(config.channel, config.batch_bytes, config.flush_interval_s)
+    configure_structlog(
+        config.testing,
+        backend=LogBackend.FAST,
+        stream=cast(BinaryIO, stream),
+        human_template=config.human_template or DEFAULT_HUMAN_TEMPLATE,
+        color=config.color,
+        value_limits=config.value_limits,
+        tail_buffer=config.tail_buffer,
+        exceptions=config.exceptions,
+    )
+    _process_stream = stream
+    set_log_levels(config.levels, default=config.default_level, replace=True)
+    clear_context_fields()
+    bind_context_vars(**config.context)
+
+
+def propagate_log_context(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap ``fn`` for submission to a worker so it runs with the context bound at submit time."""
+    return functools.partial(_run_with_log_context, get_context_vars(), fn)
+
+
+def _run_with_log_context(fields: dict[str, Any], fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    token = _context_snapshot.set(_make_snapshot(fields, next(_snapshot_versions)))
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        _context_snapshot.reset(token)
+
+
+def get_metrics_snapshot() -> dict[str, dict[str, Any]]:
+    """Cumulative counters and histograms of the configured metrics (empty when none are configured)."""
+    return _metrics.snapshot() if _metrics is not None else {}
+
+
+def get_tail_buffer_stats() -> dict[str, int]:
+    """Event counts by outcome and memory held by the tail buffer (empty when it is disabled)."""
+    return _tail_buffer.stats() if _tail_buffer is not None else {}
+
+
+def get_network_sink_stats() -> dict[str, Any]:
+    """Connection state, sent, pending and spilled bytes and dropped lines of the network sink (empty when off)."""
+    return _network_stream.stats() if _network_stream is not None else {}
+
+
+def get_dropped_log_count() -> int:
+    """Number of events discarded by the queue, asyncio buffer or network sink overflow policy since configuration."""
+    dropped = _network_stream.dropped if _network_stream is not None else 0
+    if _async_sink is not None:
+        return dropped + _async_sink.dropped
+    return dropped + (_emitter.dropped if _emitter is not None else 0)
 
 
 def get_logger(name: str = "") -> structlog.stdlib.BoundLogger:
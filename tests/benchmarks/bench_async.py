@@ -0,0 +1,96 @@
+"""Event-loop lag under a backpressured stdout pipe: direct writes vs queued vs asyncio mode.
+
+Request coroutines log at a steady rate into a real pipe whose reader stalls
+for ``STALL_S`` every ``STALL_EVERY_S`` (a slow log shipper), while a ticker
+coroutine measures how late each 1 ms sleep wakes up.
+
+Run with: python -m tests.benchmarks.bench_async
+"""
+
+import asyncio
+import os
+import threading
+import time
+from typing import Any
+
+from src.logging import bind_context_vars, configure_structlog, get_logger, shutdown_logging, shutdown_logging_async
+from tests.benchmarks.harness import percentile, print_table
+
+DURATION_S = 2.0
+REQUESTS = 50
+REQUEST_INTERVAL_S = 0.005
+TICK_S = 0.001
+STALL_EVERY_S = 0.5
+STALL_S = 0.1
+
+
+def slow_reader(fd: int, stop: threading.Event) -> None:
+    next_stall = time.monotonic() + STALL_EVERY_S
+    while True:
+        if time.monotonic() >= next_stall:
+            time.sleep(STALL_S)
+            next_stall = time.monotonic() + STALL_EVERY_S
+        if not os.read(fd, 1 << 16) and stop.is_set():
+            return
+
+
+async def request_loop(request: int, deadline: float, counter: list[int]) -> None:
+    logger = get_logger("src.api")
+    bind_context_vars(correlation_id=f"req-{request}")
+    while time.monotonic() < deadline:
+        logger.info("Request handled", status=200, path="/api/chat", duration_ms=12.5)
+        counter[0] += 1
+        await asyncio.sleep(REQUEST_INTERVAL_S)
+
+
+async def ticker(deadline: float) -> list[int]:
+    lags = []
+    while time.monotonic() < deadline:
+        start = time.perf_counter_ns()
+        await asyncio.sleep(TICK_S)
+        lags.append(time.perf_counter_ns() - start - int(TICK_S * 1e9))
+    return lags
+
+
+async def run_load(asyncio_mode: bool) -> tuple[list[int], int]:
+    deadline = time.monotonic() + DURATION_S
+    counter = [0]
+    requests = [request_loop(request, deadline, counter) for request in range(REQUESTS)]
+    lags, *_ = await asyncio.gather(ticker(deadline), *requests)
+    if asyncio_mode:
+        await shutdown_logging_async()
+    return lags, counter[0]
+
+
+def run(name: str, **config: Any) -> list[object]:
+    read_fd, write_fd = os.pipe()
+    stop = threading.Event()
+    reader = threading.Thread(target=slow_reader, args=(read_fd, stop), daemon=True)
+    reader.start()
+    with open(write_fd, "wb") as stream:
+        configure_structlog(backend="fast", stream=stream, **config)
+        lags, lines = asyncio.run(run_load(config.get("asyncio_mode", False)))
+        shutdown_logging()
+    stop.set()
+    reader.join()
+    os.close(read_fd)
+    ms = [f"{percentile(lags, pct) / 1e6:,.2f}" for pct in (50, 99)]
+    stalled = sum(lag > 10_000_000 for lag in lags)
+    return [name, f"{lines / DURATION_S:,.0f}", *ms, f"{max(lags) / 1e6:,.1f}", stalled]
+
+
+def main() -> None:
+    rows = [
+        run("direct writes (fast backend)"),
+        run("queued=True (writer thread)", queued=True),
+        run("asyncio_mode=True", asyncio_mode=True),
+    ]
+    print(
+        f"{REQUESTS} request coroutines, one line every {REQUEST_INTERVAL_S * 1000:.0f} ms each; "
+        f"pipe reader stalls {STALL_S * 1000:.0f} ms every {STALL_EVERY_S * 1000:.0f} ms"
+    )
+    print_table(["mode", "lines/s", "loop lag p50 ms", "p99 ms", "max ms", "ticks late > 10 ms"], rows)
+
+
+if __name__ == "__main__":
+    main()
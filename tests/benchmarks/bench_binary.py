@@ -0,0 +1,120 @@
+"""Size and encode speed of the binary log format vs JSON lines.
+
+Run with: python -m tests.benchmarks.bench_binary
+"""
+
+import gzip
+import io
+import os
+import random
+import time
+from typing import Any, Callable
+
+from src.log_binary import BinaryEncoder, read_binary_events
+from src.logging import (
+    FastJSONRenderer,
+    _build_event_processor,
+    _json_default,
+    _with_iso_timestamp,
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    shutdown_logging,
+)
+from tests.benchmarks.harness import print_table
+
+EVENTS = 50_000
+LOGGERS = ["src.api.chat", "src.api.search", "src.services.billing", "src.db.pool"]
+MESSAGES = ["Request received", "Cache lookup", "Query executed", "Request handled", "Upstream call failed"]
+
+
+class NamedLogger:
+    def __init__(self, name: str):
+        self.name = name
+
+
+def sample_events() -> list[dict[str, Any]]:
+    """Processed event dicts of a request-shaped workload: 10 lines per correlation ID."""
+    rng = random.Random(42)
+    process = _build_event_processor()
+    events = []
+    for i in range(EVENTS):
+        if i % 10 == 0:
+            clear_context_fields()
+            bind_context_vars(correlation_id=f"req-{rng.getrandbits(64):016x}", user_id=f"user-{rng.randrange(500)}")
+        fields = {"status": rng.choice([200, 200, 200, 404, 500]), "duration_ms": round(rng.uniform(1, 900), 3)}
+        if i % 7 == 0:
+            fields["query"] = f"SELECT * FROM items WHERE id = {rng.randrange(10**6)}"
+        logger = NamedLogger(rng.choice(LOGGERS))
+        events.append(process(logger, "info", {"event": rng.choice(MESSAGES), **fields}))
+    clear_context_fields()
+    return events
+
+
+def ns_per_event(encode: Callable[[dict[str, Any]], bytes], events: list[dict[str, Any]]) -> float:
+    copies = [dict(event) for event in events]  # The ISO wrapper replaces the timestamp in place
+    start = time.perf_counter_ns()
+    for event in copies:
+        encode(event)
+    return (time.perf_counter_ns() - start) / len(copies)
+
+
+def end_to_end_ns(backend: str) -> float:
+    with open(os.devnull, "wb") as devnull:
+        configure_structlog(backend=backend, stream=devnull)
+        bind_context_vars(correlation_id="req-0123456789abcdef", user_id="user-42")
+        logger = get_logger("src.api.chat")
+        start = time.perf_counter_ns()
+        for i in range(EVENTS):
+            logger.info("Request handled", status=200, duration_ms=12.5, index=i)
+        elapsed = time.perf_counter_ns() - start
+        shutdown_logging()
+    clear_context_fields()
+    return elapsed / EVENTS
+
+
+def main() -> None:
+    events = sample_events()
+
+    json_render = _with_iso_timestamp(FastJSONRenderer())
+    json_data = b"".join(json_render(None, "info", dict(event)) + b"\n" for event in events)
+    encoder = BinaryEncoder(_json_default)
+    binary_data = b"".join(encoder.encode(event) for event in events)
+    assert list(read_binary_events(io.BytesIO(binary_data))) == events
+
+    json_ns = ns_per_event(lambda event: json_render(None, "info", event), events)
+    binary_ns = ns_per_event(BinaryEncoder(_json_default).encode, events)
+
+    start = time.perf_counter_ns()
+    for _ in read_binary_events(io.BytesIO(binary_data)):
+        pass
+    decode_ns = (time.perf_counter_ns() - start) / EVENTS
+
+    print(f"{EVENTS} request-shaped events, 10 per correlation ID")
+    print_table(
+        ["format", "bytes/event", "gzip bytes/event", "encode ns/event", "end-to-end ns/event"],
+        [
+            [
+                "json",
+                f"{len(json_data) / EVENTS:.0f}",
+                f"{len(gzip.compress(json_data)) / EVENTS:.0f}",
+                f"{json_ns:,.0f}",
+                f"{end_to_end_ns('fast'):,.0f}",
+            ],
+            [
+                "binary",
+                f"{len(binary_data) / EVENTS:.0f}",
+                f"{len(gzip.compress(binary_data)) / EVENTS:.0f}",
+                f"{binary_ns:,.0f}",
+                f"{end_to_end_ns('binary'):,.0f}",
+            ],
+        ],
+    )
+    print(
+        f"Binary is {len(binary_data) / len(json_data):.0%} of the JSON size; decoding takes {decode_ns:,.0f} ns/event"
+    )
+
+
+if __name__ == "__main__":
+    main()
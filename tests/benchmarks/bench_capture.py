@@ -0,0 +1,92 @@
+"""Cost of asserting on logged events: caplog-style JSON round trip vs in-memory capture.
+
+Each scenario logs ``EVENTS`` events and reads every one back as a dict, the
+way a test asserting on logging does. "caplog + json.loads" renders JSON
+through stdlib logging into a record-keeping handler (what pytest's ``caplog``
+does) and parses each message back, as ``parse_log_json`` in
+``tests/test_logging.py``; "capture" is ``configure_structlog(capture=...)``
+queried with ``LogCapture.events``.
+
+Run with: python -m tests.benchmarks.bench_capture
+"""
+
+import json
+import logging
+import time
+from typing import Any
+
+from src.log_capture import LogCapture
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import NullStream, install_root_stream, print_table
+
+EVENTS = 20_000
+ROUNDS = 3
+
+
+class RecordingHandler(logging.Handler):
+    """Keeps every record, like pytest's ``LogCaptureHandler``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        self.records.append(record)
+
+
+def log_events() -> None:
+    logger = get_logger("src.api")
+    bind_context_vars(correlation_id="req-1")
+    for i in range(EVENTS):
+        logger.info("Request handled", index=i, status=200, path="/api/chat")
+    clear_context_fields()
+
+
+def caplog_round_trip() -> tuple[float, float]:
+    install_root_stream(NullStream())
+    configure_structlog()
+    handler = RecordingHandler()
+    logging.getLogger().addHandler(handler)
+
+    start = time.perf_counter()
+    log_events()
+    logged = time.perf_counter()
+    events = [json.loads(record.getMessage()) for record in handler.records]
+    read = time.perf_counter()
+
+    assert len(events) == EVENTS
+    logging.getLogger().removeHandler(handler)
+    shutdown_logging()
+    return (logged - start) / EVENTS * 1e6, (read - logged) / EVENTS * 1e6
+
+
+def capture() -> tuple[float, float]:
+    log_capture = LogCapture()
+    configure_structlog(capture=log_capture)
+
+    start = time.perf_counter()
+    log_events()
+    logged = time.perf_counter()
+    events = log_capture.events(correlation_id="req-1")
+    read = time.perf_counter()
+
+    assert len(events) == EVENTS
+    shutdown_logging()
+    return (logged - start) / EVENTS * 1e6, (read - logged) / EVENTS * 1e6
+
+
+def main() -> None:
+    rows: list[list[Any]] = []
+    for name, scenario in (("caplog + json.loads", caplog_round_trip), ("capture", capture)):
+        runs = [scenario() for _ in range(ROUNDS)]
+        log_us = min(us for us, _ in runs)
+        read_us = min(us for _, us in runs)
+        rows.append([name, f"{log_us:.2f}", f"{read_us:.2f}", f"{log_us + read_us:.2f}"])
+
+    print(f"{EVENTS} events logged and read back as dicts; best of {ROUNDS}")
+    print_table(["mode", "log µs/event", "read µs/event", "total µs/event"], rows)
+
+
+if __name__ == "__main__":
+    main()
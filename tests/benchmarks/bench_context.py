@@ -0,0 +1,53 @@
+"""Cost of reading the bound context per log call: per-key contextvars scan vs snapshot.
+
+Run with: python -m tests.benchmarks.bench_context
+"""
+
+import structlog
+
+from src.logging import _build_event_processor, bind_context_vars, clear_context_fields, get_correlation_id
+from tests.benchmarks.harness import ns_per_op, print_table
+
+ITERATIONS = 50_000
+
+
+class BenchLogger:
+    name = "src.services.bench"
+
+
+def scan_correlation_id() -> str:
+    """How get_correlation_id read the context before snapshots."""
+    return str(structlog.contextvars.get_contextvars().get("correlation_id", "unknown"))
+
+
+def main() -> None:
+    logger = BenchLogger()
+    process = _build_event_processor()
+
+    rows = []
+    for bound in (0, 5, 50):
+        clear_context_fields()
+        structlog.contextvars.clear_contextvars()
+        fields = {"correlation_id": "bench-id", **{f"field_{i}": i for i in range(max(0, bound - 1))}}
+        if bound:
+            bind_context_vars(**fields)
+            structlog.contextvars.bind_contextvars(**fields)
+
+        scan = ns_per_op(scan_correlation_id, ITERATIONS)
+        snapshot = ns_per_op(get_correlation_id, ITERATIONS)
+        merge = ns_per_op(
+            lambda: structlog.contextvars.merge_contextvars(logger, "info", {"event": "x", "status": 200}),
+            ITERATIONS,
+        )
+        fused = ns_per_op(lambda: process(logger, "info", {"event": "x", "status": 200}), ITERATIONS)
+        rows.append([bound, f"{scan:,.0f}", f"{snapshot:,.0f}", f"{merge:,.0f}", f"{fused:,.0f}"])
+
+    print("ns per call")
+    print_table(
+        ["bound vars", "scan correlation id", "snapshot correlation id", "merge_contextvars", "fused processor"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
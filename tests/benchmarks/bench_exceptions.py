@@ -0,0 +1,72 @@
+"""Cost of logging the same exception in a retry storm: traceback text vs structured vs deduplicated.
+
+Every event logs the same failure raised ``DEPTH`` frames deep, as a retry loop
+hitting a dead dependency would. "traceback text" formats the whole traceback
+per event (what a ``format_exc_info`` stage does); the structured renderings
+use ``src.log_exceptions`` with the dedup window off and on.
+
+Run with: python -m tests.benchmarks.bench_exceptions
+"""
+
+import traceback
+from typing import Any
+
+from src.log_exceptions import ExceptionConfig
+from src.logging import configure_structlog, get_logger
+from tests.benchmarks.harness import CountingStream, ns_per_op, print_table
+
+ITERATIONS = 2_000
+DEPTH = 30
+ROUNDS = 3
+
+
+def call_dependency(depth: int) -> None:
+    if depth == 0:
+        raise ConnectionError("upstream refused connection to db-primary:5432")
+    call_dependency(depth - 1)
+
+
+def measure(mode: str) -> tuple[float, float]:
+    stream = CountingStream()
+    if mode == "traceback text":
+        configure_structlog(backend="fast", stream=stream, exceptions=None)
+    else:
+        window = 60.0 if mode == "structured, deduplicated" else 0.0
+        configure_structlog(backend="fast", stream=stream, exceptions=ExceptionConfig(dedup_window_s=window))
+    logger = get_logger("src.bench.exceptions")
+
+    def log_failure() -> None:
+        try:
+            call_dependency(DEPTH)
+        except ConnectionError as e:
+            if mode == "traceback text":
+                logger.error("Query failed", exception="".join(traceback.format_exception(e)))
+            else:
+                logger.exception("Query failed")
+
+    def raise_only() -> None:
+        try:
+            call_dependency(DEPTH)
+        except ConnectionError:
+            pass
+
+    log_failure()  # The first occurrence is rendered in full in every mode
+    raise_cost = min(ns_per_op(raise_only, ITERATIONS) for _ in range(ROUNDS))
+    best = min(ns_per_op(log_failure, ITERATIONS) for _ in range(ROUNDS))
+    stream.written = 0
+    log_failure()
+    return (best - raise_cost) / 1000, stream.written
+
+
+def main() -> None:
+    rows: list[list[Any]] = []
+    for mode in ("traceback text", "structured, every time", "structured, deduplicated"):
+        us, line_bytes = measure(mode)
+        rows.append([mode, f"{us:.1f}", f"{line_bytes:,.0f}"])
+
+    print(f"{ITERATIONS} repeats of one exception raised {DEPTH} frames deep (raise cost excluded); best of {ROUNDS}")
+    print_table(["rendering", "µs/event", "bytes/line"], rows)
+
+
+if __name__ == "__main__":
+    main()
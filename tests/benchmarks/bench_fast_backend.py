@@ -0,0 +1,48 @@
+"""Throughput of the stdlib backend vs the bytes-native fast backend.
+
+Run with: python -m tests.benchmarks.bench_fast_backend
+"""
+
+import os
+import time
+from typing import Any
+
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, get_logger
+from tests.benchmarks.harness import NullStream, install_root_stream, print_table
+
+ITERATIONS = 50_000
+
+
+def lines_per_second(**config: Any) -> float:
+    configure_structlog(**config)
+    logger = get_logger("src.bench.fast")
+
+    start = time.perf_counter()
+    for i in range(ITERATIONS):
+        logger.info("Request handled", index=i, status=200, path="/api/chat")
+    return ITERATIONS / (time.perf_counter() - start)
+
+
+def main() -> None:
+    install_root_stream(NullStream())
+    bind_context_vars(correlation_id="bench-correlation-id", user_id="user-123")
+
+    with open(os.devnull, "wb") as devnull:
+        stdlib_rate = lines_per_second(backend="stdlib")
+        fast_rate = lines_per_second(backend="fast", stream=devnull)
+        stdlib_human = lines_per_second(testing=True, backend="stdlib")
+        fast_human = lines_per_second(testing=True, backend="fast", stream=devnull)
+    clear_context_fields()
+
+    print(f"{ITERATIONS} info() calls, output discarded")
+    print_table(
+        ["format", "stdlib lines/s", "fast lines/s", "speedup"],
+        [
+            ["json", f"{stdlib_rate:,.0f}", f"{fast_rate:,.0f}", f"{fast_rate / stdlib_rate:.2f}x"],
+            ["human", f"{stdlib_human:,.0f}", f"{fast_human:,.0f}", f"{fast_human / stdlib_human:.2f}x"],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Sustained throughput of the rotating file sink with background compression.
+
+The baseline is stdlib ``RotatingFileHandler`` behind the default stdlib
+backend, gzipping each closed file in its rotator, i.e. on the thread that
+happened to log the line that filled it; the max latency column shows that
+stall. The sink rows use the fast backend the file sink selects.
+
+Run with: python -m tests.benchmarks.bench_file_sink
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from src.log_files import FileSinkConfig
+from src.logging import configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import measure_latencies, percentile, print_table
+
+LINES = 200_000
+MAX_BYTES = 8 * 1024 * 1024
+
+
+def gzip_rotator(source: str, dest: str) -> None:
+    with open(source, "rb") as plain, gzip.open(dest, "wb", compresslevel=6) as packed:
+        shutil.copyfileobj(plain, packed, 1024 * 1024)
+    os.remove(source)
+
+
+def install_stdlib_handler(path: Path) -> logging.Handler:
+    handler = logging.handlers.RotatingFileHandler(path, maxBytes=MAX_BYTES, backupCount=10)
+    handler.namer = lambda name: name + ".gz"
+    handler.rotator = gzip_rotator
+    logging.basicConfig(format="%(message)s", handlers=[handler], force=True)
+    return handler
+
+
+def run(label: str, directory: Path, compression: str | None) -> list[object]:
+    path = directory / label / "app.log"
+    if compression is None:
+        path.parent.mkdir()
+        handler = install_stdlib_handler(path)
+        configure_structlog()
+        logging.getLogger().handlers = [handler]  # basicConfig in configure_structlog keeps the existing handler
+    else:
+        configure_structlog(log_file=FileSinkConfig(path, max_bytes=MAX_BYTES, compression=compression))
+    logger = get_logger("bench.file")
+
+    start = time.perf_counter()
+    samples = measure_latencies(lambda i: logger.info("Request handled", index=i, status=200, path="/api/chat"), LINES)
+    logging_s = time.perf_counter() - start
+    shutdown_logging()  # Flushes the file and waits for pending compressions
+    if compression is None:
+        logging.getLogger().handlers[0].close()
+    total_s = time.perf_counter() - start
+
+    files = sorted(path.parent.iterdir())
+    size = sum(file.stat().st_size for file in files)
+    p50, p99, worst = (f"{ns / 1000:.1f}" for ns in (percentile(samples, 50), percentile(samples, 99), max(samples)))
+    return [label, f"{LINES / logging_s:,.0f}", f"{LINES / total_s:,.0f}", p50, p99, worst, len(files), f"{size >> 20}"]
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        rows = [
+            run("stdlib-inline-gzip", Path(directory), None),
+            run("sink-none", Path(directory), "none"),
+            run("sink-gzip", Path(directory), "gzip"),
+            run("sink-lzma", Path(directory), "lzma"),
+        ]
+    print(f"{LINES} info() calls to a file rotated every {MAX_BYTES >> 20} MiB")
+    print_table(["sink", "lines/s", "lines/s incl. drain", "p50 us", "p99 us", "max us", "files", "MiB on disk"], rows)
+
+
+if __name__ == "__main__":
+    main()
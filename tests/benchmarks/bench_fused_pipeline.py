@@ -0,0 +1,89 @@
+"""Per-event cost of the chained processors vs the fused processor.
+
+The fused processor keeps the timestamp as epoch nanoseconds and leaves the
+ISO text to the renderer; the fused scenarios format it the way
+``configure_structlog`` does (``_with_iso_timestamp``), so every scenario
+produces what the chain's ``TimeStamper(fmt="iso")`` produces.
+
+Run with: python -m tests.benchmarks.bench_fused_pipeline
+"""
+
+import json
+from typing import Any
+
+import structlog
+
+from src.logging import (
+    FastJSONRenderer,
+    _build_event_processor,
+    _process_log_fields,
+    _with_iso_timestamp,
+    bind_context_vars,
+)
+from tests.benchmarks.harness import ns_per_op, peak_bytes_per_call, print_table
+
+ITERATIONS = 50_000
+ALLOCATION_ITERATIONS = 2_000
+
+
+class BenchLogger:
+    name = "src.services.bench"
+
+
+def pipeline(processors: list[Any]) -> Any:
+    logger = BenchLogger()
+
+    def call() -> Any:
+        event_dict: Any = {"user_id": "user-123", "status": 200, "path": "/api/chat", "event": "Request handled"}
+        for processor in processors:
+            event_dict = processor(logger, "info", event_dict)
+        return event_dict
+
+    return call
+
+
+def keep_event(_: Any, __: str, event_dict: Any) -> Any:
+    return event_dict
+
+
+def main() -> None:
+    context = {"correlation_id": "bench-correlation-id", "tenant": "acme", "region": "eu", "plan": "pro", "shard": 7}
+    bind_context_vars(**context)
+    # The unfused chain reads structlog's own per-key context variables
+    structlog.contextvars.bind_contextvars(**context)
+
+    chain = [
+        structlog.stdlib.add_log_level,
+        structlog.stdlib.add_logger_name,
+        structlog.contextvars.merge_contextvars,
+        _process_log_fields,
+        structlog.processors.TimeStamper(fmt="iso"),
+    ]
+    scenarios = {
+        "chain (processing only)": pipeline(chain),
+        "fused (processing only)": pipeline([_build_event_processor(_with_iso_timestamp(keep_event))]),
+        "chain + JSONRenderer": pipeline([*chain, structlog.processors.JSONRenderer()]),
+        "fused + JSONRenderer": pipeline(
+            [_build_event_processor(_with_iso_timestamp(structlog.processors.JSONRenderer()))]
+        ),
+        "fused + FastJSONRenderer": pipeline([_build_event_processor(_with_iso_timestamp(FastJSONRenderer()))]),
+    }
+
+    # Same work: identical events, timestamps included as ISO text
+    events = [scenario() for scenario in scenarios.values()]
+    events = [json.loads(event) if isinstance(event, (str, bytes)) else event for event in events]
+    assert all(isinstance(event.pop("timestamp"), str) for event in events)
+    assert all(event == events[0] for event in events)
+
+    rows = []
+    for name, call in scenarios.items():
+        ns = ns_per_op(call, ITERATIONS)
+        peak = peak_bytes_per_call(call, ALLOCATION_ITERATIONS)
+        rows.append([name, f"{ns:,.0f}", f"{peak:,.0f}"])
+
+    print("5 bound context vars, 3 call-site fields")
+    print_table(["pipeline", "ns/op", "peak bytes/op"], rows)
+
+
+if __name__ == "__main__":
+    main()
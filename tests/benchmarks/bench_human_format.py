@@ -0,0 +1,61 @@
+"""Per-event cost of human-readable formatting: per-call helpers vs the compiled template.
+
+The reference assembles the line the way the formatter used to, calling its
+helpers for every event (logger name shortening, per-value truncation).
+
+Run with: python -m tests.benchmarks.bench_human_format
+"""
+
+from typing import Any
+
+from src.logging import HumanReadableFormatter
+from tests.benchmarks.harness import ns_per_op, print_table
+
+ITERATIONS = 100_000
+REPEATS = 5  # Best of, to ride out noise on shared hosts
+
+EVENT: dict[str, Any] = {
+    "level": "info",
+    "logger": "src.services.chat.handler",
+    "message": "Request handled",
+    "context": "chat",
+    "timestamp": 1_760_000_000_123_456_789,
+    "extra": {"status": 200, "path": "/api/chat", "duration_ms": 12.5, "correlation_id": "req-0123456789abcdef"},
+}
+
+
+def reference(formatter: HumanReadableFormatter, event_dict: dict[str, Any]) -> str:
+    level = event_dict.get("level", "info").upper()
+    logger_name = formatter.format_logger_name(event_dict.get("logger", ""))
+    message = event_dict.get("message", "")
+    extra = event_dict.get("extra", {})
+    time_str = formatter.format_timestamp(event_dict.get("timestamp", ""))
+    extra_str = formatter.format_extra_fields(extra)
+    corr_str = formatter.format_correlation_id(extra.get("correlation_id", ""))
+    return f"{time_str} [{level}] {logger_name}: {message}{extra_str}{corr_str}"
+
+
+def main() -> None:
+    default = HumanReadableFormatter()
+    colored = HumanReadableFormatter(color=True)
+    short = HumanReadableFormatter(template="{time} {level:5} {logger}: {message}")
+    assert default(None, "info", EVENT) == reference(default, EVENT)
+
+    scenarios = {
+        "per-call helpers (previous)": lambda: reference(default, EVENT),
+        "compiled default template": lambda: default(None, "info", EVENT),
+        "compiled, colored": lambda: colored(None, "info", EVENT),
+        "compiled {time} {level:5} {logger}: {message}": lambda: short(None, "info", EVENT),
+    }
+    timings = {name: min(ns_per_op(call, ITERATIONS) for _ in range(REPEATS)) for name, call in scenarios.items()}
+    baseline = timings["per-call helpers (previous)"]
+    rows = []
+    for name, ns in timings.items():
+        rows.append([name, f"{ns:,.0f}", f"{baseline / ns:.2f}x"])
+
+    print("4 extra fields, raw nanosecond timestamp")
+    print_table(["formatter", "ns/event", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
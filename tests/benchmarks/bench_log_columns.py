@@ -0,0 +1,80 @@
+"""Loading a JSON log file for analysis: per-line ``json.loads`` vs the columnar loader.
+
+The file is written by ``configure_structlog(backend="fast")`` with no bound
+``context``, so the lines have the key order production logs have.
+
+Run with: python -m tests.benchmarks.bench_log_columns
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from src.log_columns import load_log_columns
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import peak_bytes_per_call, print_table
+
+LINES = 200_000
+EXTRA = {"status": "int64", "duration_ms": "float64", "path": "category"}
+
+
+def write_lines(path: Path) -> None:
+    with open(path, "wb") as stream:
+        configure_structlog(backend="fast", stream=stream)
+        loggers = [get_logger(f"src.services.{name}") for name in ("chat", "search", "auth")]
+        for i in range(LINES):
+            bind_context_vars(correlation_id=f"req-{i}")
+            log = loggers[i % 3].warning if i % 50 == 0 else loggers[i % 3].info
+            log("Request handled", status=200 + i % 7, path=f"/api/{i % 40}", duration_ms=i % 1000 / 8)
+        shutdown_logging()
+    clear_context_fields()
+
+
+def per_line(path: Path) -> list[dict[str, Any]]:
+    with open(path, "rb") as stream:
+        return [json.loads(line) for line in stream]
+
+
+def seconds(fn: Callable[[], object], repeats: int = 3) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    workers = os.cpu_count() or 1
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "app.log"
+        write_lines(path)
+        size_mb = path.stat().st_size / 2**20
+
+        scenarios: dict[str, Callable[[], object]] = {
+            "json.loads per line (previous)": lambda: per_line(path),
+            "columns, 1 process": lambda: load_log_columns(path, EXTRA, workers=1, cache=False),
+        }
+        if workers > 1:
+            scenarios[f"columns, {workers} processes"] = lambda: load_log_columns(path, EXTRA, cache=False)
+        timings = {name: seconds(fn) for name, fn in scenarios.items()}
+        memory = {name: peak_bytes_per_call(fn, 1) for name, fn in list(scenarios.items())[:2]}
+
+        load_log_columns(path, EXTRA)
+        timings["columns, cached (memory-mapped)"] = seconds(lambda: load_log_columns(path, EXTRA), repeats=10)
+
+        baseline = timings["json.loads per line (previous)"]
+        rows = []
+        for name, elapsed in timings.items():
+            peak = f"{memory[name] / 2**20:,.0f}" if name in memory else "-"
+            rows.append([name, f"{elapsed * 1000:,.1f}", f"{baseline / elapsed:,.1f}x", peak])
+
+    print(f"{LINES:,} lines ({size_mb:,.0f} MiB), 3 extra columns, {workers} CPUs")
+    print_table(["loader", "ms", "speedup", "peak MiB"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Fetching one request's lines: full scan vs building, extending and querying the index.
+
+Run with: python -m tests.benchmarks.bench_log_index
+"""
+
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, TypeVar
+
+from src.log_index import LogIndex
+from tests.benchmarks.harness import print_table
+
+LINES = 200_000
+REQUESTS = 20_000
+APPENDED = 1_000
+REPEATS = 5  # Best of, to ride out noise on shared hosts
+
+T = TypeVar("T")
+
+
+def write_lines(path: Path, start: int, count: int) -> None:
+    with open(path, "ab") as stream:
+        for i in range(start, start + count):
+            event = {
+                "level": "info",
+                "logger": "src.api",
+                "message": "Request step",
+                "timestamp": f"2026-01-01T00:{i // 60_000 % 60:02d}:{i // 1000 % 60:02d}.{i % 1000:03d}000Z",
+                "extra": {"step": i, "path": "/api/chat", "correlation_id": f"req-{i % REQUESTS}"},
+            }
+            stream.write(json.dumps(event).encode() + b"\n")
+
+
+def full_scan(path: Path, correlation_id: str) -> list[bytes]:
+    needle = f'"correlation_id": "{correlation_id}"'.encode()
+    with open(path, "rb") as stream:
+        return [line for line in stream if needle in line]
+
+
+def best_ms(fn: Callable[[], T], repeats: int = REPEATS) -> tuple[float, T]:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        result = fn()
+        timings.append((time.perf_counter_ns() - start) / 1e6)
+    return min(timings), result
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "app.log"
+        write_lines(path, 0, LINES)
+        target = "req-12345"
+
+        scan_ms, scanned = best_ms(lambda: full_scan(path, target))
+
+        def build() -> int:
+            Path(f"{path}.cidx").unlink(missing_ok=True)
+            return LogIndex(path).update()
+
+        build_ms, _ = best_ms(build, repeats=3)
+        noop_ms, _ = best_ms(lambda: LogIndex(path).update())
+        lookup_ms, found = best_ms(lambda: LogIndex(path).lookup(target))
+        assert [line.line for line in found] == [line.rstrip(b"\n") for line in scanned]
+
+        write_lines(path, LINES, APPENDED)
+        start = time.perf_counter_ns()
+        LogIndex(path).update()
+        append_ms = (time.perf_counter_ns() - start) / 1e6
+
+        rows = [
+            ["full scan (substring match)", f"{scan_ms:,.1f}"],
+            ["index build", f"{build_ms:,.1f}"],
+            ["update, nothing appended", f"{noop_ms:,.2f}"],
+            [f"update, {APPENDED:,} lines appended", f"{append_ms:,.2f}"],
+            ["indexed lookup", f"{lookup_ms:,.2f}"],
+        ]
+        size_mb = path.stat().st_size / 2**20
+        index_mb = Path(f"{path}.cidx").stat().st_size / 2**20
+        print(f"{LINES:,} lines ({size_mb:,.1f} MiB, index {index_mb:,.1f} MiB), {LINES // REQUESTS} lines per request")
+        print_table(["operation", "ms"], rows)
+        print(f"lookup speedup over full scan: {scan_ms / lookup_ms:,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""Cost of a log line turned into a metric vs written, and of the metrics stage for other lines.
+
+Run with: python -m tests.benchmarks.bench_metrics
+"""
+
+from src.log_metrics import MetricRule, MetricsConfig
+from src.logging import configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import NullStream, install_root_stream, ns_per_op, print_table
+
+ITERATIONS = 50_000
+
+
+def run(label: str, metrics: MetricsConfig | None, message: str) -> list[object]:
+    configure_structlog(metrics=metrics)
+    logger = get_logger("src.api")
+    ns_per_op(lambda: logger.info(message, status=200, duration_ms=12.5), ITERATIONS // 10)  # Warm up
+    ns = ns_per_op(lambda: logger.info(message, status=200, duration_ms=12.5), ITERATIONS)
+    shutdown_logging()
+    return [label, f"{ns:,.0f}"]
+
+
+def main() -> None:
+    install_root_stream(NullStream())
+    rules = (
+        MetricRule("requests", message="Request handled", suppress=True),
+        MetricRule("latency_ms", message="Request handled", value_field="duration_ms", suppress=True),
+    )
+    rows = [
+        run("written, no metrics", None, "Request handled"),
+        run("counted + histogram, suppressed", MetricsConfig(rules, report_interval_s=0), "Request handled"),
+        run("written, other message", MetricsConfig(rules, report_interval_s=0), "Cache miss"),
+    ]
+    print(f"{ITERATIONS} info() calls, stdlib backend to a null stream")
+    print_table(["case", "ns/call"], rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Aggregate throughput of worker processes writing independently vs through one writer.
+
+Output goes to a pipe drained by the parent, like stdout read by a log
+collector. Independent workers each write their lines to it; in multi-process
+mode they send batches to the parent's writer. Every tenth line is larger than
+PIPE_BUF, so independent writes can tear; torn lines are counted as lines that
+do not parse as JSON.
+
+Run with: python -m tests.benchmarks.bench_multiprocess
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable
+
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    init_worker_logging,
+    shutdown_logging,
+    worker_logging_config,
+)
+from tests.benchmarks.harness import print_table
+
+EVENTS = 100_000
+WORKER_COUNTS = (1, 4, 16)
+SMALL_PAYLOAD = "y" * 512
+LARGE_PAYLOAD = "z" * 16_384
+
+
+def emit(count: int) -> None:
+    logger = get_logger("src.bench.worker")
+    for i in range(count):
+        logger.info("Chunk processed", index=i, payload=LARGE_PAYLOAD if i % 10 == 0 else SMALL_PAYLOAD)
+
+
+def init_independent(fd: int) -> None:
+    configure_structlog(backend="fast", stream=os.fdopen(fd, "wb", closefd=False))
+
+
+def drain(fd: int, chunks: list[bytes]) -> None:
+    while data := os.read(fd, 1 << 20):
+        chunks.append(data)
+
+
+def torn_lines(output: bytes) -> int:
+    torn = 0
+    for line in output.splitlines():
+        try:
+            json.loads(line)
+        except ValueError:
+            torn += 1
+    return torn
+
+
+def run(workers: int, through_writer: bool) -> tuple[float, int]:
+    read_fd, write_fd = os.pipe()
+    chunks: list[bytes] = []
+    reader = threading.Thread(target=drain, args=(read_fd, chunks))
+    reader.start()
+
+    initializer: Callable[..., None]
+    initargs: tuple[Any, ...]
+    if through_writer:
+        output = os.fdopen(write_fd, "wb", closefd=False)
+        configure_structlog(multiprocess=True, stream=output)
+        initializer, initargs = init_worker_logging, (worker_logging_config(),)
+    else:
+        initializer, initargs = init_independent, (write_fd,)
+
+    # Forked workers inherit the pipe
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(workers, mp_context=context, initializer=initializer, initargs=initargs) as pool:
+        list(pool.map(time.sleep, [0.05] * workers))  # Start every worker before timing
+        start = time.perf_counter()
+        list(pool.map(emit, [EVENTS // workers] * workers))
+    shutdown_logging()  # Includes draining the writer
+    elapsed = time.perf_counter() - start
+
+    os.close(write_fd)
+    reader.join()
+    os.close(read_fd)
+    return EVENTS / elapsed, torn_lines(b"".join(chunks))
+
+
+def main() -> None:
+    bind_context_vars(correlation_id="bench-job")
+    rows = []
+    for workers in WORKER_COUNTS:
+        independent_rate, independent_torn = run(workers, through_writer=False)
+        writer_rate, writer_torn = run(workers, through_writer=True)
+        rows.append(
+            [
+                workers,
+                f"{independent_rate:,.0f}",
+                independent_torn,
+                f"{writer_rate:,.0f}",
+                writer_torn,
+                f"{writer_rate / independent_rate:.2f}x",
+            ]
+        )
+    clear_context_fields()
+
+    print(f"{EVENTS} info() calls split across workers, output to a pipe ({os.cpu_count()} CPUs)")
+    print_table(["workers", "independent lines/s", "torn", "single writer lines/s", "torn", "speedup"], rows)
+
+
+if __name__ == "__main__":
+    main()
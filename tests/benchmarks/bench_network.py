@@ -0,0 +1,115 @@
+"""Throughput of the network sink into an in-process stand-in collector, and loss across collector restarts.
+
+Each run logs ``EVENTS`` JSON events through ``configure_structlog(network=...)``
+and times the caller (µs/event spent in ``logger.info``, next to writing to a
+local stream) and the delivery (until the collector holds every line), for
+both transports and framings and a few ``batch_bytes``. The restart run stops
+the collector ``RESTARTS`` times while events keep coming, with and without a
+disk spill, and counts missing lines.
+
+Run with: python -m tests.benchmarks.bench_network
+"""
+
+import json
+import tempfile
+import time
+from typing import Any
+
+from src.log_network import NetworkSinkConfig
+from src.logging import configure_structlog, get_logger, get_network_sink_stats, shutdown_logging
+from tests.benchmarks.harness import Collector, CountingStream, print_table
+
+EVENTS = 50_000
+ROUNDS = 3
+RESTARTS = 3
+RESTART_EVENTS = 20_000
+DOWN_S = 0.2
+
+
+def local_stream() -> float:
+    configure_structlog(backend="fast", stream=CountingStream())
+    logger = get_logger("src.api")
+
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        logger.info("Request handled", index=i, status=200, path="/api/chat")
+    elapsed = time.perf_counter() - start
+    shutdown_logging()
+    return elapsed / EVENTS * 1e6
+
+
+def throughput(unix: bool, framing: str, batch_bytes: int) -> tuple[float, float]:
+    collector = Collector(unix=unix, framing=framing).start()
+    configure_structlog(network=NetworkSinkConfig(collector.address, framing=framing, batch_bytes=batch_bytes))
+    logger = get_logger("src.api")
+
+    start = time.perf_counter()
+    for i in range(EVENTS):
+        logger.info("Request handled", index=i, status=200, path="/api/chat")
+    logged = time.perf_counter()
+    assert collector.wait_for(EVENTS, timeout=60)
+    delivered = time.perf_counter()
+    shutdown_logging()
+    collector.stop()
+    return (logged - start) / EVENTS * 1e6, EVENTS / (delivered - start)
+
+
+def restarts(spill: bool) -> tuple[int, int, int]:
+    collector = Collector().start()
+    spill_dir = tempfile.mkdtemp(prefix="spill-") if spill else None
+    configure_structlog(
+        network=NetworkSinkConfig(collector.address, spill_dir=spill_dir, backoff_initial_s=0.01, backoff_max_s=0.05)
+    )
+    logger = get_logger("src.api")
+
+    per_phase = RESTART_EVENTS // (RESTARTS + 1)
+    index = 0
+    for phase in range(RESTARTS + 1):
+        if phase:
+            collector.stop()
+            down_until = time.monotonic() + DOWN_S
+            while time.monotonic() < down_until:  # Traffic continues while the collector is away
+                logger.info("Request handled", index=index)
+                index += 1
+                time.sleep(0.0001)
+            collector.start()
+        for _ in range(per_phase):
+            logger.info("Request handled", index=index)
+            index += 1
+    dropped = get_network_sink_stats()["dropped"]
+    shutdown_logging()
+    collector.wait_for(index, timeout=30)
+    collector.stop()
+    received = [json.loads(line)["extra"]["index"] for line in collector.lines()]
+    return index, index - len(set(received)), dropped
+
+
+def main() -> None:
+    local_us = min(local_stream() for _ in range(ROUNDS))
+    rows: list[list[Any]] = [["local stream", "-", "-", f"{local_us:.2f}", "-"]]
+    for unix, framing, batch_bytes in [
+        (False, "ndjson", 4 * 1024),
+        (False, "ndjson", 64 * 1024),
+        (False, "ndjson", 256 * 1024),
+        (False, "length_prefixed", 256 * 1024),
+        (True, "ndjson", 256 * 1024),
+    ]:
+        runs = [throughput(unix, framing, batch_bytes) for _ in range(ROUNDS)]
+        caller_us = min(us for us, _ in runs)
+        rate = max(rate for _, rate in runs)
+        transport = "unix" if unix else "tcp"
+        rows.append([transport, framing, f"{batch_bytes // 1024} KiB", f"{caller_us:.2f}", f"{rate:,.0f}"])
+
+    print(f"{EVENTS} events into a stand-in collector; best of {ROUNDS}")
+    print_table(["transport", "framing", "batch", "caller µs/event", "delivered events/s"], rows)
+
+    print()
+    print(f"{RESTARTS} collector restarts ({DOWN_S:.1f}s down each) while logging")
+    print_table(
+        ["spill", "events", "missing at collector", "counted as dropped"],
+        [["disk" if spill else "memory", *(f"{n:,}" for n in restarts(spill))] for spill in (False, True)],
+    )
+
+
+if __name__ == "__main__":
+    main()
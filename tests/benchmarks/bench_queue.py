@@ -0,0 +1,42 @@
+"""Caller-side latency of synchronous vs queued emission against a slow stdout.
+
+Run with: python -m tests.benchmarks.bench_queue
+"""
+
+import time
+
+from src.logging import configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import SlowStream, install_root_stream, measure_latencies, percentile, print_table
+
+ITERATIONS = 5_000
+
+
+def run(queued: bool, overflow: str = "block", queue_size: int = 10_000) -> list[object]:
+    configure_structlog(queued=queued, overflow=overflow, queue_size=queue_size)
+    logger = get_logger("bench.queue")
+
+    samples = measure_latencies(lambda i: logger.info("Request handled", index=i, status=200), ITERATIONS)
+
+    drain_start = time.perf_counter()
+    shutdown_logging()
+    drain_s = time.perf_counter() - drain_start
+
+    mode = f"queued/{overflow}/{queue_size}" if queued else "sync"
+    p50, p99, worst = (f"{ns / 1000:.1f}" for ns in (percentile(samples, 50), percentile(samples, 99), max(samples)))
+    return [mode, p50, p99, worst, f"{drain_s:.2f}"]
+
+
+def main() -> None:
+    install_root_stream(SlowStream(delay_s=0.0001))
+    rows = [
+        run(queued=False),
+        run(queued=True),
+        run(queued=True, overflow="block", queue_size=1_000),
+        run(queued=True, overflow="drop_newest", queue_size=1_000),
+    ]
+    print(f"{ITERATIONS} info() calls, stdout write stalls ~100us per line")
+    print_table(["mode", "p50 us", "p99 us", "max us", "drain s"], rows)
+
+
+if __name__ == "__main__":
+    main()
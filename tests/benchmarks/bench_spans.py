@@ -0,0 +1,58 @@
+"""Per-span overhead with spans off, logged individually and aggregated into trees.
+
+Run with: python -m tests.benchmarks.bench_spans
+"""
+
+from src.log_spans import span, traced
+from src.logging import configure_structlog, shutdown_logging
+from tests.benchmarks.harness import NullStream, install_root_stream, ns_per_op, print_table
+
+ITERATIONS = 200_000
+TREE_CHILDREN = 100
+
+
+def bare() -> None:
+    pass
+
+
+@traced("work")
+def decorated() -> None:
+    pass
+
+
+def with_span() -> None:
+    with span("work", table="users"):
+        pass
+
+
+def tree_of_children() -> None:
+    with span("request"):
+        for _ in range(TREE_CHILDREN):
+            with span("work", table="users"):
+                pass
+
+
+def run(mode: str) -> list[object]:
+    configure_structlog(spans=mode)
+    baseline = ns_per_op(bare, ITERATIONS)
+    row: list[object] = [mode, f"{baseline:,.0f}"]
+    if mode == "tree":
+        # Per child span inside a tree, where aggregation replaces one line per span
+        row.append("-")
+        row.append(f"{ns_per_op(tree_of_children, ITERATIONS // TREE_CHILDREN) / TREE_CHILDREN - baseline:,.0f}")
+    else:
+        row.append(f"{ns_per_op(decorated, ITERATIONS) - baseline:,.0f}")
+        row.append(f"{ns_per_op(with_span, ITERATIONS) - baseline:,.0f}")
+    shutdown_logging()
+    return row
+
+
+def main() -> None:
+    install_root_stream(NullStream())
+    rows = [run("off"), run("each"), run("tree")]
+    print(f"{ITERATIONS} empty spans, stdlib backend to a null stream; overhead over a bare call")
+    print_table(["mode", "bare call ns", "@traced +ns", "with span() +ns"], rows)
+
+
+if __name__ == "__main__":
+    main()
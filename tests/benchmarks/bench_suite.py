@@ -0,0 +1,309 @@
+"""Logging benchmark suite with a regression gate.
+
+Measures ns/event, bytes allocated per event and blocks retained per event,
+per scenario, and compares them against a machine-readable baseline. Each
+timed run alternates with a run of a fixed calibration workload, so timings
+are compared relative to the host speed of the same moment.
+
+Run with:
+    python -m tests.benchmarks.bench_suite                   # print results
+    python -m tests.benchmarks.bench_suite --write-baseline  # record baseline.json
+    python -m tests.benchmarks.bench_suite --check           # fail on regressions
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, get_logger, shutdown_logging
+from tests.benchmarks.harness import NullStream, install_root_stream, print_table
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+DEFAULT_THRESHOLD = 0.25
+CALIBRATION_CALLS = 20_000  # About 80 ms per run
+ALLOC_SAMPLES = 20
+# Tiny absolute values are dominated by noise; a fixed slack on top of the threshold
+SLACK = {"alloc_bytes_per_event": 512, "retained_blocks_per_event": 1}
+SMALL_EXTRA = {"user_id": "user-123", "status": 200}
+LARGE_EXTRA = {f"field_{i}": f"value-{i}-" + "x" * 40 for i in range(40)}
+
+
+# ============================================================================
+# Scenarios
+# ============================================================================
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    emit: Callable[[int], None]  # Emits the given number of events in total
+    testing: bool = False
+    bound_vars: int = 1
+    level: str = "INFO"
+    concurrency: int = 1  # Events in flight at once: one per thread or task
+
+
+def sequential(extra: dict[str, Any], debug: bool = False) -> Callable[[int], None]:
+    def emit(count: int) -> None:
+        logger = get_logger("src.bench.suite")
+        log = logger.debug if debug else logger.info
+        for _ in range(count):
+            log("Request handled", **extra)
+
+    return emit
+
+
+def threaded(threads: int) -> Callable[[int], None]:
+    def emit(count: int) -> None:
+        def worker() -> None:
+            bind_context_vars(correlation_id=f"thread-{threading.get_ident()}")
+            sequential(SMALL_EXTRA)(count // threads)
+
+        workers = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+
+    return emit
+
+
+def concurrent_tasks(tasks: int) -> Callable[[int], None]:
+    async def handler(index: int, count: int) -> None:
+        bind_context_vars(correlation_id=f"task-{index}")
+        logger = get_logger("src.bench.suite")
+        for _ in range(count):
+            logger.info("Request handled", **SMALL_EXTRA)
+            await asyncio.sleep(0)
+
+    async def run(count: int) -> None:
+        await asyncio.gather(*(handler(i, count // tasks) for i in range(tasks)))
+
+    return lambda count: asyncio.run(run(count))
+
+
+SCENARIOS = [
+    Scenario("json/ctx1/small", sequential(SMALL_EXTRA)),
+    Scenario("human/ctx1/small", sequential(SMALL_EXTRA), testing=True),
+    Scenario("json/ctx0/small", sequential(SMALL_EXTRA), bound_vars=0),
+    Scenario("json/ctx5/small", sequential(SMALL_EXTRA), bound_vars=5),
+    Scenario("json/ctx50/small", sequential(SMALL_EXTRA), bound_vars=50),
+    Scenario("human/ctx50/small", sequential(SMALL_EXTRA), testing=True, bound_vars=50),
+    Scenario("json/ctx1/large", sequential(LARGE_EXTRA)),
+    Scenario("human/ctx1/large", sequential(LARGE_EXTRA), testing=True),
+    Scenario("filtered/debug-below-info", sequential(SMALL_EXTRA, debug=True)),
+    Scenario("json/threads4", threaded(4), concurrency=4),
+    Scenario("json/asyncio50", concurrent_tasks(50), concurrency=50),
+]
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+
+def prepare(scenario: Scenario) -> None:
+    os.environ["LOGGING_LEVEL"] = scenario.level
+    configure_structlog(testing=scenario.testing)
+    clear_context_fields()
+    if scenario.bound_vars:
+        fields = {f"field_{i}": i for i in range(scenario.bound_vars - 1)}
+        bind_context_vars(correlation_id="bench-correlation-id", **fields)
+
+
+def ns_per_event(scenario: Scenario, events: int, repeats: int) -> tuple[float, float]:
+    """Best of ``repeats`` runs, which is the least noisy estimate of the cost, and the best calibration beside them.
+
+    Each run follows a calibration run, so both bests come from the same
+    stretch of time and a host slowing down mid-suite affects both alike.
+    """
+    best = best_calibration = float("inf")
+    for _ in range(repeats):
+        best_calibration = min(best_calibration, calibration_ns())
+        gc.collect()
+        start = time.perf_counter_ns()
+        scenario.emit(events)
+        best = min(best, (time.perf_counter_ns() - start) / events)
+    return best, best_calibration
+
+
+def calibration_ns() -> float:
+    """Cost of a fixed pure-Python workload, used to factor machine speed out of comparisons."""
+    payload = {"level": "info", "message": "Request handled", "extra": dict(SMALL_EXTRA)}
+    gc.collect()
+    start = time.perf_counter_ns()
+    for _ in range(CALIBRATION_CALLS):
+        json.dumps({**payload, "timestamp": time.time_ns()})
+    return (time.perf_counter_ns() - start) / CALIBRATION_CALLS
+
+
+def alloc_bytes_per_event(scenario: Scenario) -> float:
+    """Bytes allocated per event: the traced memory high-water mark of one round, over the events in it.
+
+    A round is one event, or one event per thread or task (whose own overhead
+    is spread over them). Best of ``ALLOC_SAMPLES`` rounds, so a round where
+    events happened to overlap does not set the figure.
+    """
+    batch = scenario.concurrency
+    scenario.emit(batch)  # Warm caches so first-use allocations are not counted
+    best = float("inf")
+    tracemalloc.start()
+    try:
+        for _ in range(ALLOC_SAMPLES):
+            before, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            scenario.emit(batch)
+            _, peak = tracemalloc.get_traced_memory()
+            best = min(best, max(0, peak - before) / batch)
+    finally:
+        tracemalloc.stop()
+    return best
+
+
+def retained_blocks_per_event(scenario: Scenario, events: int) -> float:
+    """Memory blocks still allocated after emitting, per event: caches or buffers growing with traffic.
+
+    CPython only counts live blocks, so this is growth, not every block allocated along the way.
+    """
+    scenario.emit(events)  # Warm caches so first-use allocations are not counted
+    gc.collect()
+    before = sys.getallocatedblocks()
+    scenario.emit(events)
+    gc.collect()
+    return max(0, sys.getallocatedblocks() - before) / events
+
+
+def run_suite(events: int, repeats: int, only: str | None) -> dict[str, dict[str, float]]:
+    install_root_stream(NullStream())
+    original_level = os.environ.get("LOGGING_LEVEL")
+    results = {}
+    try:
+        for scenario in SCENARIOS:
+            if only and only not in scenario.name:
+                continue
+            prepare(scenario)
+            timing, calibration = ns_per_event(scenario, events, repeats)
+            results[scenario.name] = {
+                "ns_per_event": round(timing, 1),
+                "calibration_ns": round(calibration, 1),
+                "alloc_bytes_per_event": round(alloc_bytes_per_event(scenario), 1),
+                "retained_blocks_per_event": round(retained_blocks_per_event(scenario, events), 3),
+            }
+    finally:
+        shutdown_logging()
+        clear_context_fields()
+        if original_level is None:
+            os.environ.pop("LOGGING_LEVEL", None)
+        else:
+            os.environ["LOGGING_LEVEL"] = original_level
+    return results
+
+
+# ============================================================================
+# Regression Gate
+# ============================================================================
+
+
+def speed_ratio(metrics: dict[str, float], expected: dict[str, float]) -> float:
+    """Host speed of a scenario's runs relative to its baseline runs (above 1 when slower)."""
+    if metrics.get("calibration_ns") and expected.get("calibration_ns"):
+        return metrics["calibration_ns"] / expected["calibration_ns"]
+    return 1.0
+
+
+def find_regressions(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Scenario metrics that exceed their baseline by more than ``threshold`` (a fraction).
+
+    Timings are compared after dividing by the scenario's ``speed_ratio``, so a
+    slower host, or a slow stretch during the run, is not a regression.
+    """
+    regressions = []
+    for name, metrics in results.items():
+        expected = baseline.get(name)
+        if expected is None:
+            continue
+        ratio = speed_ratio(metrics, expected)
+        for metric, value in metrics.items():
+            if metric == "calibration_ns":
+                continue
+            if metric == "ns_per_event":
+                value = value / ratio
+            limit = expected.get(metric, 0) * (1 + threshold)
+            if value > limit + SLACK.get(metric, 0):
+                regressions.append(f"{name} {metric}: {value:,.1f} > {expected[metric]:,.1f} (+{threshold:.0%})")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20_000, help="events per timed run")
+    parser.add_argument("--repeats", type=int, default=5, help="timed runs per scenario (best is kept)")
+    parser.add_argument("--scenario", help="only run scenarios whose name contains this")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="allowed regression fraction")
+    parser.add_argument("--write-baseline", action="store_true", help="record results as the new baseline")
+    parser.add_argument("--check", action="store_true", help="exit non-zero when a scenario regresses")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.events, args.repeats, args.scenario)
+    document = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    baseline = document.get("scenarios", {})
+
+    rows = []
+    for name, metrics in results.items():
+        previous = baseline.get(name, {})
+        ratio = speed_ratio(metrics, previous)
+        change = f"{metrics['ns_per_event'] / ratio / previous['ns_per_event'] - 1:+.0%}" if previous else "-"
+        rows.append(
+            [
+                name,
+                f"{metrics['ns_per_event']:,.0f}",
+                f"{ratio:.2f}x",
+                change,
+                f"{metrics['alloc_bytes_per_event']:,.0f}",
+                f"{metrics['retained_blocks_per_event']:.3f}",
+            ]
+        )
+    print_table(
+        ["scenario", "ns/event", "host speed", "vs baseline", "alloc bytes/event", "retained blocks/event"], rows
+    )
+
+    if args.write_baseline:
+        document = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "events": args.events,
+            "scenarios": results,
+        }
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n")
+        print(f"Baseline written to {args.baseline}")
+
+    if args.check:
+        if not baseline:
+            print(f"No baseline at {args.baseline}; run with --write-baseline first", file=sys.stderr)
+            return 1
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Cost per request of DEBUG lines: dropped at INFO, written at DEBUG, or tail-buffered.
+
+Each request logs ``DEBUG_LINES`` debug lines and one info line; ``FAILURE_RATE``
+of them also log an error. Then the memory held by a tail buffer under many
+concurrent, never-completed requests is compared with its ``max_total_bytes`` cap.
+
+Run with: python -m tests.benchmarks.bench_tail
+"""
+
+import os
+import time
+import tracemalloc
+from typing import Any
+
+from src.log_tail import TailBufferConfig
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    complete_request,
+    configure_structlog,
+    get_logger,
+    get_tail_buffer_stats,
+    shutdown_logging,
+)
+from tests.benchmarks.harness import CountingStream, print_table
+
+REQUESTS = 5_000
+DEBUG_LINES = 10
+FAILURE_RATE = 0.01
+ROUNDS = 3
+CONCURRENT_REQUESTS = 20_000
+TOTAL_CAP = 8 * 1024 * 1024
+
+
+def run_requests(**config: Any) -> tuple[float, int]:
+    stream = CountingStream()
+    configure_structlog(backend="fast", stream=stream, **config)
+    logger = get_logger("src.api")
+    fail_every = round(1 / FAILURE_RATE)
+
+    start = time.perf_counter()
+    for request in range(REQUESTS):
+        clear_context_fields()
+        bind_context_vars(correlation_id=f"req-{request}")
+        for step in range(DEBUG_LINES):
+            logger.debug("Cache lookup", step=step, key="user:123", hit=True)
+        logger.info("Request handled", status=200, path="/api/chat")
+        if request % fail_every == 0:
+            logger.error("Upstream failed", status=502)
+        complete_request()
+    elapsed = time.perf_counter() - start
+    shutdown_logging()
+    return elapsed / REQUESTS * 1e6, stream.written
+
+
+def best(**config: Any) -> tuple[float, int]:
+    runs = [run_requests(**config) for _ in range(ROUNDS)]
+    return min(us for us, _ in runs), runs[0][1]
+
+
+def held_memory() -> tuple[int, int]:
+    configure_structlog(
+        backend="fast", stream=CountingStream(), tail_buffer=TailBufferConfig(max_total_bytes=TOTAL_CAP)
+    )
+    logger = get_logger("src.api")
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    for request in range(CONCURRENT_REQUESTS):
+        bind_context_vars(correlation_id=f"req-{request}")
+        for step in range(DEBUG_LINES):
+            logger.debug("Cache lookup", step=step, key="user:123", hit=True)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    held = get_tail_buffer_stats()["held_bytes"]
+    shutdown_logging()
+    clear_context_fields()
+    return current - baseline, held
+
+
+def main() -> None:
+    os.environ.pop("LOGGING_LEVEL", None)
+    info_us, info_bytes = best()
+    tail_us, tail_bytes = best(tail_buffer=TailBufferConfig())
+    os.environ["LOGGING_LEVEL"] = "DEBUG"
+    debug_us, debug_bytes = best()
+    os.environ.pop("LOGGING_LEVEL")
+
+    print(f"{REQUESTS} requests x ({DEBUG_LINES} debug + 1 info), {FAILURE_RATE:.0%} failing; best of {ROUNDS}")
+    print_table(
+        ["mode", "µs/request", "output bytes", "debug lines of failures"],
+        [
+            ["LOGGING_LEVEL=INFO", f"{info_us:.1f}", f"{info_bytes:,}", "no"],
+            ["tail buffer", f"{tail_us:.1f}", f"{tail_bytes:,}", "yes"],
+            ["LOGGING_LEVEL=DEBUG", f"{debug_us:.1f}", f"{debug_bytes:,}", "yes (and of every success)"],
+        ],
+    )
+
+    traced, estimated = held_memory()
+    print()
+    print(f"{CONCURRENT_REQUESTS} concurrent requests never completed, max_total_bytes={TOTAL_CAP:,}")
+    print_table(
+        ["estimated held bytes", "traced allocation"],
+        [[f"{estimated:,}", f"{traced:,}"]],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Per-event timestamp cost: TimeStamper + ISO re-parsing vs cached epoch formatting.
+
+Run with: python -m tests.benchmarks.bench_timestamps
+"""
+
+import time
+
+import structlog
+
+from src.logging import HumanReadableFormatter, TimestampFormatter
+from tests.benchmarks.harness import ns_per_op, print_table
+
+ITERATIONS = 200_000
+
+
+def main() -> None:
+    stamper = structlog.processors.TimeStamper(fmt="iso")
+    human = HumanReadableFormatter()
+    cached = TimestampFormatter()
+    clock = time.time_ns
+
+    def json_before() -> object:
+        return stamper(None, "info", {})["timestamp"]
+
+    def json_after() -> object:
+        return cached.iso(clock())
+
+    def human_before() -> object:
+        return human.format_timestamp(stamper(None, "info", {})["timestamp"])
+
+    def human_after() -> object:
+        return human.format_timestamp(clock())
+
+    print("ns per event spent producing the rendered timestamp")
+    print_table(
+        ["output", "before", "after"],
+        [
+            [
+                "json (ISO-8601)",
+                f"{ns_per_op(json_before, ITERATIONS):,.0f}",
+                f"{ns_per_op(json_after, ITERATIONS):,.0f}",
+            ],
+            [
+                "human (HH:MM:SS)",
+                f"{ns_per_op(human_before, ITERATIONS):,.0f}",
+                f"{ns_per_op(human_after, ITERATIONS):,.0f}",
+            ],
+        ],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Rendering cost and line size with and without bounding of ``extra`` values.
+
+A typical small event checks the overhead of the bounder; heavy events (a
+long list, a whole prompt, a NumPy array when installed) check what it saves.
+
+Run with: python -m tests.benchmarks.bench_values
+"""
+
+from typing import Any
+
+from src.log_values import DEFAULT_VALUE_LIMITS
+from src.logging import configure_structlog, get_logger
+from tests.benchmarks.harness import CountingStream, ns_per_op, peak_bytes_per_call, print_table
+
+ITERATIONS = 20
+SMALL_ITERATIONS = 20_000
+ROUNDS = 3
+
+
+def events() -> list[tuple[str, dict[str, Any], int]]:
+    cases = [
+        ("small", {"status": 200, "path": "/api/chat", "tags": ["a", "b"], "duration_ms": 12.5}, SMALL_ITERATIONS),
+        ("100k-item list", {"tokens": list(range(100_000))}, ITERATIONS),
+        ("1 MB prompt", {"prompt": "lorem ipsum " * 87_382}, ITERATIONS),
+        ("200 nested rows", {"rows": [{"id": i, "text": "x" * 200} for i in range(200)]}, ITERATIONS),
+    ]
+    try:
+        import numpy as np
+    except ImportError:
+        return cases
+    cases.append(("1000x1000 ndarray", {"embeddings": np.random.default_rng(0).random((1000, 1000))}, ITERATIONS))
+    return cases
+
+
+def measure(extra: dict[str, Any], iterations: int, bounded: bool) -> tuple[float, float, float]:
+    stream = CountingStream()
+    configure_structlog(backend="fast", stream=stream, value_limits=DEFAULT_VALUE_LIMITS if bounded else None)
+    logger = get_logger("src.bench.values")
+
+    def log() -> None:
+        logger.info("Batch scored", **extra)
+
+    best = min(ns_per_op(log, iterations) for _ in range(ROUNDS))
+    stream.written = 0
+    log()
+    line_bytes = stream.written
+    peak = peak_bytes_per_call(log, max(iterations // 10, 2))
+    return best, line_bytes, peak
+
+
+def main() -> None:
+    rows = []
+    for name, extra, iterations in events():
+        unbounded_ns, unbounded_bytes, unbounded_peak = measure(extra, iterations, bounded=False)
+        bounded_ns, bounded_bytes, bounded_peak = measure(extra, iterations, bounded=True)
+        rows.append(
+            [
+                name,
+                f"{unbounded_ns / 1000:,.1f}",
+                f"{bounded_ns / 1000:,.1f}",
+                f"{unbounded_bytes:,.0f}",
+                f"{bounded_bytes:,.0f}",
+                f"{unbounded_peak / 1024:,.0f}",
+                f"{bounded_peak / 1024:,.0f}",
+            ]
+        )
+
+    print("Fast backend, JSON output counted and discarded; best of", ROUNDS)
+    print_table(
+        ["event", "full µs", "bounded µs", "full bytes", "bounded bytes", "full peak KiB", "bounded peak KiB"],
+        rows,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Shared timing helpers for the logging benchmarks."""
+
+import gc
+import io
+import logging
+import os
+import socket
+import struct
+import tempfile
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable
+
+
+class SlowStream(io.StringIO):
+    """Text stream whose writes stall like a backpressured stdout pipe."""
+
+    def __init__(self, delay_s: float = 0.0001):
+        super().__init__()
+        self.delay_s = delay_s
+
+    def write(self, s: str) -> int:
+        time.sleep(self.delay_s)
+        return len(s)
+
+
+class NullStream(io.StringIO):
+    """Text stream that discards everything written to it."""
+
+    def write(self, s: str) -> int:
+        return len(s)
+
+
+class CountingStream(io.RawIOBase):
+    """Binary stream that only counts the bytes written to it."""
+
+    def __init__(self) -> None:
+        self.written = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self.written += len(data)
+        return len(data)
+
+
+class Collector:
+    """In-process stand-in for a log collector, keeping every line received on a TCP or Unix socket.
+
+    ``stop`` shuts down the way a collector restarting in an orderly way does:
+    it stops accepting, closes its side of each connection and reads until the
+    sender closes too. ``start`` listens again on the same address.
+    """
+
+    def __init__(self, unix: bool = False, framing: str = "ndjson"):
+        self.length_prefixed = framing == "length_prefixed"
+        if unix:
+            self.address = os.path.join(tempfile.mkdtemp(prefix="collector-"), "sock")
+        else:
+            probe = socket.create_server(("127.0.0.1", 0))
+            self.address = f"tcp://127.0.0.1:{probe.getsockname()[1]}"
+            probe.close()
+        self.connections = 0
+        self._lines: list[bytes] = []
+        self._received = threading.Condition()
+        self._listener: socket.socket | None = None
+
+    def start(self) -> "Collector":
+        if self.address.startswith("tcp://"):
+            port = int(self.address.rsplit(":", 1)[1])
+            listener = socket.create_server(("127.0.0.1", port))
+        else:
+            if os.path.exists(self.address):
+                os.unlink(self.address)
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            listener.bind(self.address)
+            listener.listen()
+        listener.settimeout(0.02)
+        self._listener = listener
+        threading.Thread(target=self._accept, args=(listener,), daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        listener, self._listener = self._listener, None
+        if listener is not None:
+            listener.close()
+
+    def lines(self) -> list[bytes]:
+        with self._received:
+            return list(self._lines)
+
+    def wait_for(self, count: int, timeout: float = 10.0) -> bool:
+        """Wait until ``count`` lines have arrived."""
+        with self._received:
+            return self._received.wait_for(lambda: len(self._lines) >= count, timeout)
+
+    def _accept(self, listener: socket.socket) -> None:
+        connections = []
+        while self._listener is listener:
+            try:
+                conn, _ = listener.accept()
+            except TimeoutError:
+                continue
+            except OSError:
+                break
+            self.connections += 1
+            connections.append(conn)
+            threading.Thread(target=self._read, args=(conn,), daemon=True).start()
+        for conn in connections:
+            try:
+                conn.shutdown(socket.SHUT_WR)
+            except OSError:
+                pass
+
+    def _read(self, conn: socket.socket) -> None:
+        conn.settimeout(None)
+        buffer = b""
+        with conn:
+            while chunk := conn.recv(1 << 20):
+                buffer += chunk
+                lines, buffer = self._split(buffer)
+                with self._received:
+                    self._lines.extend(lines)
+                    self._received.notify_all()
+
+    def _split(self, buffer: bytes) -> tuple[list[bytes], bytes]:
+        if not self.length_prefixed:
+            *lines, rest = buffer.split(b"\n")
+            return lines, rest
+        lines, offset = [], 0
+        while offset + 4 <= len(buffer):
+            (length,) = struct.unpack_from(">I", buffer, offset)
+            if offset + 4 + length > len(buffer):
+                break
+            lines.append(buffer[offset + 4 : offset + 4 + length])
+            offset += 4 + length
+        return lines, buffer[offset:]
+
+
+def install_root_stream(stream: io.TextIOBase) -> None:
+    """Point the root handler (used by ``configure_structlog``) at ``stream``."""
+    logging.basicConfig(format="%(message)s", stream=stream, force=True)
+
+
+def percentile(samples: list[int], pct: float) -> int:
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def measure_latencies(fn: Callable[[int], object], iterations: int) -> list[int]:
+    """Per-call wall time of ``fn(i)`` in nanoseconds."""
+    clock = time.perf_counter_ns
+    samples = []
+    for i in range(iterations):
+        start = clock()
+        fn(i)
+        samples.append(clock() - start)
+    return samples
+
+
+def ns_per_op(fn: Callable[[], object], iterations: int) -> float:
+    """Average wall time of ``fn()`` in nanoseconds over ``iterations`` calls."""
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+def peak_bytes_per_call(fn: Callable[[], object], iterations: int) -> float:
+    """Average high-water mark of memory allocated while ``fn()`` runs, in bytes."""
+    gc.disable()
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            total += peak - baseline
+    finally:
+        tracemalloc.stop()
+        gc.enable()
+    return total / iterations
+
+
+def print_table(headers: list[str], rows: list[list[object]]) -> None:
+    """Print a left-aligned plain-text table."""
+    cells = [headers] + [[str(c) for c in row] for row in rows]
+    widths = [max(len(row[i]) for row in cells) for i in range(len(headers))]
+    for n, row in enumerate(cells):
+        print("  ".join(cell.ljust(width) for cell, width in zip(row, widths)))
+        if n == 0:
+            print("  ".join("-" * width for width in widths))
@@ -0,0 +1 @@
+pytest_plugins = ("src.log_pytest",)
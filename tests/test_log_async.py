@@ -0,0 +1,153 @@
+"""Functional tests for asyncio mode: loop-local buffering with off-loop batched writes."""
+
+import asyncio
+import io
+import json
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    flush_logs_async,
+    get_dropped_log_count,
+    get_logger,
+    shutdown_logging,
+    shutdown_logging_async,
+)
+
+
+class GatedStream(io.BytesIO):
+    """Binary stream whose writes stall, like a backpressured pipe, until the gate opens."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.gate = threading.Event()
+
+    def write(self, data: Any) -> int:
+        self.gate.wait()
+        return super().write(data)
+
+
+def read_lines(stream: io.BytesIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Asyncio Mode Tests
+# ============================================================================
+
+
+def test__concurrent_tasks__keep_the_context_bound_at_call_time():
+    stream = io.BytesIO()
+    configure_structlog(asyncio_mode=True, stream=stream)
+    logger = get_logger("src.api")
+
+    async def handle(request: int) -> None:
+        bind_context_vars(correlation_id=f"req-{request}")
+        logger.info("Request started", request=request)
+        await asyncio.sleep(0.001 * (5 - request))
+        logger.info("Request finished", request=request)
+
+    async def main() -> bool:
+        await asyncio.gather(*(handle(request) for request in range(5)))
+        return await flush_logs_async()
+
+    assert asyncio.run(main())
+
+    lines = read_lines(stream)
+    assert len(lines) == 10
+    assert all(line["extra"]["correlation_id"] == f"req-{line['extra']['request']}" for line in lines)
+    assert [line["extra"]["request"] for line in lines[5:]] == [4, 3, 2, 1, 0]
+
+
+def test__stalled_stream__never_blocks_the_loop():
+    stream = GatedStream()
+    configure_structlog(asyncio_mode=True, stream=stream)
+    logger = get_logger("src.api")
+
+    async def main() -> float:
+        slowest = 0.0
+        for i in range(200):
+            start = time.perf_counter()
+            logger.info("Request handled", index=i)
+            slowest = max(slowest, time.perf_counter() - start)
+            await asyncio.sleep(0)
+        assert stream.getvalue() == b""
+        stream.gate.set()
+        await flush_logs_async()
+        return slowest
+
+    assert asyncio.run(main()) < 0.05
+    assert [line["extra"]["index"] for line in read_lines(stream)] == list(range(200))
+
+
+@pytest.mark.parametrize("overflow", ["drop_newest", "block"])
+def test__full_buffer__applies_the_overflow_policy(overflow: str):
+    stream = GatedStream()
+    configure_structlog(asyncio_mode=True, stream=stream, async_buffer_bytes=2000, overflow=overflow)
+    logger = get_logger("src.api")
+
+    async def main() -> None:
+        logger.info("First", index=0)
+        await asyncio.sleep(0)  # Hands the first line to the stalled writer
+        if overflow == "block":
+            threading.Timer(0.05, stream.gate.set).start()
+        for i in range(1, 100):
+            logger.info("Request handled", index=i)
+        stream.gate.set()
+        await flush_logs_async()
+
+    asyncio.run(main())
+
+    indexes = [line["extra"]["index"] for line in read_lines(stream)]
+    if overflow == "block":
+        assert indexes == list(range(100)) and get_dropped_log_count() == 0
+    else:
+        assert indexes == list(range(len(indexes))) and 1 < len(indexes) < 100
+        assert get_dropped_log_count() == 100 - len(indexes)
+
+
+def test__shutdown__writes_lines_left_behind_by_a_finished_loop():
+    stream = io.BytesIO()
+    configure_structlog(asyncio_mode=True, stream=stream)
+    logger = get_logger("src.api")
+
+    logger.info("Outside any loop")
+    assert len(read_lines(stream)) == 1
+
+    async def main() -> None:
+        for i in range(3):
+            logger.info("Never flushed", index=i)
+
+    asyncio.run(main())
+    shutdown_logging()
+
+    assert [line["message"] for line in read_lines(stream)] == ["Outside any loop"] + ["Never flushed"] * 3
+
+
+def test__shutdown_logging_async__flushes_from_inside_the_loop():
+    stream = io.BytesIO()
+    configure_structlog(asyncio_mode=True, stream=stream)
+
+    async def main() -> None:
+        get_logger("src.api").info("Shutting down")
+        await shutdown_logging_async()
+
+    asyncio.run(main())
+
+    assert [line["message"] for line in read_lines(stream)] == ["Shutting down"]
+    with pytest.raises(ValueError):
+        configure_structlog(asyncio_mode=True, queued=True)
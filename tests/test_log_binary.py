@@ -0,0 +1,109 @@
+"""Functional tests for the compact binary log format and its decoder."""
+
+import io
+import itertools
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.log_binary import BinaryEncoder, BinaryFormatError, main, read_binary_events
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    shutdown_logging,
+)
+
+
+class Opaque:
+    def __repr__(self) -> str:
+        return "<Opaque>"
+
+
+EVENTS: list[tuple[str, dict[str, Any]]] = [
+    ("Request handled", {"status": 200, "path": "/api/chat", "ok": True}),
+    ("Request handled", {"status": 404, "path": "/api/chat", "ok": False}),
+    ("Scores computed", {"scores": [0.5, -1.25, 1e300], "shape": [2, 3], "nothing": None}),
+    ("Nested payload", {"payload": {"a": {"b": [1, {"c": "déjà vu ✓"}]}}}),
+    ("Big numbers", {"big": 2**80, "negative": -(2**40), "zero": 0}),
+    ("Unserializable", {"value": Opaque()}),
+]
+# Decoded as JSON would read them back (lists, string keys), so only JSON output matches exactly
+NON_JSON_EVENTS: list[tuple[str, dict[str, Any]]] = [
+    ("Tuple value", {"shape": (2, 3)}),
+    ("Non-string keys", {"payload": {7: "int", None: "null", 1.5: "float"}}),
+]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+def emit_all(events: list[tuple[str, dict[str, Any]]] = EVENTS, **config: Any) -> bytes:
+    """Log ``events`` with a deterministic clock and return the output."""
+    stream = io.BytesIO()
+    ticks = itertools.count(1_700_000_000_000_000_000, 1_234_567)
+    with pytest.MonkeyPatch.context() as patch:
+        patch.setattr(time, "time_ns", lambda: next(ticks))
+        configure_structlog(stream=stream, **config)
+    bind_context_vars(correlation_id="req-1", user="alice")
+    for message, fields in events:
+        get_logger("src.api").info(message, **fields)
+    get_logger("src.db").warning("Slow query", duration_ms=812.5)
+    shutdown_logging()
+    return stream.getvalue()
+
+
+# ============================================================================
+# Round Trip Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize("human", [False, True])
+def test__decoder__reproduces_text_backend_output(tmp_path: Path, capsys: pytest.CaptureFixture[str], human: bool):
+    events = EVENTS if human else EVENTS + NON_JSON_EVENTS
+    path = tmp_path / "app.logb"
+    path.write_bytes(emit_all(events, backend="binary"))
+    expected = emit_all(events, backend="fast", testing=human).decode()
+
+    assert main([str(path), *(["--human"] if human else [])]) == 0
+    assert capsys.readouterr().out == expected
+
+
+def test__binary_backend__works_through_the_queue():
+    assert list(read_binary_events(io.BytesIO(emit_all(backend="binary", queued=True)))) == list(
+        read_binary_events(io.BytesIO(emit_all(backend="binary")))
+    )
+
+
+def test__encoder__restarts_string_table_when_full():
+    encoder = BinaryEncoder(max_strings=16)
+    events = [{"message": f"event {i}", "extra": {"key": f"value {i % 3}"}, "timestamp": 1000 + i} for i in range(50)]
+
+    data = b"".join(encoder.encode(event) for event in events)
+
+    assert list(read_binary_events(io.BytesIO(data))) == events
+    assert data.count(b"\x00LOGB\x01") > 1
+
+
+def test__binary__is_much_smaller_than_json():
+    binary_size = len(emit_all(backend="binary"))
+    json_size = len(emit_all(backend="fast"))
+
+    assert binary_size < json_size * 0.6
+
+
+def test__decoder__rejects_truncated_stream():
+    data = emit_all(backend="binary")
+
+    with pytest.raises(BinaryFormatError):
+        list(read_binary_events(io.BytesIO(data[:-3])))
+    with pytest.raises(BinaryFormatError):
+        list(read_binary_events(io.BytesIO(b"not a binary log")))
@@ -0,0 +1,153 @@
+"""Functional tests for in-memory capture of processed events and its pytest fixture."""
+
+import asyncio
+import gc
+import io
+import json
+import threading
+import weakref
+from typing import Any
+
+import pytest
+from pytest import CaptureFixture, LogCaptureFixture
+
+from src.log_capture import LogCapture
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, get_logger, shutdown_logging
+
+
+def log_sample_events() -> None:
+    logger = get_logger("src.api")
+    bind_context_vars(correlation_id="req-1", context="billing", tenant="acme")
+    logger.info("Handled", status=200, tags=["a", "b"])
+    logger.warning("Slow", duration_ms=1234.5, payload="x" * 10_000)
+    try:
+        raise KeyError("users")
+    except KeyError:
+        logger.exception("Lookup failed")
+    clear_context_fields()
+    get_logger("src.db.pool").error("Exhausted")
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Capture Tests
+# ============================================================================
+
+
+def test__captured_events__equal_the_rendered_json_but_the_timestamp():
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream)
+    log_sample_events()
+    rendered = [json.loads(line) for line in stream.getvalue().splitlines()]
+
+    capture = LogCapture()
+    configure_structlog(capture=capture)
+    log_sample_events()
+    captured = capture.events()
+
+    assert all(type(event.pop("timestamp")) is int for event in captured)
+    assert all(type(event.pop("timestamp")) is str for event in rendered)
+    assert captured == rendered
+
+
+def test__queries__filter_by_level_logger_message_and_correlation_id(log_capture: LogCapture):
+    log_sample_events()
+
+    assert log_capture.messages() == ["Handled", "Slow", "Lookup failed", "Exhausted"]
+    assert log_capture.messages(level="ERROR") == ["Lookup failed", "Exhausted"]
+    assert log_capture.messages(logger="src.db") == ["Exhausted"]
+    assert log_capture.messages(logger="src.d") == []
+    assert [event["message"] for event in log_capture.events(correlation_id="req-1")] == [
+        "Handled",
+        "Slow",
+        "Lookup failed",
+    ]
+    (slow,) = log_capture.events(message="Slow")
+    assert slow["extra"]["_truncated"] == ["payload"]
+    assert len(log_capture) == 4
+    log_capture.clear()
+    assert log_capture.events() == []
+
+
+@pytest.mark.asyncio
+async def test__tasks_and_threads__keep_separate_buffers_in_one_order(log_capture: LogCapture):
+    logger = get_logger("src.worker")
+    seen: dict[str, list[str]] = {}
+
+    async def handle(name: str) -> None:
+        bind_context_vars(correlation_id=name)
+        for step in range(3):
+            logger.info(f"{name} step {step}")
+            await asyncio.sleep(0)
+        seen[name] = log_capture.messages(local=True)
+
+    def work() -> None:
+        logger.info("thread step")
+        seen["thread"] = log_capture.messages(local=True)
+
+    logger.info("main")
+    thread = threading.Thread(target=work)
+    thread.start()
+    thread.join()
+    await asyncio.gather(handle("a"), handle("b"))
+
+    assert seen == {
+        "thread": ["thread step"],
+        "a": ["a step 0", "a step 1", "a step 2"],
+        "b": ["b step 0", "b step 1", "b step 2"],
+    }
+    assert log_capture.messages(local=True) == ["main"]
+    assert log_capture.messages()[:2] == ["main", "thread step"]
+    assert log_capture.messages()[2:] == [f"{name} step {step}" for step in range(3) for name in "ab"]
+    assert [event["message"] for event in log_capture.events(correlation_id="b")] == [
+        f"b step {step}" for step in range(3)
+    ]
+
+
+@pytest.mark.asyncio
+async def test__finished_tasks__are_released_and_keep_their_events(log_capture: LogCapture):
+    logger = get_logger("src.worker")
+
+    async def handle(index: int) -> None:
+        logger.info("Handled", index=index)
+        await asyncio.sleep(0)
+        assert log_capture.events(local=True)[0]["extra"]["index"] == index
+
+    tasks = [asyncio.ensure_future(handle(index)) for index in range(1000)]
+    references = [weakref.ref(task) for task in tasks]
+    await asyncio.gather(*tasks)
+    del tasks
+    await asyncio.sleep(0)  # Drops the gathering future, held by the step of this task that awaited it
+    gc.collect()
+
+    assert [reference() for reference in references] == [None] * 1000
+    assert [event["extra"]["index"] for event in log_capture.events()] == list(range(1000))
+
+
+def test__capture_mode__writes_nothing(log_capture: LogCapture, capsys: CaptureFixture[str], caplog: LogCaptureFixture):
+    log_sample_events()
+
+    assert len(log_capture) == 4
+    assert capsys.readouterr().out == ""
+    assert caplog.records == []
+
+
+@pytest.mark.log_capture(levels={"src.db": "DEBUG"})
+def test__marker__passes_configuration_to_the_fixture(log_capture: LogCapture):
+    get_logger("src.db").debug("Query planned")
+    get_logger("src.api").debug("Not captured")
+
+    assert log_capture.messages(level="debug") == ["Query planned"]
+
+
+@pytest.mark.parametrize("options", [{"queued": True}, {"asyncio_mode": True}, {"multiprocess": True}])
+def test__configure__rejects_capture_with_writers(options: dict[str, Any]):
+    with pytest.raises(ValueError, match="capture"):
+        configure_structlog(capture=LogCapture(), **options)
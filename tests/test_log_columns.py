@@ -0,0 +1,150 @@
+"""Functional tests for the columnar log loader."""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src import log_columns  # noqa: E402
+from src.log_columns import MISSING, Categorical, load_log_columns  # noqa: E402
+from src.logging import (  # noqa: E402
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    shutdown_logging,
+)
+
+EXTRA = {"status": "int64", "duration_ms": "float64", "path": "category"}
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+def write_events(path: Path, count: int, context: str | None = None) -> None:
+    """Lines as the pipeline writes them; binding a ``context`` moves it ahead of ``message``."""
+    with open(path, "ab") as stream:
+        configure_structlog(backend="fast", stream=stream)
+        logger = get_logger("src.api")
+        for i in range(count):
+            clear_context_fields()
+            bind_context_vars(correlation_id=f"req-{i}")
+            if context is not None:
+                bind_context_vars(context=context)
+            if i % 10 == 0:
+                logger.warning('Slow "request"', path=f"/api/ü{i % 3}", duration_ms=i * 1.5)
+            else:
+                logger.info("Request handled", status=200 + i % 3, path=f"/api/{i % 4}", duration_ms=i / 4)
+        shutdown_logging()
+    clear_context_fields()
+
+
+def expected_columns(path: Path) -> dict[str, list[Any]]:
+    """Reference: ``json.loads`` per line, the way analysis code did it before."""
+    events = [json.loads(line) for line in path.read_bytes().splitlines() if line.endswith(b"}")]
+    columns: dict[str, list[Any]] = {
+        name: [event.get(name, "") for event in events] for name in ("level", "logger", "context", "message")
+    }
+    columns["timestamp"] = [
+        np.datetime64(datetime.fromisoformat(event["timestamp"]).replace(tzinfo=None), "ns").astype(np.int64)
+        if "timestamp" in event
+        else MISSING
+        for event in events
+    ]
+    for key in EXTRA:
+        columns[key] = [event.get("extra", {}).get(key) for event in events]
+    return columns
+
+
+def assert_matches(columns: Any, expected: dict[str, list[Any]]) -> None:
+    assert list(columns.timestamp) == expected["timestamp"]
+    for name in ("level", "logger", "context", "message"):
+        assert list(getattr(columns, name).decode()) == expected[name]
+    assert list(columns.extra["path"].decode()) == expected["path"]
+    assert list(columns.extra["status"]) == [MISSING if value is None else value for value in expected["status"]]
+    np.testing.assert_array_equal(
+        columns.extra["duration_ms"], [np.nan if value is None else value for value in expected["duration_ms"]]
+    )
+
+
+# ============================================================================
+# Loader Tests
+# ============================================================================
+
+
+def test__rendered_lines__load_into_typed_columns(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    path = tmp_path / "app.log"
+    write_events(path, 180)
+    write_events(path, 20, context="search")
+
+    def no_fallback(line: bytes) -> None:
+        raise AssertionError(f"line left the batch path: {line!r}")
+
+    monkeypatch.setattr(log_columns, "_parse_line", no_fallback)
+    columns = load_log_columns(path, EXTRA, workers=1, cache=False)
+
+    assert len(columns) == 200
+    assert_matches(columns, expected_columns(path))
+    assert isinstance(columns.level, Categorical) and columns.level.counts() == {"info": 180, "warning": 20}
+    assert columns.context.counts() == {"default": 180, "search": 20}
+    assert columns.extra["status"].dtype == np.int64 and columns.extra["duration_ms"].dtype == np.float64
+
+
+def test__irregular_lines__fall_back_to_json(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_events(path, 20)
+    (tmp_path / "app.log.1").touch()
+    with open(path, "ab") as stream:
+        lines = [
+            {"message": "Reordered", "level": "info", "timestamp": "2026-01-01T00:00:00+00:00", "extra": {"status": 1}},
+            {"level": "error", "logger": "x", "context": "c", "message": "Nested", "extra": {"q": {"status": 9}}},
+        ]
+        stream.write(b"".join(json.dumps(line).encode() + b"\n" for line in lines))
+        stream.write(b"not json\n")
+        stream.write(b'{"level": "info", "logger": "src.api", "context": "chat", "message": "Being wri')
+
+    columns = load_log_columns(path, EXTRA, cache=False)
+
+    assert len(load_log_columns(tmp_path / "app.log.1", EXTRA, cache=False)) == 0
+    assert len(columns) == 22
+    assert_matches(columns, expected_columns(path))
+    assert columns.message.decode()[20:].tolist() == ["Reordered", "Nested"]
+    assert columns.timestamp[21] == MISSING
+
+
+def test__parallel_chunks__match_a_single_pass(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_events(path, 3000)
+
+    single = load_log_columns(path, EXTRA, cache=False)
+    parallel = load_log_columns(path, EXTRA, workers=2, cache=False, chunk_bytes=64 << 10)
+
+    assert_matches(parallel, expected_columns(path))
+    assert list(parallel.extra["path"].decode()) == list(single.extra["path"].decode())
+
+
+def test__cache__is_memory_mapped_until_the_file_or_columns_change(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_events(path, 100)
+
+    built = load_log_columns(path, EXTRA)
+    cached = load_log_columns(path, EXTRA)
+    assert isinstance(cached.timestamp, np.memmap) and isinstance(cached.level.codes, np.memmap)
+    assert_matches(cached, expected_columns(path))
+    assert cached.level.categories == built.level.categories
+
+    write_events(path, 10)
+    grown = load_log_columns(path, EXTRA)
+    assert len(grown) == 110 and not isinstance(grown.timestamp, np.memmap)
+
+    fewer = load_log_columns(path, {"status": "int64"})
+    assert list(fewer.extra) == ["status"] and not isinstance(fewer.timestamp, np.memmap)
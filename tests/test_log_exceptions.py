@@ -0,0 +1,178 @@
+"""Functional tests for structured, fingerprinted exception rendering."""
+
+import io
+import json
+import sys
+from typing import Any
+
+import pytest
+
+from src.log_exceptions import ExceptionConfig, ExceptionRenderer
+from src.logging import (
+    clear_context_fields,
+    configure_structlog,
+    flush_logs,
+    get_logger,
+    shutdown_logging,
+)
+
+
+def read_lines(stream: io.BytesIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def query(table: str) -> None:
+    raise KeyError(table)
+
+
+def load_user(user_id: int) -> None:
+    try:
+        query("users")
+    except KeyError as e:
+        raise LookupError(f"user {user_id} not found") from e
+
+
+def recurse(depth: int) -> None:
+    if depth == 0:
+        raise RecursionError("bottom")
+    recurse(depth - 1)
+
+
+def fail_with(fn: Any, *args: Any) -> BaseException:
+    try:
+        fn(*args)
+    except Exception as e:
+        return e
+    raise AssertionError("expected an exception")
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Exception Rendering Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test__logger_exception__renders_the_chain_as_structured_fields(queued: bool):
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, queued=queued)
+    logger = get_logger("src.api")
+
+    try:
+        load_user(7)
+    except LookupError:
+        logger.exception("Lookup failed", user_id=7)
+    logger.error("No exception in flight", exc_info=True)
+    flush_logs()
+
+    failed, plain = read_lines(stream)
+    exception = failed["extra"]["exception"]
+    assert list(failed["extra"]) == ["user_id", "exception"]
+    assert exception["type"] == "LookupError" and exception["message"] == "user 7 not found"
+    assert len(exception["fingerprint"]) == 16
+    assert [frame.rsplit(" in ", 1)[1] for frame in exception["frames"]] == [
+        "test__logger_exception__renders_the_chain_as_structured_fields",
+        "load_user",
+    ]
+    assert exception["frames"][-1].startswith(f"{__file__}:")
+    (cause,) = exception["causes"]
+    assert cause["relation"] == "cause" and cause["type"] == "KeyError" and cause["message"] == "'users'"
+    assert [frame.rsplit(" in ", 1)[1] for frame in cause["frames"]] == ["load_user", "query"]
+    assert plain["extra"] == {}
+
+
+def test__repeats_within_the_window__carry_only_fingerprint_and_count():
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream)
+    logger = get_logger("src.api")
+
+    for attempt in range(3):
+        logger.error("Retry failed", attempt=attempt, exc_info=fail_with(load_user, attempt))
+    logger.error("Other failure", exc_info=fail_with(query, "orders"))
+
+    lines = read_lines(stream)
+    first, second, third, other = (line["extra"]["exception"] for line in lines)
+    assert "frames" in first and "frames" in other
+    assert second == {
+        "type": "LookupError",
+        "message": "user 1 not found",
+        "fingerprint": first["fingerprint"],
+        "occurrence": 2,
+    }
+    assert third["occurrence"] == 3 and other["fingerprint"] != first["fingerprint"]
+
+
+def test__window_expiry__renders_in_full_again_with_a_stable_fingerprint():
+    now = [0.0]
+    renderer = ExceptionRenderer(ExceptionConfig(dedup_window_s=10, cache_size=1), clock=lambda: now[0])
+
+    full = renderer.render(fail_with(load_user, 1))
+    assert renderer.render(fail_with(load_user, 2))["occurrence"] == 2
+    now[0] = 11.0
+    again = renderer.render(fail_with(load_user, 3))
+    renderer.render(fail_with(query, "x"))  # Evicts the fingerprint from the one-entry cache
+    evicted = renderer.render(fail_with(load_user, 4))
+
+    assert "frames" in again and "frames" in evicted
+    assert full["fingerprint"] == again["fingerprint"] == evicted["fingerprint"]
+    assert ExceptionRenderer().render(fail_with(load_user, 5))["fingerprint"] == full["fingerprint"]
+
+
+def test__deep_tracebacks__keep_the_innermost_frames():
+    renderer = ExceptionRenderer(ExceptionConfig(max_frames=5, max_message_chars=10))
+    exception = renderer.render(fail_with(recurse, 30))
+    long_message = renderer.render(ValueError("x" * 100))
+
+    assert exception["frames_omitted"] == 32 - 5
+    assert [frame.rsplit(" in ", 1)[1] for frame in exception["frames"]] == ["recurse"] * 5
+    assert long_message["message"] == "xxxxxxxxxx...[+90 chars]" and long_message["frames"] == []
+
+
+def test__human_output__writes_traceback_lines_below_the_event():
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, testing=True)
+    logger = get_logger("src.api")
+
+    for _ in range(2):
+        logger.error("Lookup failed", exc_info=fail_with(load_user, 7))
+
+    lines = stream.getvalue().decode().splitlines()
+    fingerprint = lines[12].removeprefix("[fingerprint ").removesuffix("]")
+    here = f"  {__file__}:"
+    assert [line.split("] ", 1)[1] if line[:1].isdigit() else line for line in lines] == [
+        "api: Lookup failed",
+        "Traceback (most recent call last):",
+        f"{here}{load_user.__code__.co_firstlineno + 2} in load_user",
+        f"{here}{query.__code__.co_firstlineno + 1} in query",
+        "KeyError: 'users'",
+        "",
+        "The above exception was the direct cause of the following exception:",
+        "",
+        "Traceback (most recent call last):",
+        f"{here}{fail_with.__code__.co_firstlineno + 2} in fail_with",
+        f"{here}{load_user.__code__.co_firstlineno + 4} in load_user",
+        "LookupError: user 7 not found",
+        f"[fingerprint {fingerprint}]",
+        "api: Lookup failed",
+        f"LookupError: user 7 not found [fingerprint {fingerprint}, occurrence 2]",
+    ]
+
+
+def test__exceptions_none__leaves_exc_info_as_a_field():
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, exceptions=None)
+
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        get_logger("src.api").exception("Failed")
+
+    assert read_lines(stream)[0]["extra"] == {"exc_info": True}
+    assert sys.exc_info() == (None, None, None)
@@ -0,0 +1,146 @@
+"""Functional tests for the rotating, compressing file sink."""
+
+import gzip
+import io
+import json
+import lzma
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.log_binary import read_binary_events
+from src.log_files import Compression, FileSinkConfig
+from src.logging import clear_context_fields, configure_structlog, get_logger, shutdown_logging
+
+OPENERS = {".gz": gzip.open, ".xz": lzma.open}
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+def segments(path: Path) -> list[Path]:
+    """Closed segments oldest first, then the active file."""
+    return sorted(path.parent.glob(f"{path.name}.*")) + [path]
+
+
+def read_segment(segment: Path) -> bytes:
+    opener = OPENERS.get(segment.suffix)
+    if opener is None:
+        return segment.read_bytes()
+    with opener(segment, "rb") as file:
+        return file.read()
+
+
+def read_lines(path: Path) -> list[dict[str, Any]]:
+    return [json.loads(line) for segment in segments(path) for line in read_segment(segment).splitlines()]
+
+
+def emit(count: int, start: int = 0) -> None:
+    logger = get_logger("src.files")
+    for i in range(start, start + count):
+        logger.info("Record written", index=i, payload="x" * 100)
+
+
+# ============================================================================
+# Rotation Tests
+# ============================================================================
+
+
+def test__size_rotation__keeps_every_line_in_order_across_compressed_segments(tmp_path: Path):
+    path = tmp_path / "logs" / "app.log"
+    configure_structlog(log_file=FileSinkConfig(path, max_bytes=4096, retention=None))
+
+    emit(500)
+    shutdown_logging()
+
+    files = segments(path)
+    assert len(files) > 10
+    assert all(file.suffix == ".gz" for file in files[:-1])
+    assert all(read_segment(file).endswith(b"\n") for file in files)
+    assert all(len(read_segment(file)) < 4096 + 400 for file in files)
+    assert [line["extra"]["index"] for line in read_lines(path)] == list(range(500))
+
+
+def test__time_rotation__compresses_with_lzma(tmp_path: Path):
+    path = tmp_path / "app.log"
+    configure_structlog(
+        log_file=FileSinkConfig(path, max_bytes=None, rotate_interval_s=0.05, compression=Compression.LZMA)
+    )
+
+    for batch in range(3):
+        emit(10, start=batch * 10)
+        time.sleep(0.06)
+    emit(1, start=30)
+    shutdown_logging()
+
+    files = segments(path)
+    assert [file.suffix for file in files[:-1]] == [".xz"] * 3
+    assert [line["extra"]["index"] for line in read_lines(path)] == list(range(31))
+
+
+def test__retention__deletes_oldest_segments(tmp_path: Path):
+    path = tmp_path / "app.log"
+    configure_structlog(log_file=FileSinkConfig(path, max_bytes=2048, retention=2))
+
+    emit(300)
+    shutdown_logging()
+
+    files = segments(path)
+    assert len(files) == 3
+    assert [line["extra"]["index"] for line in read_lines(path)][-1] == 299
+
+
+def test__restart__appends_to_active_file_and_compresses_leftover_segments(tmp_path: Path):
+    path = tmp_path / "app.log"
+    leftover = tmp_path / "app.log.20260101T000000000000Z"
+    leftover.write_bytes(b'{"message": "from a crashed run"}\n')
+    path.write_bytes(b'{"message": "before restart"}\n')
+
+    configure_structlog(log_file=FileSinkConfig(path))
+    emit(2)
+    shutdown_logging()
+
+    assert not leftover.exists()
+    assert [line["message"] for line in read_lines(path)] == [
+        "from a crashed run",
+        "before restart",
+        "Record written",
+        "Record written",
+    ]
+
+
+def test__binary_backend__starts_each_segment_with_its_own_string_table(tmp_path: Path):
+    path = tmp_path / "app.logb"
+    configure_structlog(backend="binary", log_file=FileSinkConfig(path, max_bytes=1024, compression="none"))
+
+    emit(200)
+    shutdown_logging()
+
+    files = segments(path)
+    assert len(files) > 3
+    decoded = [event for file in files for event in read_binary_events(io.BytesIO(read_segment(file)))]
+    assert [event["extra"]["index"] for event in decoded] == list(range(200))
+
+
+def test__lines_after_shutdown__are_appended_to_the_active_file(tmp_path: Path):
+    path = tmp_path / "app.log"
+    configure_structlog(log_file=FileSinkConfig(path))
+    cached = get_logger("src.files")
+    cached.info("Before shutdown")
+    shutdown_logging()
+
+    cached.info("Late from a cached logger")
+    get_logger("src.other").warning("Late from a new logger")
+
+    assert [line["message"] for line in read_lines(path)] == [
+        "Before shutdown",
+        "Late from a cached logger",
+        "Late from a new logger",
+    ]
@@ -0,0 +1,130 @@
+"""Functional tests for the memory-mapped flight recorder."""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from pytest import LogCaptureFixture
+
+from src.log_flight import FlightRecorder, FlightRecorderError, main, read_flight_records
+from src.logging import clear_context_fields, configure_structlog, get_logger, shutdown_logging
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LOGGING_LEVEL", "INFO")
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Ring Buffer Tests
+# ============================================================================
+
+
+def test__recorder__wraps_and_keeps_most_recent_records(tmp_path: Path):
+    path = tmp_path / "flight.bin"
+    recorder = FlightRecorder(path, capacity=4096)
+    for i in range(500):
+        recorder.append({"message": f"event {i}", "extra": {"i": i}})
+
+    records = read_flight_records(path)
+    assert 30 < len(records) < 500
+    assert [r["extra"]["i"] for r in records] == list(range(500 - len(records), 500))
+    assert read_flight_records(path, last=3) == [{"message": f"event {i}", "extra": {"i": i}} for i in (497, 498, 499)]
+    recorder.close()
+
+
+def test__recorder__ignores_record_whose_write_was_not_published(tmp_path: Path):
+    path = tmp_path / "flight.bin"
+    recorder = FlightRecorder(path, capacity=1024)
+    recorder.append({"message": "complete"})
+    # Simulate a crash between writing the bytes and publishing the new end position
+    recorder._write(recorder._write_pos, b'\x10\x00\x00\x00{"message":"to')
+
+    assert read_flight_records(path) == [{"message": "complete"}]
+    recorder.close()
+
+
+def test__recorder__keeps_previous_recording_on_reopen(tmp_path: Path):
+    path = tmp_path / "flight.bin"
+    first = FlightRecorder(path, capacity=1024)
+    first.append({"message": "before restart"})
+    first.close()
+
+    FlightRecorder(path, capacity=1024).close()
+
+    assert read_flight_records(path) == []
+    assert read_flight_records(path.with_name("flight.bin.prev")) == [{"message": "before restart"}]
+
+
+def test__reader__rejects_other_files(tmp_path: Path):
+    path = tmp_path / "not-a-recording.bin"
+    path.write_bytes(b"\0" * 128)
+
+    with pytest.raises(FlightRecorderError):
+        read_flight_records(path)
+
+
+# ============================================================================
+# Pipeline Tests
+# ============================================================================
+
+
+def test__flight_recorder__records_debug_while_output_stays_at_level(tmp_path: Path, caplog: LogCaptureFixture):
+    path = tmp_path / "flight.bin"
+    configure_structlog(flight_recorder=path, flight_recorder_size=64 * 1024)
+    logger = get_logger("src.worker")
+
+    logger.debug("Cache miss", key="user:1")
+    logger.info("Request handled", status=200)
+    shutdown_logging()
+
+    assert [json.loads(r.message)["message"] for r in caplog.records] == ["Request handled"]
+    records = read_flight_records(path)
+    assert [(r["level"], r["logger"], r["message"], r["extra"]) for r in records] == [
+        ("debug", "src.worker", "Cache miss", {"key": "user:1"}),
+        ("info", "src.worker", "Request handled", {"status": 200}),
+    ]
+    assert isinstance(records[0]["timestamp"], int)
+
+
+def test__flight_recorder__survives_sigkill(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    path = tmp_path / "flight.bin"
+    script = (
+        "import os, signal\n"
+        "from src.logging import bind_context_vars, configure_structlog, get_logger\n"
+        f"configure_structlog(flight_recorder={str(path)!r})\n"
+        "bind_context_vars(correlation_id='req-42')\n"
+        "for i in range(100):\n"
+        "    get_logger('src.worker').debug('Step', step=i)\n"
+        "os.kill(os.getpid(), signal.SIGKILL)\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=REPO_ROOT,
+        env={**os.environ, "LOGGING_LEVEL": "INFO"},
+        capture_output=True,
+        timeout=60,
+    )
+
+    assert result.returncode == -signal.SIGKILL
+    assert result.stdout == b""
+    records = read_flight_records(path, last=100)
+    assert [r["extra"] for r in records[-2:]] == [
+        {"step": 98, "correlation_id": "req-42"},
+        {"step": 99, "correlation_id": "req-42"},
+    ]
+
+    assert main([str(path), "-n", "1"]) == 0
+    line = json.loads(capsys.readouterr().out)
+    assert line["message"] == "Step"
+    assert line["timestamp"].endswith("Z")
@@ -0,0 +1,155 @@
+"""Functional tests for the correlation-ID index over JSON log files."""
+
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+from src.log_index import LogIndex, lookup_lines, main
+from src.logging import (
+    HumanReadableFormatter,
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    shutdown_logging,
+)
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+def write_requests(path: Path, requests: range, lines_per_request: int = 3) -> None:
+    """Append interleaved lines of several requests, plus lines outside any request."""
+    with open(path, "ab") as stream:
+        configure_structlog(backend="fast", stream=stream)
+        logger = get_logger("src.api")
+        for step in range(lines_per_request):
+            for request in requests:
+                clear_context_fields()
+                bind_context_vars(correlation_id=f"req-{request}")
+                logger.info("Request step", step=step, note='quoted "correlation_id": "decoy"')
+            clear_context_fields()
+            logger.info("Background tick", step=step)
+        shutdown_logging()
+    clear_context_fields()
+
+
+def grep(path: Path, correlation_id: str) -> list[bytes]:
+    return [
+        line
+        for line in path.read_bytes().splitlines()
+        if json.loads(line).get("extra", {}).get("correlation_id") == correlation_id
+    ]
+
+
+# ============================================================================
+# Index Tests
+# ============================================================================
+
+
+def test__lookup__returns_the_same_lines_as_a_full_scan(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_requests(path, range(50))
+
+    index = LogIndex(path)
+    assert index.update() == 150
+    assert index.update() == 0
+
+    for request in (0, 17, 49):
+        assert [found.line for found in index.lookup(f"req-{request}")] == grep(path, f"req-{request}")
+    assert index.lookup("req-missing") == []
+
+
+def test__update__indexes_only_appended_complete_lines(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_requests(path, range(5))
+    index = LogIndex(path)
+    index.update()
+
+    write_requests(path, range(5, 10))
+    with open(path, "ab") as stream:
+        stream.write(b'{"message": "half written", "extra": {"correlation_id": "req-7"')
+
+    assert index.update() == 15
+    assert len(index.lookup("req-7")) == 3
+    with open(path, "ab") as stream:
+        stream.write(b'}, "timestamp": "2026-01-01T00:00:00Z"}\n')
+    assert index.update() == 1
+    assert [json.loads(found.line)["message"] for found in index.lookup("req-7")][-1] == "half written"
+
+
+def test__update__reindexes_replaced_file_and_recovers_from_torn_run(tmp_path: Path):
+    path = tmp_path / "app.log"
+    write_requests(path, range(5))
+    index = LogIndex(path)
+    index.update()
+
+    # Rotation: a new, shorter file at the same path
+    os.rename(path, tmp_path / "app.log.1")
+    write_requests(path, range(3), lines_per_request=1)
+    assert index.update() == 3
+    assert len(index.lookup("req-4")) == 0
+
+    # A crash while appending a run leaves a partial entry behind
+    write_requests(path, range(3), lines_per_request=1)
+    with open(index.index_path, "ab") as torn:
+        torn.write(b"\x05\x00\x00")
+    assert index.update() == 3
+    assert len(index.lookup("req-1")) == 2
+
+
+def test__many_updates__merge_runs_without_losing_lines(tmp_path: Path):
+    path = tmp_path / "app.log"
+    for batch in range(20):
+        write_requests(path, range(batch * 2, batch * 2 + 2), lines_per_request=1)
+        LogIndex(path).update()
+
+    assert os.path.getsize(f"{path}.cidx") < 24 * 40 + 16 * 17 + 64
+    for request in (0, 21, 39):
+        assert [found.line for found in LogIndex(path).lookup(f"req-{request}")] == grep(path, f"req-{request}")
+
+
+def test__lookup_lines__merges_files_and_filters_time(tmp_path: Path):
+    older, newer = tmp_path / "app.log.1", tmp_path / "app.log"
+    write_requests(older, range(3))
+    write_requests(newer, range(3))
+
+    lines = lookup_lines([newer, older], "req-1")
+    assert [found.path for found in lines] == [older] * 3 + [newer] * 3
+
+    middle = json.loads(lines[2].line)["timestamp"]
+    assert len(lookup_lines([newer, older], "req-1", since=middle)) == 4
+    assert len(lookup_lines([newer, older], "req-1", until=middle)) == 3
+
+
+def test__timestamp__is_the_event_time_not_a_nested_field_of_the_same_name(tmp_path: Path):
+    path = tmp_path / "app.log"
+    with open(path, "ab") as stream:
+        configure_structlog(backend="fast", stream=stream)
+        bind_context_vars(correlation_id="req-1")
+        get_logger("src.api").info("Webhook received", upstream={"timestamp": "2001-01-01T00:00:00Z"})
+        shutdown_logging()
+
+    (found,) = lookup_lines([path], "req-1", since="2020-01-01T00:00:00Z")
+    logged_at = datetime.fromisoformat(json.loads(found.line)["timestamp"].replace("Z", "+00:00"))
+    assert found.timestamp_us == round(logged_at.timestamp() * 1_000_000)
+
+
+def test__cli__renders_through_human_readable_formatter(tmp_path: Path, capsys: pytest.CaptureFixture[str]):
+    path = tmp_path / "app.log"
+    write_requests(path, range(3))
+    formatter = HumanReadableFormatter()
+    expected = [formatter(None, "info", json.loads(line)) for line in grep(path, "req-2")]
+
+    assert main(["lookup", "req-2", str(path), "--human"]) == 0
+    assert capsys.readouterr().out.splitlines() == expected
+    assert main(["lookup", "req-2", str(path), "--no-update"]) == 0
+    assert capsys.readouterr().out.encode().splitlines() == grep(path, "req-2")
@@ -0,0 +1,152 @@
+"""Functional tests for per-logger level thresholds and runtime level changes."""
+
+import json
+import logging
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pytest import LogCaptureFixture
+
+from src.log_flight import read_flight_records
+from src.log_levels import LevelThresholds, parse_level_spec
+from src.logging import (
+    clear_context_fields,
+    configure_structlog,
+    get_log_level,
+    get_logger,
+    reload_log_levels_on_signal,
+    set_log_levels,
+    shutdown_logging,
+)
+
+
+def messages(caplog: LogCaptureFixture) -> list[tuple[str, str]]:
+    return [(log["logger"], log["message"]) for log in (json.loads(r.message) for r in caplog.records)]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("LOGGING_LEVEL", "INFO")
+    monkeypatch.delenv("LOGGING_LEVELS", raising=False)
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    monkeypatch.undo()
+    configure_structlog()
+
+
+# ============================================================================
+# Level Spec Tests
+# ============================================================================
+
+
+def test__parse_level_spec__reads_default_and_prefixes():
+    spec = "warning, src.services=DEBUG\n# comment\nsrc.db = error  # trailing comment\n"
+
+    assert parse_level_spec(spec) == (logging.WARNING, {"src.services": logging.DEBUG, "src.db": logging.ERROR})
+    assert parse_level_spec("") == (None, {})
+    with pytest.raises(ValueError, match="verbose"):
+        parse_level_spec("src.services=verbose")
+
+
+# ============================================================================
+# Threshold Tests
+# ============================================================================
+
+
+def test__thresholds__match_by_longest_dotted_prefix(monkeypatch: pytest.MonkeyPatch, caplog: LogCaptureFixture):
+    monkeypatch.setenv("LOGGING_LEVELS", "src.services=DEBUG")
+    configure_structlog(levels={"src.services.billing": "WARNING"})
+
+    for name in ("src.services", "src.services.search", "src.servicesx", "src.services.billing", "src.other"):
+        get_logger(name).debug("Debug detail")
+        get_logger(name).info("Request handled")
+
+    assert messages(caplog) == [
+        ("src.services", "Debug detail"),
+        ("src.services", "Request handled"),
+        ("src.services.search", "Debug detail"),
+        ("src.services.search", "Request handled"),
+        ("src.servicesx", "Request handled"),
+        ("src.other", "Request handled"),
+    ]
+
+
+def test__set_log_levels__applies_to_cached_and_bound_loggers(caplog: LogCaptureFixture):
+    configure_structlog()
+    logger = get_logger("src.services.search")
+    logger.info("Warm up the cache")
+    bound = logger.bind(request="r-1")
+    assert not bound.is_enabled_for(logging.DEBUG)
+
+    set_log_levels({"src.services": "DEBUG"})
+    logger.debug("Cached logger")
+    bound.debug("Bound logger")
+    get_logger("src.other").debug("Other logger")
+
+    set_log_levels(default="ERROR", replace=True)
+    logger.info("Back to quiet")
+
+    assert get_log_level("src.services.search") == logging.ERROR
+    assert [message for _, message in messages(caplog)] == ["Warm up the cache", "Cached logger", "Bound logger"]
+
+
+class InterleavedThresholds(LevelThresholds):
+    """Resolves a logger from another thread after every attribute assignment, as a thread switch there would."""
+
+    interleave = False
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        super().__setattr__(name, value)
+        if self.interleave:
+            thread = threading.Thread(target=self.resolve, args=("src.services.search",))
+            thread.start()
+            thread.join()
+
+
+def test__thresholds__resolve_during_update_never_caches_a_replaced_level():
+    levels = InterleavedThresholds("INFO")
+    assert levels.resolve("src.services.search") == logging.INFO
+    levels.interleave = True
+
+    levels.update(thresholds={"src.services": "DEBUG"})
+    assert levels.resolve("src.services.search") == logging.DEBUG
+
+    levels.update(default="WARNING", replace=True)
+    assert levels.resolve("src.services.search") == logging.WARNING
+
+
+def test__reload_on_signal__reads_levels_file(tmp_path: Path, caplog: LogCaptureFixture):
+    configure_structlog()
+    levels_file = tmp_path / "levels"
+    levels_file.write_text("WARNING\nsrc.services=DEBUG\n")
+    previous = signal.getsignal(signal.SIGUSR1)
+    try:
+        reload_log_levels_on_signal(levels_file)
+        os.kill(os.getpid(), signal.SIGUSR1)
+
+        deadline = time.monotonic() + 5
+        while get_log_level("src.services") != logging.DEBUG and time.monotonic() < deadline:
+            time.sleep(0.01)
+    finally:
+        signal.signal(signal.SIGUSR1, previous)
+
+    assert get_log_level("src.services") == logging.DEBUG
+    assert get_log_level("src.other") == logging.WARNING
+
+
+def test__flight_recorder__captures_debug_below_per_logger_threshold(tmp_path: Path, caplog: LogCaptureFixture):
+    path = tmp_path / "flight.bin"
+    configure_structlog(flight_recorder=path, levels={"src.hot": "DEBUG"})
+
+    get_logger("src.hot").debug("Hot detail")
+    get_logger("src.cold").debug("Cold detail")
+    shutdown_logging()
+
+    assert messages(caplog) == [("src.hot", "Hot detail")]
+    assert [record["message"] for record in read_flight_records(path)] == ["Hot detail", "Cold detail"]
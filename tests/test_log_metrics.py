@@ -0,0 +1,167 @@
+"""Functional tests for metrics aggregated from log events."""
+
+import json
+import threading
+from typing import Any
+
+import pytest
+import structlog
+from pytest import LogCaptureFixture
+
+from src.log_metrics import MetricRule, MetricsAggregator, MetricsConfig
+from src.logging import (
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    get_metrics_snapshot,
+    shutdown_logging,
+)
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+REQUESTS = MetricRule("requests", message="Request handled", logger="src.api")
+ERRORS = MetricRule("server_errors", message="Request handled", fields={"status": 500})
+LATENCY = MetricRule("latency_ms", message="Request handled", value_field="duration_ms", buckets=(10, 100))
+CACHE_HITS = MetricRule("cache_hits", message="Cache hit", suppress=True)
+
+
+class NamedLogger:
+    def __init__(self, name: str):
+        self.name = name
+
+
+def offer(aggregator: MetricsAggregator, message: str, logger: str = "src.api", **fields: Any) -> bool:
+    """Run one event through the aggregator; True if its line is kept."""
+    try:
+        aggregator(NamedLogger(logger), "info", {**fields, "event": message})
+    except structlog.DropEvent:
+        return False
+    return True
+
+
+def messages(caplog: LogCaptureFixture) -> list[dict[str, Any]]:
+    return [json.loads(record.message) for record in caplog.records]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Aggregation Tests
+# ============================================================================
+
+
+def test__rules__count_matching_events_and_bucket_values():
+    aggregator = MetricsAggregator(MetricsConfig((REQUESTS, ERRORS, LATENCY), report_interval_s=0))
+
+    for status, duration_ms in [(200, 5), (200, 10), (500, 10.5), (200, 250), (404, "n/a")]:
+        assert offer(aggregator, "Request handled", status=status, duration_ms=duration_ms)
+    assert offer(aggregator, "Request handled", logger="src.api.v2", status=200, duration_ms=1)
+    assert offer(aggregator, "Request handled", logger="src.apiserver", status=500, duration_ms=1)
+    assert offer(aggregator, "Something else", status=500, duration_ms=1)
+
+    assert aggregator.snapshot() == {
+        "requests": {"type": "counter", "count": 6},
+        "server_errors": {"type": "counter", "count": 2},
+        "latency_ms": {
+            "type": "histogram",
+            "count": 6,
+            "sum": 277.5,
+            "buckets": {"10": 4, "100": 1, "+Inf": 1},
+        },
+    }
+
+
+def test__threads__record_without_losing_counts_after_they_exit():
+    aggregator = MetricsAggregator(MetricsConfig((REQUESTS, LATENCY), report_interval_s=0))
+
+    def work() -> None:
+        for i in range(1000):
+            offer(aggregator, "Request handled", duration_ms=i % 200)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    del threads, thread  # Exited threads fold their counts into the shared total
+
+    snapshot = aggregator.snapshot()
+    assert snapshot["requests"]["count"] == 8000
+    assert snapshot["latency_ms"]["buckets"] == {"10": 8 * 55, "100": 8 * 450, "+Inf": 8 * 495}
+
+
+def test__invalid_buckets__are_rejected():
+    with pytest.raises(ValueError, match="ascending"):
+        MetricsAggregator(MetricsConfig((MetricRule("bad", value_field="x", buckets=(10, 5)),)))
+
+
+# ============================================================================
+# Pipeline Tests
+# ============================================================================
+
+
+def test__suppressed_events__are_counted_but_not_written(caplog: LogCaptureFixture):
+    configure_structlog(metrics=MetricsConfig((REQUESTS, CACHE_HITS), report_interval_s=0))
+
+    for _ in range(3):
+        get_logger("src.cache").info("Cache hit", key="user:1")
+    get_logger("src.api").info("Request handled", status=200)
+
+    assert get_metrics_snapshot() == {
+        "requests": {"type": "counter", "count": 1},
+        "cache_hits": {"type": "counter", "count": 3},
+    }
+    assert [log["message"] for log in messages(caplog)] == ["Request handled"]
+
+
+def test__summary__reports_changes_since_the_previous_report(caplog: LogCaptureFixture):
+    configure_structlog(metrics=MetricsConfig((REQUESTS, LATENCY), report_interval_s=0))
+    logger = get_logger("src.api")
+
+    logger.info("Request handled", duration_ms=50)
+    logger.info("Request handled", duration_ms=500)
+    shutdown_logging()  # Reports the pending changes
+
+    summaries = [log for log in messages(caplog) if log["message"] == "Metrics summary"]
+    assert len(summaries) == 1
+    assert summaries[0]["logger"] == "src.log_metrics"
+    assert summaries[0]["extra"]["metrics"] == {
+        "requests": {"type": "counter", "count": 2},
+        "latency_ms": {"type": "histogram", "count": 2, "sum": 550.0, "buckets": {"10": 0, "100": 1, "+Inf": 1}},
+    }
+
+
+def test__summary__is_not_cut_by_value_limits(caplog: LogCaptureFixture):
+    rules = tuple(MetricRule(f"requests_{i}", message="Request handled", fields={"shard": i}) for i in range(25))
+    configure_structlog(metrics=MetricsConfig(rules, report_interval_s=0))
+    logger = get_logger("src.api")
+
+    for i in range(25):
+        logger.info("Request handled", shard=i)
+    shutdown_logging()
+
+    (summary,) = [log for log in messages(caplog) if log["message"] == "Metrics summary"]
+    assert "_truncated" not in summary["extra"]
+    assert summary["extra"]["metrics"] == {f"requests_{i}": {"type": "counter", "count": 1} for i in range(25)}
+
+
+def test__report__is_skipped_when_nothing_changed(caplog: LogCaptureFixture):
+    configure_structlog()
+    aggregator = MetricsAggregator(MetricsConfig((REQUESTS,), report_interval_s=0))
+
+    offer(aggregator, "Request handled")
+    aggregator.report()
+    aggregator.report()
+    offer(aggregator, "Request handled")
+    aggregator.report()
+
+    assert [log["extra"]["metrics"]["requests"]["count"] for log in messages(caplog)] == [1, 1]
+    assert aggregator.snapshot()["requests"]["count"] == 2
@@ -0,0 +1,114 @@
+"""Functional tests for multi-process logging through a single writer."""
+
+import io
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import pytest
+
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    init_worker_logging,
+    propagate_log_context,
+    shutdown_logging,
+    worker_logging_config,
+)
+
+PAYLOAD = "x" * 100_000  # Far larger than a pipe buffer, so unsynchronized writes would tear
+
+
+def emit_events(worker: int, count: int) -> int:
+    logger = get_logger("src.worker")
+    for i in range(count):
+        logger.info("Chunk processed", worker=worker, index=i, payload=PAYLOAD if i % 10 == 0 else "")
+    return os.getpid()
+
+
+def read_lines(stream: io.BytesIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Multi-Process Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize("start_method", ["fork", "spawn"])
+def test__workers__write_whole_lines_with_parent_context(start_method: str):
+    stream = io.BytesIO()
+    configure_structlog(multiprocess=True, stream=stream)
+    bind_context_vars(context="batch", correlation_id="job-7")
+
+    with ProcessPoolExecutor(
+        max_workers=3,
+        mp_context=multiprocessing.get_context(start_method),
+        initializer=init_worker_logging,
+        initargs=(worker_logging_config(),),
+    ) as pool:
+        get_logger("src.parent").info("Job started")
+        pids = set(pool.map(emit_events, range(6), [50] * 6))
+    get_logger("src.parent").info("Job finished")
+    shutdown_logging()
+
+    lines = read_lines(stream)
+    worker_lines = [line for line in lines if line["logger"] == "src.worker"]
+    assert len(lines) == 6 * 50 + 2
+    assert sorted((line["extra"]["worker"], line["extra"]["index"]) for line in worker_lines) == [
+        (worker, index) for worker in range(6) for index in range(50)
+    ]
+    assert all(line["context"] == "batch" and line["extra"]["correlation_id"] == "job-7" for line in lines)
+    assert os.getpid() not in pids
+
+
+def test__propagate_log_context__binds_context_of_submit_time():
+    stream = io.BytesIO()
+    configure_structlog(multiprocess=True, stream=stream)
+
+    with ProcessPoolExecutor(
+        max_workers=2,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_worker_logging,
+        initargs=(worker_logging_config(),),
+    ) as pool:
+        futures = []
+        for request in range(4):
+            bind_context_vars(correlation_id=f"request-{request}")
+            futures.append(pool.submit(propagate_log_context(emit_events), request, 1))
+        for future in futures:
+            future.result()
+    shutdown_logging()
+
+    assert sorted((line["extra"]["worker"], line["extra"]["correlation_id"]) for line in read_lines(stream)) == [
+        (request, f"request-{request}") for request in range(4)
+    ]
+
+
+def test__forked_child_without_initializer__is_routed_to_writer():
+    stream = io.BytesIO()
+    configure_structlog(multiprocess=True, stream=stream)
+    get_logger("src.parent").info("Before fork")
+
+    child = multiprocessing.get_context("fork").Process(target=emit_events, args=(1, 20))
+    child.start()
+    child.join()
+    get_logger("src.parent").info("After fork")
+    shutdown_logging()
+
+    lines = read_lines(stream)
+    assert child.exitcode == 0
+    assert [line["message"] for line in lines if line["logger"] == "src.parent"] == ["Before fork", "After fork"]
+    assert [line["extra"]["index"] for line in lines if line["logger"] == "src.worker"] == list(range(20))
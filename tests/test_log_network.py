@@ -0,0 +1,192 @@
+"""Functional tests for the batched network sink against an in-process stand-in collector."""
+
+import json
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+import pytest
+
+from src.log_files import FileSinkConfig
+from src.log_network import NetworkSinkConfig
+from src.logging import (
+    clear_context_fields,
+    configure_structlog,
+    get_dropped_log_count,
+    get_logger,
+    get_network_sink_stats,
+    shutdown_logging,
+)
+from tests.benchmarks.harness import Collector
+
+FAST_RETRY = {"flush_interval_s": 0.01, "backoff_initial_s": 0.01, "backoff_max_s": 0.05}
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+def emit(count: int, start: int = 0) -> None:
+    logger = get_logger("src.shipper")
+    for i in range(start, start + count):
+        logger.info("Shipped", index=i, payload="x" * 100)
+
+
+def indices(collector: Collector) -> list[int]:
+    return [json.loads(line)["extra"]["index"] for line in collector.lines()]
+
+
+def wait_until(condition: Callable[[], Any], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+# ============================================================================
+# Delivery Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize(("unix", "framing"), [(False, "ndjson"), (True, "length_prefixed")])
+def test__lines__arrive_in_order_over_one_connection(unix: bool, framing: str):
+    collector = Collector(unix=unix, framing=framing).start()
+    configure_structlog(network=NetworkSinkConfig(collector.address, framing=framing, batch_bytes=4096))
+
+    emit(500)
+    shutdown_logging()
+
+    assert collector.wait_for(500)
+    assert indices(collector) == list(range(500))
+    assert collector.connections == 1
+
+
+def test__a_lone_line__is_sent_by_the_latency_deadline():
+    collector = Collector().start()
+    configure_structlog(network=NetworkSinkConfig(collector.address, flush_interval_s=0.05))
+
+    emit(1)
+
+    assert collector.wait_for(1, timeout=2.0)
+    assert get_network_sink_stats()["connected"] is True
+
+
+@pytest.mark.parametrize("spill", [False, True])
+def test__collector_restart__loses_no_line(tmp_path: Path, spill: bool):
+    collector = Collector().start()
+    spill_dir = tmp_path / "spill" if spill else None
+    configure_structlog(network=NetworkSinkConfig(collector.address, spill_dir=spill_dir, **FAST_RETRY))
+
+    emit(100)
+    assert collector.wait_for(100)
+    collector.stop()
+    # Lines keep coming; the sink notices the close at its next send
+    sent = 100
+    deadline = time.monotonic() + 5.0
+    while get_network_sink_stats()["connected"] or (spill and not get_network_sink_stats()["spilled_bytes"]):
+        assert time.monotonic() < deadline, "timed out"
+        emit(1, start=sent)
+        sent += 1
+        time.sleep(0.005)
+    emit(100, start=sent)
+    collector.start()
+    emit(100, start=sent + 100)
+    assert collector.wait_for(sent + 200)
+    shutdown_logging()
+
+    assert indices(collector) == list(range(sent + 200))
+    assert collector.connections == 2
+    assert spill_dir is None or not any(spill_dir.iterdir())
+
+
+def test__collector_dropping_connections__is_retried_with_backoff():
+    listener = socket.create_server(("127.0.0.1", 0))
+
+    def accept_and_close() -> None:  # Like a load balancer without a healthy backend
+        while True:
+            try:
+                conn, _ = listener.accept()
+            except OSError:
+                return
+            conn.close()
+
+    threading.Thread(target=accept_and_close, daemon=True).start()
+    address = f"tcp://127.0.0.1:{listener.getsockname()[1]}"
+    configure_structlog(
+        network=NetworkSinkConfig(address, flush_interval_s=0.01, backoff_initial_s=0.01, backoff_max_s=0.2)
+    )
+
+    deadline = time.monotonic() + 1.0
+    sent = 0
+    while time.monotonic() < deadline:
+        emit(1, start=sent)
+        sent += 1
+        time.sleep(0.005)
+    connects = get_network_sink_stats()["connects"]
+    listener.close()
+
+    # Delays of 10, 20, 40... ms capped at 200 ms, jittered by half: a few connects per second, not a hot loop
+    assert 2 <= connects <= 30
+
+
+def test__full_spill__drops_the_oldest_segments_and_counts_them(tmp_path: Path):
+    collector = Collector()  # Down until the end
+    spill_dir = tmp_path / "spill"
+    configure_structlog(
+        network=NetworkSinkConfig(
+            collector.address, batch_bytes=1024, spill_dir=spill_dir, max_spill_bytes=20_000, **FAST_RETRY
+        )
+    )
+
+    emit(500)
+    wait_until(lambda: get_network_sink_stats()["pending_bytes"] == 0)
+    stats = get_network_sink_stats()
+    spilled = sum(path.stat().st_size for path in spill_dir.iterdir())
+    collector.start()
+    shutdown_logging()
+
+    assert stats["spilled_bytes"] == spilled <= 20_000
+    assert stats["dropped"] > 0
+    assert collector.wait_for(500 - stats["dropped"])
+    assert indices(collector) == list(range(stats["dropped"], 500))
+
+
+def test__spill_left_by_a_previous_run__is_sent_first_without_its_torn_tail(tmp_path: Path):
+    collector = Collector().start()
+    spill_dir = tmp_path / "spill"
+    spill_dir.mkdir()
+    (spill_dir / "spill-000000000007.log").write_bytes(b'{"extra": {"index": 0}}\n{"extra": {"index": 1}}\n{"ext')
+    configure_structlog(network=NetworkSinkConfig(collector.address, spill_dir=spill_dir))
+
+    emit(1, start=2)
+    shutdown_logging()
+
+    assert collector.wait_for(3)
+    assert indices(collector) == [0, 1, 2]
+
+
+def test__configure__counts_lines_dropped_by_the_overflow_policy():
+    collector = Collector()  # Never started, no spill: lines wait in memory
+    configure_structlog(
+        network=NetworkSinkConfig(
+            collector.address, batch_bytes=1024, max_pending_bytes=4096, overflow="drop_newest", **FAST_RETRY
+        )
+    )
+
+    emit(100)
+
+    assert get_dropped_log_count() >= 100 - 4096 // 150
+
+
+def test__configure__rejects_sinks_that_cannot_be_combined(tmp_path: Path):
+    config = NetworkSinkConfig("tcp://127.0.0.1:9")
+    with pytest.raises(ValueError, match="alternative sinks"):
+        configure_structlog(network=config, log_file=FileSinkConfig(tmp_path / "app.log"))
+    with pytest.raises(ValueError, match="binary"):
+        configure_structlog(network=config, backend="binary")
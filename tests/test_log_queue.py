@@ -0,0 +1,123 @@
+"""Functional tests for the queued log emitter."""
+
+import threading
+from typing import Any
+
+import pytest
+
+from src.log_queue import OverflowPolicy, QueuedEmitter
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+class RecordingLogger:
+    def __init__(self, name: str):
+        self.name = name
+        self.lines: list[str] = []
+
+    def info(self, line: str) -> None:
+        self.lines.append(line)
+
+
+class GatedRenderer:
+    """Renderer that blocks the writer thread until released."""
+
+    def __init__(self) -> None:
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, _: Any, __: str, event_dict: dict[str, Any]) -> str:
+        self.entered.set()
+        self.release.wait(5)
+        return str(event_dict["message"])
+
+
+def make_emitter(renderer: Any, maxsize: int = 10, overflow: OverflowPolicy = OverflowPolicy.BLOCK):
+    loggers: dict[str, RecordingLogger] = {}
+
+    def factory(name: str) -> RecordingLogger:
+        return loggers.setdefault(name, RecordingLogger(name))
+
+    return QueuedEmitter(renderer, factory, maxsize, overflow), loggers
+
+
+def event(message: str) -> tuple[str, str, dict[str, Any]]:
+    return ("test", "info", {"message": message})
+
+
+# ============================================================================
+# Emitter Tests
+# ============================================================================
+
+
+def test__emitter__writes_events_in_order_on_flush():
+    emitter, loggers = make_emitter(lambda _, __, ed: ed["message"])
+
+    for i in range(100):
+        emitter.put(event(f"msg-{i}"))
+
+    assert emitter.flush(timeout=5)
+    assert loggers["test"].lines == [f"msg-{i}" for i in range(100)]
+    emitter.close()
+
+
+@pytest.mark.parametrize(
+    "overflow,expected",
+    [
+        (OverflowPolicy.DROP_NEWEST, ["blocker", "a", "b"]),
+        (OverflowPolicy.DROP_OLDEST, ["blocker", "c", "d"]),
+    ],
+)
+def test__emitter__drop_policies_count_dropped_events(overflow: OverflowPolicy, expected: list[str]):
+    renderer = GatedRenderer()
+    emitter, loggers = make_emitter(renderer, maxsize=2, overflow=overflow)
+
+    emitter.put(event("blocker"))
+    assert renderer.entered.wait(5)  # Writer thread is now stuck on the first event
+
+    for message in ("a", "b", "c", "d"):
+        emitter.put(event(message))
+
+    renderer.release.set()
+    emitter.close()
+
+    assert emitter.dropped == 2
+    assert loggers["test"].lines == expected
+
+
+def test__emitter__block_policy_waits_for_space():
+    renderer = GatedRenderer()
+    emitter, loggers = make_emitter(renderer, maxsize=1)
+
+    emitter.put(event("blocker"))
+    assert renderer.entered.wait(5)
+    emitter.put(event("queued"))
+
+    producer = threading.Thread(target=emitter.put, args=(event("waiting"),))
+    producer.start()
+    producer.join(0.1)
+    assert producer.is_alive()  # Blocked on the full queue
+
+    renderer.release.set()
+    producer.join(5)
+    emitter.close()
+
+    assert emitter.dropped == 0
+    assert loggers["test"].lines == ["blocker", "queued", "waiting"]
+
+
+def test__emitter__close_drains_and_later_events_are_written_inline():
+    emitter, loggers = make_emitter(lambda _, __, ed: ed["message"])
+
+    emitter.put(event("before"))
+    emitter.close()
+    emitter.put(event("after"))
+
+    assert loggers["test"].lines == ["before", "after"]
+
+
+def test__emitter__rejects_non_positive_size():
+    with pytest.raises(ValueError):
+        QueuedEmitter(lambda _, __, ed: ed, RecordingLogger, 0)
@@ -0,0 +1,198 @@
+"""Functional tests for log sampling, rate limiting and duplicate suppression."""
+
+import json
+import random
+import threading
+from typing import Any
+
+import pytest
+import structlog
+from pytest import LogCaptureFixture
+
+from src.log_sampling import LogSampler, SamplingConfig
+from src.logging import (
+    bind_context_vars,
+    clear_context_fields,
+    configure_structlog,
+    get_logger,
+    shutdown_logging,
+)
+
+# ============================================================================
+# Helpers
+# ============================================================================
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1_000_000_000_000
+
+    def __call__(self) -> int:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += int(seconds * 1_000_000_000)
+
+
+class NamedLogger:
+    def __init__(self, name: str):
+        self.name = name
+
+
+def offer(sampler: LogSampler, message: str, method_name: str = "info", logger: str = "svc", **fields: Any) -> bool:
+    """Run one event through the sampler; True if it was kept."""
+    try:
+        sampler(NamedLogger(logger), method_name, {**fields, "event": message})
+    except structlog.DropEvent:
+        return False
+    return True
+
+
+def messages(caplog: LogCaptureFixture) -> list[dict[str, Any]]:
+    return [json.loads(record.message) for record in caplog.records]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    configure_structlog()
+    yield
+    shutdown_logging()
+    clear_context_fields()
+
+
+# ============================================================================
+# Sampler Tests
+# ============================================================================
+
+
+def test__rate_limit__allows_burst_then_refills_per_logger_and_message():
+    clock = FakeClock()
+    sampler = LogSampler(SamplingConfig(rate_limit_per_s=1, rate_limit_burst=3), clock=clock)
+
+    kept = [offer(sampler, "Dependency down") for _ in range(10)]
+    assert kept == [True] * 3 + [False] * 7
+    assert offer(sampler, "Other message")
+    assert offer(sampler, "Dependency down", logger="other.logger")
+
+    clock.advance(2)
+    assert [offer(sampler, "Dependency down") for _ in range(3)] == [True, True, False]
+    assert sampler.stats() == {"rate_limited": 8}
+
+
+def test__level_sampling__drops_by_probability_and_exempts_errors():
+    config = SamplingConfig(level_sample_rates={"debug": 0.0, "info": 0.5, "error": 0.0})
+    sampler = LogSampler(config, rng=random.Random(7))
+
+    assert not any(offer(sampler, "Debug detail", "debug") for _ in range(20))
+    kept_info = sum(offer(sampler, f"Info {i}") for i in range(1000))
+    assert all(offer(sampler, "Failure", "error") for _ in range(20))
+
+    assert 400 < kept_info < 600
+    assert sampler.stats()["sampled"] == 20 + (1000 - kept_info)
+
+
+def test__budget__tightens_sampling_when_throughput_exceeds_it():
+    clock = FakeClock()
+    sampler = LogSampler(SamplingConfig(budget_lines_per_s=100), clock=clock, rng=random.Random(1))
+
+    # First second: 1000 events offered, nothing known yet so everything passes
+    for i in range(1000):
+        assert offer(sampler, f"Event {i}")
+        clock.advance(0.001)
+
+    kept = sum(offer(sampler, f"Event {i}") for i in range(1000))
+    errors_kept = sum(offer(sampler, "Failure", "error") for _ in range(50))
+
+    assert 50 < kept < 200  # ~10% of the offered load
+    assert errors_kept == 50
+
+
+def test__collapse__summarizes_identical_consecutive_events(caplog: LogCaptureFixture):
+    configure_structlog(sampling=SamplingConfig(collapse_duplicates=True, report_interval_s=0))
+    logger = get_logger("src.client")
+
+    for _ in range(5):
+        logger.warning("Upstream timeout", host="db-1")
+    logger.warning("Upstream timeout", host="db-2")
+    shutdown_logging()
+
+    logs = messages(caplog)
+    assert [(log["message"], log["extra"]) for log in logs[:3]] == [
+        ("Upstream timeout", {"host": "db-1"}),
+        ("Upstream timeout", {"host": "db-1", "repeat_count": 4, "repeat_span_ms": logs[1]["extra"]["repeat_span_ms"]}),
+        ("Upstream timeout", {"host": "db-2"}),
+    ]
+    assert all(log["level"] == "warning" for log in logs[:3])
+    assert len(logs) == 3  # Repeats are reported by the summary, not as drops
+
+
+def test__collapse__summary_keeps_the_context_of_the_streak(caplog: LogCaptureFixture):
+    configure_structlog(sampling=SamplingConfig(collapse_duplicates=True, report_interval_s=0))
+
+    def request() -> None:
+        bind_context_vars(correlation_id="req-1", tenant="acme")
+        for _ in range(3):
+            get_logger("src.client").warning("Upstream timeout")
+
+    worker = threading.Thread(target=request)
+    worker.start()
+    worker.join()
+    shutdown_logging()  # Summarizes the streak from this thread, outside the request
+
+    first, summary = messages(caplog)
+    assert summary["extra"]["repeat_count"] == 2
+    assert summary["extra"]["correlation_id"] == first["extra"]["correlation_id"] == "req-1"
+    assert summary["extra"]["tenant"] == "acme"
+
+
+def test__collapse__summary_of_logged_exceptions_has_no_traceback(caplog: LogCaptureFixture):
+    configure_structlog(sampling=SamplingConfig(collapse_duplicates=True, report_interval_s=0))
+    logger = get_logger("src.client")
+
+    for _ in range(3):
+        try:
+            raise ZeroDivisionError("division by zero")
+        except ZeroDivisionError:
+            logger.exception("Upstream failed")
+    try:
+        raise KeyError("tenant")
+    except KeyError:
+        logger.info("Falling back")  # Ends the streak while another exception is handled
+
+    first, summary, _ = messages(caplog)
+    assert first["extra"]["exception"]["type"] == "ZeroDivisionError"
+    assert summary["level"] == "error"
+    assert summary["extra"] == {"repeat_count": 2, "repeat_span_ms": summary["extra"]["repeat_span_ms"]}
+
+
+def test__drop_report__counts_sampled_drops_apart_from_collapsed_repeats(caplog: LogCaptureFixture):
+    configure_structlog(
+        sampling=SamplingConfig(
+            collapse_duplicates=True, rate_limit_per_s=0.001, rate_limit_burst=1, report_interval_s=0
+        )
+    )
+    logger = get_logger("src.hot")
+
+    for _ in range(3):
+        logger.info("Hot path", shard=1)
+    logger.info("Hot path", shard=2)
+    shutdown_logging()
+
+    logs = messages(caplog)
+    assert [log["message"] for log in logs] == ["Hot path", "Hot path", "Log events dropped"]
+    assert logs[1]["extra"]["repeat_count"] == 2
+    assert logs[-1]["extra"] == {"rate_limited": 1}
+
+
+def test__drop_report__is_emitted_through_pipeline(caplog: LogCaptureFixture):
+    configure_structlog(sampling=SamplingConfig(rate_limit_per_s=0.001, rate_limit_burst=2, report_interval_s=0))
+
+    for _ in range(10):
+        get_logger("src.hot").info("Hot path")
+    shutdown_logging()
+
+    logs = messages(caplog)
+    assert [log["message"] for log in logs] == ["Hot path", "Hot path", "Log events dropped"]
+    assert logs[-1]["level"] == "warning"
+    assert logs[-1]["logger"] == "src.log_sampling"
+    assert logs[-1]["extra"] == {"rate_limited": 8}
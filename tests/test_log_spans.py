@@ -0,0 +1,151 @@
+"""Functional tests for timing spans."""
+
+import asyncio
+import json
+import time
+from typing import Any
+
+import pytest
+from pytest import LogCaptureFixture
+
+from src.log_spans import span, traced
+from src.logging import bind_context_vars, clear_context_fields, configure_structlog, shutdown_logging
+
+
+def messages(caplog: LogCaptureFixture) -> list[dict[str, Any]]:
+    return [json.loads(record.message) for record in caplog.records]
+
+
+@traced()
+def lookup_user(user_id: int) -> str:
+    with span("db.query", table="users"):
+        return f"user-{user_id}"
+
+
+@traced("fetch")
+async def fetch(delay_s: float) -> float:
+    await asyncio.sleep(delay_s)
+    return delay_s
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Span Tests
+# ============================================================================
+
+
+def test__disabled_spans__record_nothing(caplog: LogCaptureFixture):
+    configure_structlog()
+
+    with span("outer") as handle:
+        assert lookup_user(7) == "user-7"
+
+    assert handle is None
+    assert span("a") is span("b")
+    assert messages(caplog) == []
+
+
+def test__each_mode__logs_every_span_with_its_parent(caplog: LogCaptureFixture):
+    configure_structlog(spans="each")
+    bind_context_vars(correlation_id="req-1")
+
+    with span("handle_request", route="/users"):
+        time.sleep(0.01)
+        lookup_user(7)
+
+    logs = messages(caplog)
+    assert [log["extra"]["path"] for log in logs] == [
+        "handle_request/lookup_user/db.query",
+        "handle_request/lookup_user",
+        "handle_request",
+    ]
+    query, lookup, request = (log["extra"] for log in logs)
+    assert query["table"] == "users" and request["route"] == "/users"
+    assert query["parent_id"] == lookup["span_id"] and lookup["parent_id"] == request["span_id"]
+    assert request["parent_id"] is None
+    assert request["duration_ms"] >= 10
+    assert all(log["message"] == "Span finished" and log["extra"]["correlation_id"] == "req-1" for log in logs)
+
+
+def test__tree_mode__aggregates_descendants_into_one_event(caplog: LogCaptureFixture):
+    configure_structlog(spans="tree")
+    bind_context_vars(correlation_id="req-2")
+
+    with span("handle_request", route="/users"):
+        for user_id in range(5):
+            lookup_user(user_id)
+        with span("render"):
+            pass
+
+    (log,) = messages(caplog)
+    assert log["message"] == "Span tree"
+    assert log["extra"]["correlation_id"] == "req-2"
+    assert log["extra"]["span"] == "handle_request" and log["extra"]["route"] == "/users"
+    children = log["extra"]["children"]
+    assert list(children) == ["lookup_user", "render"]
+    assert children["lookup_user"]["count"] == 5
+    assert children["lookup_user"]["children"]["db.query"]["count"] == 5
+    assert children["render"]["count"] == 1
+    assert children["lookup_user"]["max_ms"] <= children["lookup_user"]["total_ms"] <= log["extra"]["duration_ms"]
+
+
+def test__tree_mode__deep_trees_are_not_cut_by_value_limits(caplog: LogCaptureFixture):
+    configure_structlog(spans="tree")
+
+    with span("level0"), span("level1"), span("level2"), span("level3"), span("level4"), span("level5"):
+        pass
+
+    (log,) = messages(caplog)
+    assert "_truncated" not in log["extra"]
+    node = log["extra"]
+    for depth in range(1, 6):
+        assert list(node["children"]) == [f"level{depth}"]
+        node = node["children"][f"level{depth}"]
+    assert node["count"] == 1 and "children" not in node
+
+
+def test__async_spans__nest_across_concurrent_tasks(caplog: LogCaptureFixture):
+    configure_structlog(spans="tree")
+
+    async def handle() -> list[float]:
+        async with span("handle_request"):
+            return await asyncio.gather(fetch(0.01), fetch(0.02), fetch(0.0))
+
+    assert asyncio.run(handle()) == [0.01, 0.02, 0.0]
+
+    (log,) = messages(caplog)
+    assert log["extra"]["children"]["fetch"]["count"] == 3
+    assert log["extra"]["children"]["fetch"]["max_ms"] >= 20
+
+
+def test__failed_span__records_error_and_reraises(caplog: LogCaptureFixture):
+    configure_structlog(spans="tree")
+
+    with pytest.raises(KeyError):
+        with span("handle_request"):
+            with span("cache.get"):
+                raise KeyError("user:7")
+
+    (log,) = messages(caplog)
+    assert log["extra"]["error"] == "KeyError"
+    assert log["extra"]["children"]["cache.get"]["errors"] == 1
+
+
+def test__span_outliving_its_parent__is_logged_on_its_own(caplog: LogCaptureFixture):
+    configure_structlog(spans="tree")
+
+    async def main() -> None:
+        async with span("handle_request"):
+            task = asyncio.create_task(fetch(0.01))
+        await task
+
+    asyncio.run(main())
+
+    assert [log["extra"]["span"] for log in messages(caplog)] == ["handle_request", "fetch"]
@@ -0,0 +1,152 @@
+"""Functional tests for per-request tail-based buffering of events below the threshold."""
+
+import io
+import json
+import time
+from typing import Any
+
+import pytest
+from pytest import LogCaptureFixture
+
+from src.log_tail import TailBufferConfig
+from src.logging import (
+    bind_context_vars,
+    buffered_request,
+    clear_context_fields,
+    complete_request,
+    configure_structlog,
+    flush_logs,
+    get_logger,
+    mark_request_failed,
+    shutdown_logging,
+)
+
+
+def read_lines(stream: io.BytesIO) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in stream.getvalue().splitlines()]
+
+
+def messages(lines: list[dict[str, Any]]) -> list[str]:
+    return [line["message"] for line in lines]
+
+
+def handle_request(correlation_id: str, steps: int, fail: bool) -> None:
+    logger = get_logger("src.api")
+    bind_context_vars(correlation_id=correlation_id)
+    for step in range(steps):
+        logger.debug("Step", request=correlation_id, step=step)
+    logger.info("Handled", request=correlation_id)
+    if fail:
+        logger.error("Request failed", request=correlation_id)
+        logger.debug("Cleanup", request=correlation_id)
+    complete_request()
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Tail Buffer Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test__debug_lines__are_written_only_for_failed_requests(queued: bool):
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, queued=queued, tail_buffer=TailBufferConfig())
+
+    handle_request("req-ok", 3, fail=False)
+    handle_request("req-bad", 3, fail=True)
+    clear_context_fields()
+    get_logger("src.api").debug("No request bound")
+    flush_logs()
+
+    lines = read_lines(stream)
+    assert messages(lines) == ["Handled", "Handled", "Step", "Step", "Step", "Request failed", "Cleanup"]
+    assert [line["extra"]["request"] for line in lines] == ["req-ok"] + ["req-bad"] * 6
+    assert [line["level"] for line in lines[2:]] == ["debug"] * 3 + ["error", "debug"]
+    replayed = [line["timestamp"] for line in lines[2:5]]
+    assert replayed == sorted(replayed) and replayed[-1] < lines[1]["timestamp"]
+
+
+def test__stdlib_backend__writes_released_debug_records(caplog: LogCaptureFixture):
+    configure_structlog(tail_buffer=TailBufferConfig())
+
+    bind_context_vars(correlation_id="req-1")
+    with pytest.raises(RuntimeError):
+        with buffered_request():
+            get_logger("src.api").debug("Loaded", rows=3)
+            raise RuntimeError("boom")
+    get_logger("src.api").debug("After completion")
+
+    assert [(record.levelname, json.loads(record.message)["message"]) for record in caplog.records] == [
+        ("DEBUG", "Loaded")
+    ]
+
+
+def test__mark_request_failed__flushes_another_request_by_id():
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, testing=True, tail_buffer=TailBufferConfig())
+    logger = get_logger("src.worker")
+
+    bind_context_vars(correlation_id="job-1")
+    logger.debug("Fetched input")
+    bind_context_vars(correlation_id="job-2")
+    logger.debug("Fetched other input")
+    mark_request_failed("job-1")
+    complete_request("job-1")
+    complete_request("job-2")
+
+    output = stream.getvalue().decode()
+    assert "[DEBUG] worker: Fetched input" in output and "other" not in output
+
+
+def test__per_request_caps__keep_the_newest_events_and_report_the_rest():
+    stream = io.BytesIO()
+    configure_structlog(
+        backend="fast",
+        stream=stream,
+        tail_buffer=TailBufferConfig(max_events_per_request=3, max_bytes_per_request=10**6),
+    )
+
+    handle_request("req-1", 10, fail=True)
+
+    lines = read_lines(stream)
+    assert messages(lines) == [
+        "Handled",
+        "Tail buffer dropped older events",
+        "Step",
+        "Step",
+        "Step",
+        "Request failed",
+        "Cleanup",
+    ]
+    assert lines[1]["level"] == "warning" and lines[1]["extra"] == {"correlation_id": "req-1", "dropped_events": 7}
+    assert [line["extra"]["step"] for line in lines[2:5]] == [7, 8, 9]
+
+
+def test__abandoned_and_excess_buffers__are_evicted():
+    stream = io.BytesIO()
+    configure_structlog(
+        backend="fast", stream=stream, tail_buffer=TailBufferConfig(max_total_bytes=20_000, idle_timeout_s=0.05)
+    )
+    logger = get_logger("src.api")
+
+    # Never completed: evicted once idle, so a late failure has nothing to write
+    bind_context_vars(correlation_id="abandoned")
+    logger.debug("Started")
+    time.sleep(0.1)
+    # Far more concurrent requests than the total cap holds: the least recently active go first
+    for request in range(100):
+        bind_context_vars(correlation_id=f"req-{request}")
+        logger.debug("Started", pad="x" * 100)
+    for correlation_id in ("abandoned", "req-0", "req-99"):
+        mark_request_failed(correlation_id)
+
+    lines = read_lines(stream)
+    assert [line["extra"]["correlation_id"] for line in lines] == ["req-99"]
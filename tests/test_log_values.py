@@ -0,0 +1,155 @@
+"""Functional tests for size-bounded serialization of extra values."""
+
+import io
+import json
+from typing import Any
+
+import pytest
+from pytest import LogCaptureFixture
+
+from src.log_values import ValueLimits
+from src.logging import clear_context_fields, configure_structlog, get_logger, shutdown_logging
+
+
+class Elements(list[int]):
+    """Flat view of ``HeavyArray`` supporting the slice-then-``tolist`` sampling path."""
+
+    def __getitem__(self, index: Any) -> Any:
+        return Elements(super().__getitem__(index))
+
+    def tolist(self) -> list[int]:
+        return list(self)
+
+
+class HeavyArray:
+    """Array-like whose repr and full conversion must never run."""
+
+    shape = (1000, 1000)
+    dtype = "float32"
+    flat = Elements(range(100))
+
+    def __repr__(self) -> str:
+        raise AssertionError("repr of a heavy value was built")
+
+    def tolist(self) -> list[float]:
+        raise AssertionError("heavy value was converted in full")
+
+
+class HeavyFrame:
+    """DataFrame-like with a shape and column labels."""
+
+    shape = (50_000, 3)
+    columns = ["user_id", "prompt", "score"]
+    dtypes = None
+
+    def __repr__(self) -> str:
+        raise AssertionError("repr of a heavy value was built")
+
+
+def messages(caplog: LogCaptureFixture) -> list[dict[str, Any]]:
+    return [json.loads(record.message) for record in caplog.records]
+
+
+@pytest.fixture(autouse=True)
+def setup_logger():
+    yield
+    shutdown_logging()
+    clear_context_fields()
+    configure_structlog()
+
+
+# ============================================================================
+# Value Bounding Tests
+# ============================================================================
+
+
+def test__heavy_values__are_summarized_and_marked(caplog: LogCaptureFixture):
+    configure_structlog()
+
+    get_logger("src.ml").info(
+        "Batch scored",
+        embeddings=HeavyArray(),
+        frame=HeavyFrame(),
+        tokens=list(range(100_000)),
+        prompt="p" * 100_000,
+        status=200,
+        route="/score",
+    )
+
+    (log,) = messages(caplog)
+    extra = log["extra"]
+    assert extra["embeddings"] == {
+        "type": "test_log_values.HeavyArray",
+        "shape": [1000, 1000],
+        "dtype": "float32",
+        "sample": [0, 1, 2, 3, 4, 5, 6, 7],
+    }
+    assert extra["frame"] == {
+        "type": "test_log_values.HeavyFrame",
+        "rows": 50_000,
+        "columns": 3,
+        "column_names": ["user_id", "prompt", "score"],
+    }
+    assert extra["tokens"] == {
+        "type": "list",
+        "length": 100_000,
+        "head": list(range(10)),
+        "tail": list(range(99_990, 100_000)),
+    }
+    assert extra["prompt"].startswith("ppp") and extra["prompt"].endswith(f"...[+{100_000 - 4072} chars]")
+    assert extra["status"] == 200 and extra["route"] == "/score"
+    assert extra["_truncated"] == ["embeddings", "frame", "tokens", "prompt"]
+    assert len(caplog.records[0].message) < 6000
+
+
+def test__event_budget__is_shared_across_fields(caplog: LogCaptureFixture):
+    configure_structlog(value_limits=ValueLimits(max_field_bytes=1000, max_event_bytes=2500))
+
+    get_logger("src.ml").info("Chunks", **{f"chunk_{i}": "c" * 900 for i in range(6)}, nested={"deep": [[[["x"]]]]})
+
+    (log,) = messages(caplog)
+    extra = log["extra"]
+    assert [extra[f"chunk_{i}"] == "c" * 900 for i in range(6)] == [True, True, False, False, False, False]
+    assert extra["_truncated"] == ["chunk_2", "chunk_3", "chunk_4", "chunk_5", "nested"]
+    assert extra["nested"] == {"deep": [[[{"type": "list", "length": 1}]]]}
+    assert len(caplog.records[0].message) < 2500 + 6 * 100
+
+
+def test__human_and_fast_outputs__receive_the_bounded_values(caplog: LogCaptureFixture):
+    configure_structlog(testing=True)
+    get_logger("src.ml").info("Batch scored", tokens=list(range(100_000)))
+    assert "tokens={'type': 'list', 'length': 100000, 'head'" in caplog.records[0].message
+
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream)
+    get_logger("src.ml").info("Batch scored", embeddings=HeavyArray())
+    assert json.loads(stream.getvalue())["extra"]["_truncated"] == ["embeddings"]
+
+
+def test__small_values__render_unchanged_and_limits_can_be_disabled(caplog: LogCaptureFixture):
+    small: dict[str, Any] = {"status": 200, "tags": ["a", "b"], "user": {"id": 7, "roles": ("admin",)}, "ratio": 0.5}
+    configure_structlog()
+    get_logger("src.api").info("Request handled", **small)
+    configure_structlog(value_limits=None)
+    get_logger("src.api").info("Request handled", **small, prompt="p" * 10_000)
+
+    bounded, unbounded = messages(caplog)
+    assert bounded["extra"] == {**small, "user": {"id": 7, "roles": ["admin"]}}
+    assert unbounded["extra"]["prompt"] == "p" * 10_000 and "_truncated" not in unbounded["extra"]
+
+
+def test__numpy_arrays__are_summarized_without_conversion(caplog: LogCaptureFixture):
+    np = pytest.importorskip("numpy")
+    configure_structlog()
+
+    get_logger("src.ml").info("Scored", scores=np.linspace(0, 1, 1_000_001), small=np.arange(3), count=np.int64(3))
+
+    (log,) = messages(caplog)
+    assert log["extra"]["scores"] == {
+        "type": "numpy.ndarray",
+        "shape": [1_000_001],
+        "dtype": "float64",
+        "sample": np.linspace(0, 1, 1_000_001)[:8].tolist(),
+    }
+    assert log["extra"]["small"] == {"type": "numpy.ndarray", "shape": [3], "dtype": "int64", "sample": [0, 1, 2]}
+    assert log["extra"]["_truncated"] == ["scores"]
@@ -1,16 +1,34 @@
 """Functional tests for the logger module."""
 
+import asyncio
+import io
 import json
+import re
+import threading
+from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import pytest
+import structlog
 from pytest import LogCaptureFixture, MonkeyPatch
 
 from src.logging import (
+    FastJSONRenderer,
+    HumanReadableFormatter,
+    TimestampFormatter,
+    _build_event_processor,
+    _process_log_fields,
+    _with_iso_timestamp,
     bind_context_vars,
     clear_context_fields,
     configure_structlog,
+    flush_logs,
+    get_context_snapshot,
+    get_context_vars,
+    get_correlation_id,
+    get_dropped_log_count,
     get_logger,
+    shutdown_logging,
 )
 
 # ============================================================================
@@ -104,6 +122,70 @@ def test__context__isolates_between_requests(caplog: LogCaptureFixture):
     assert "user_id" not in second_log.get("extra", {})
 
 
+# ============================================================================
+# Context Snapshot Tests
+# ============================================================================
+
+
+def test__context_snapshot__is_shared_until_next_bind():
+    bind_context_vars(correlation_id="snap-1", user_id="u-1")
+    first = get_context_snapshot()
+
+    assert get_context_snapshot() is first
+    assert get_correlation_id() == "snap-1"
+
+    bind_context_vars(user_id="u-2")
+    second = get_context_snapshot()
+
+    assert second is not first
+    assert second.version > first.version
+    assert dict(first.fields) == {"correlation_id": "snap-1", "user_id": "u-1"}
+    assert dict(second.fields) == {"correlation_id": "snap-1", "user_id": "u-2"}
+
+
+def test__context_snapshot__is_immutable_from_the_outside():
+    bind_context_vars(user_id="u-1")
+
+    get_context_vars()["user_id"] = "mutated"
+    with pytest.raises(TypeError):
+        get_context_snapshot().fields["user_id"] = "mutated"  # type: ignore[index]
+
+    assert get_context_vars() == {"user_id": "u-1"}
+
+
+@pytest.mark.asyncio
+async def test__context_snapshot__isolates_asyncio_tasks(caplog: LogCaptureFixture):
+    bind_context_vars(correlation_id="parent")
+
+    async def handle(request_id: str) -> str:
+        bind_context_vars(correlation_id=request_id)
+        await asyncio.sleep(0)
+        get_logger("task").info("Handled")
+        return get_correlation_id()
+
+    results = await asyncio.gather(*(handle(f"task-{i}") for i in range(5)))
+
+    assert results == [f"task-{i}" for i in range(5)]
+    assert get_correlation_id() == "parent"
+    assert sorted(parse_log_json(caplog, i)["extra"]["correlation_id"] for i in range(5)) == results
+
+
+def test__context_snapshot__isolates_threads():
+    bind_context_vars(correlation_id="main-thread")
+    seen: list[str] = []
+
+    def worker() -> None:
+        seen.append(get_correlation_id())
+        bind_context_vars(correlation_id="worker-thread")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen == ["unknown"]
+    assert get_correlation_id() == "main-thread"
+
+
 # ============================================================================
 # Output Format Tests
 # ============================================================================
@@ -174,11 +256,60 @@ def test__human_readable_formatter__formats_complete_log(caplog: LogCaptureFixtu
     assert "[id:complete]" in output  # Truncated to 8 chars
 
     # Verify timestamp format (HH:MM:SS at start)
-    import re
-
     assert re.match(r"^\d{2}:\d{2}:\d{2}", output)
 
 
+HUMAN_EVENTS: list[dict[str, Any]] = [
+    {
+        "level": "warning",
+        "logger": "src.services.llm",
+        "message": "LLM call completed",
+        "timestamp": 1_760_000_000_123_456_789,
+        "extra": {"duration_ms": 2500, "correlation_id": "complete-test-789", "long": "x" * 100},
+    },
+    {"level": "info", "logger": "uvicorn.access", "message": "GET /", "timestamp": "2025-10-09T08:53:20.123456Z"},
+    {"logger": "src", "message": "No level, no extra"},
+    {"level": "error", "logger": "src.api.v1.chat", "message": "Failed", "extra": {"error": ValueError("bad")}},
+]
+
+
+def reference_human_line(formatter: HumanReadableFormatter, event_dict: dict[str, Any]) -> str:
+    """The layout the formatter has always produced, assembled from its public helpers."""
+    extra = event_dict.get("extra", {})
+    return (
+        f"{formatter.format_timestamp(event_dict.get('timestamp', ''))} [{event_dict.get('level', 'info').upper()}] "
+        f"{formatter.format_logger_name(event_dict.get('logger', ''))}: {event_dict.get('message', '')}"
+        f"{formatter.format_extra_fields(extra)}{formatter.format_correlation_id(extra.get('correlation_id', ''))}"
+    )
+
+
+@pytest.mark.parametrize("event_dict", HUMAN_EVENTS)
+def test__human_readable_formatter__default_template_keeps_layout(event_dict: dict[str, Any]):
+    formatter = HumanReadableFormatter()
+
+    assert formatter(None, "info", dict(event_dict)) == reference_human_line(formatter, event_dict)
+
+
+def test__human_readable_formatter__compiles_custom_template():
+    event_dict = {**HUMAN_EVENTS[0], "context": "chat"}
+
+    plain = HumanReadableFormatter(template="{level:<8}|{context}|{logger!r}|{message}{{literal}}{id}")
+    colored = HumanReadableFormatter(template="{level:<8} {message}", color=True)
+
+    assert plain(None, "info", event_dict) == "WARNING |chat|'services.llm'|LLM call completed{literal} [id:complete]"
+    assert colored(None, "info", event_dict) == "\x1b[33mWARNING \x1b[0m LLM call completed"
+    with pytest.raises(ValueError, match="unknown field 'status'"):
+        HumanReadableFormatter(template="{message} {status}")
+
+
+def test__configure_structlog__uses_human_template(caplog: LogCaptureFixture):
+    configure_structlog(testing=True, human_template="{level} {logger} {message}{extra}")
+
+    get_logger("src.services.llm").info("Call done", model="gpt-4o-mini")
+
+    assert caplog.records[0].message == "INFO services.llm Call done [model=gpt-4o-mini]"
+
+
 # ============================================================================
 # Configuration Tests
 # ============================================================================
@@ -215,6 +346,230 @@ def test__invalid_log_level__defaults_to_info(monkeypatch: MonkeyPatch, caplog:
     assert log_data["message"] == "Info message"
 
 
+# ============================================================================
+# Fused Pipeline Tests
+# ============================================================================
+
+
+class NamedLogger:
+    name = "src.services.fused"
+
+
+def merge_bound_context(_: Any, __: str, event_dict: dict[str, Any]) -> dict[str, Any]:
+    """merge_contextvars equivalent for context bound through bind_context_vars."""
+    for key, value in get_context_vars().items():
+        event_dict.setdefault(key, value)
+    return event_dict
+
+
+REFERENCE_CHAIN = [
+    structlog.stdlib.add_log_level,
+    structlog.stdlib.add_logger_name,
+    merge_bound_context,
+    _process_log_fields,
+    structlog.processors.TimeStamper(fmt="iso"),
+]
+
+
+def run_chain(processors: list[Any], method_name: str, event_dict: dict[str, Any]) -> list[tuple[str, Any]]:
+    for processor in processors:
+        event_dict = processor(NamedLogger(), method_name, event_dict)
+    # Timestamps differ between runs; compare key order and every other value
+    return [(key, "<ts>" if key == "timestamp" else value) for key, value in event_dict.items()]
+
+
+@pytest.mark.parametrize(
+    "method_name,event_kw,context",
+    [
+        ("info", {}, {}),
+        ("warning", {"user_id": "u-1", "status": 200}, {"correlation_id": "req-1"}),
+        ("exception", {"correlation_id": "kwarg-id"}, {}),
+        ("warn", {"correlation_id": "kwarg-id"}, {"correlation_id": "ctx-id", "tenant": "acme"}),
+        ("error", {"context": "kwarg", "level": "x", "timestamp": 1}, {"context": 42, "user_id": "ctx"}),
+        ("debug", {"message": "shadowed", "extra": {"a": 1}}, {"logger": "ctx", "message": "ctx", "tenant": "t"}),
+        ("info", {"tenant": "kwarg"}, {"tenant": "ctx", "correlation_id": "unknown"}),
+    ],
+)
+def test__fused_processor__matches_reference_chain(method_name: str, event_kw: dict[str, Any], context: dict[str, Any]):
+    bind_context_vars(**context)
+
+    expected = run_chain(REFERENCE_CHAIN, method_name, {**event_kw, "event": "Fused"})
+    actual = run_chain([_build_event_processor()], method_name, {**event_kw, "event": "Fused"})
+
+    assert actual == expected
+
+
+def test__fused_processor__renders_in_same_call():
+    processor = _build_event_processor(_with_iso_timestamp(FastJSONRenderer()))
+
+    data = json.loads(processor(NamedLogger(), "info", {"event": "Rendered", "n": 1}))
+
+    assert list(data) == ["level", "logger", "message", "context", "extra", "timestamp"]
+    assert data["extra"] == {"n": 1}
+    assert re.match(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d{6})?Z$", data["timestamp"])
+
+
+# ============================================================================
+# Timestamp Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize(
+    "timestamp_ns",
+    [
+        0,
+        1_760_000_000_000_000_000,  # Whole second: no fractional part, like isoformat()
+        1_760_000_000_123_456_789,  # Sub-microsecond digits are truncated
+        1_760_000_059_999_999_999,
+        -1_500_000_000,  # Before the epoch
+    ],
+)
+def test__timestamp_formatter__matches_datetime_isoformat(timestamp_ns: int):
+    expected = datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=timestamp_ns // 1000)
+    formatter = TimestampFormatter()
+
+    assert formatter.iso(timestamp_ns) == expected.isoformat().replace("+00:00", "Z")
+    assert formatter.time_of_day(timestamp_ns) == expected.strftime("%H:%M:%S")
+
+
+def test__timestamp_formatter__reuses_prefix_within_a_second():
+    formatter = TimestampFormatter()
+
+    first = formatter.iso(1_760_000_000_000_001_000)
+    second = formatter.iso(1_760_000_000_999_999_000)
+    next_second = formatter.iso(1_760_000_001_000_001_000)
+
+    assert first[:19] == second[:19]
+    assert first.endswith(".000001Z") and second.endswith(".999999Z")
+    assert next_second[:19] != first[:19]
+
+
+def test__human_readable_formatter__accepts_raw_and_iso_timestamps():
+    formatter = HumanReadableFormatter()
+
+    assert formatter.format_timestamp(1_760_000_000_123_456_789) == "08:53:20"
+    assert formatter.format_timestamp("2025-10-09T08:53:20.123456Z") == "08:53:20"
+    assert formatter.format_timestamp("") == ""
+
+
+# ============================================================================
+# Queued Emission Tests
+# ============================================================================
+
+
+@pytest.mark.parametrize("testing", [False, True])
+def test__queued_mode__delivers_same_output_after_flush(caplog: LogCaptureFixture, testing: bool):
+    configure_structlog(testing=testing)
+    get_logger("queue").info("Queued message", field="value")
+    sync_output = caplog.records[0].message
+    caplog.clear()
+
+    configure_structlog(testing=testing, queued=True)
+    get_logger("queue").info("Queued message", field="value")
+    assert flush_logs(timeout=5)
+
+    queued_output = caplog.records[0].message
+    if testing:
+        assert queued_output.split(" ", 1)[1] == sync_output.split(" ", 1)[1]  # Ignore HH:MM:SS
+    else:
+        sync_data, queued_data = json.loads(sync_output), json.loads(queued_output)
+        sync_data.pop("timestamp"), queued_data.pop("timestamp")
+        assert queued_data == sync_data
+    assert caplog.records[0].name == "queue"
+
+
+def test__queued_mode__captures_context_at_call_time(caplog: LogCaptureFixture):
+    configure_structlog(queued=True)
+
+    bind_context_vars(correlation_id="at-call-time")
+    get_logger("queue").info("Captured")
+    clear_context_fields()
+    bind_context_vars(correlation_id="changed-later")
+    flush_logs(timeout=5)
+
+    assert parse_log_json(caplog)["extra"]["correlation_id"] == "at-call-time"
+
+
+def test__queued_mode__shutdown_flushes_pending_events(caplog: LogCaptureFixture):
+    configure_structlog(queued=True, overflow="drop_newest")
+
+    for i in range(50):
+        get_logger("queue").info("Event", index=i)
+    shutdown_logging()
+
+    assert [parse_log_json(caplog, i)["extra"]["index"] for i in range(50)] == list(range(50))
+    assert get_dropped_log_count() == 0
+
+
+# ============================================================================
+# Fast Backend Tests
+# ============================================================================
+
+
+class Unserializable:
+    def __repr__(self) -> str:
+        return "<Unserializable>"
+
+
+@pytest.mark.parametrize(
+    "event_dict",
+    [
+        {
+            "level": "info",
+            "logger": "api",
+            "message": "Plain",
+            "context": "default",
+            "timestamp": "2026-01-01T00:00:00Z",
+        },
+        {
+            "level": "warning",
+            "logger": "src.services.llm",
+            "message": 'Unicode ✓ "quoted" \n newline',
+            "context": "batch",
+            "extra": {"nested": {"a": [1, 2.5, None, True]}, "obj": Unserializable(), "nan": float("nan")},
+            "timestamp": "2026-01-01T00:00:00.123456Z",
+        },
+        {"context": "kwarg-first", "level": "error", "logger": "x", "message": "", "extra": {}},
+    ],
+)
+def test__fast_json_renderer__is_byte_identical_to_json_renderer(event_dict: dict[str, Any]):
+    expected = structlog.processors.JSONRenderer()(None, "info", dict(event_dict)).encode()
+
+    assert FastJSONRenderer()(None, "info", dict(event_dict)) == expected
+
+
+@pytest.mark.parametrize("queued", [False, True])
+def test__fast_backend__writes_lines_to_stream_without_stdlib(caplog: LogCaptureFixture, queued: bool):
+    stream = io.BytesIO()
+    configure_structlog(backend="fast", stream=stream, queued=queued)
+    bind_context_vars(correlation_id="fast-123")
+
+    get_logger("src.fast.path").info("First", count=1)
+    get_logger("src.fast.path").debug("Filtered out")
+    get_logger("src.fast.path").error("Second")
+    flush_logs(timeout=5)
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 2
+    first, second = (json.loads(line) for line in lines)
+    assert_json_log_structure(first)
+    assert first["logger"] == "src.fast.path"
+    assert first["extra"] == {"count": 1, "correlation_id": "fast-123"}
+    assert second["level"] == "error"
+    assert not caplog.records
+
+
+def test__fast_backend__supports_human_readable_output():
+    stream = io.BytesIO()
+    configure_structlog(testing=True, backend="fast", stream=stream)
+
+    get_logger("services.llm").warning("Slow call", duration_ms=2500)
+
+    line = stream.getvalue().decode()
+    assert line.endswith("\n")
+    assert "[WARNING] services.llm: Slow call [duration_ms=2500]" in line
+
+
 # ============================================================================
 # Edge Cases & Integration Tests
 # ============================================================================